@@ -9,7 +9,6 @@ import re
 import shutil
 import tarfile
 from path import path
-from tempfile import mkdtemp
 
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
@@ -29,7 +28,7 @@ from xmodule.modulestore.django import modulestore
 from opaque_keys.edx.keys import CourseKey
 from opaque_keys.edx.locator import LibraryLocator
 from xmodule.modulestore.xml_importer import import_course_from_xml, import_library_from_xml
-from xmodule.modulestore.xml_exporter import export_course_to_xml, export_library_to_xml
+from xmodule.modulestore.xml_exporter import export_course_to_tar, export_library_to_tar
 from xmodule.modulestore import COURSE_ROOT, LIBRARY_ROOT
 
 from student.auth import has_course_author_access
@@ -365,17 +364,15 @@ def create_export_tarball(course_module, course_key, context):
     """
     name = course_module.url_name
     export_file = NamedTemporaryFile(prefix=name + '.', suffix=".tar.gz")
-    root_dir = path(mkdtemp())
 
     try:
+        # The exported files are added to the tarball as they are exported, without being written to disk first
+        logging.debug(u'tar file being generated at %s', export_file.name)
         if isinstance(course_key, LibraryLocator):
-            export_library_to_xml(modulestore(), contentstore(), course_key, root_dir, name)
+            export_library_to_tar(modulestore(), contentstore(), course_key, export_file, name)
         else:
-            export_course_to_xml(modulestore(), contentstore(), course_module.id, root_dir, name)
-
-        logging.debug(u'tar file being generated at %s', export_file.name)
-        with tarfile.open(name=export_file.name, mode='w:gz') as tar_file:
-            tar_file.add(root_dir / name, arcname=name)
+            export_course_to_tar(modulestore(), contentstore(), course_module.id, export_file, name)
+        export_file.seek(0)
 
     except SerializationError as exc:
         log.exception(u'There was an error exporting %s', course_key)
@@ -409,8 +406,6 @@ def create_export_tarball(course_module, course_key, context):
             'unit': None,
             'raw_err_msg': str(exc)})
         raise
-    finally:
-        shutil.rmtree(root_dir / name)
 
     return export_file
 
@@ -10,12 +10,13 @@ import shutil
 import tarfile
 import tempfile
 from path import path
+from StringIO import StringIO
 from uuid import uuid4
 
 from django.test.utils import override_settings
 from django.conf import settings
 from xmodule.contentstore.django import contentstore
-from xmodule.modulestore.xml_exporter import export_library_to_xml
+from xmodule.modulestore.xml_exporter import export_course_to_xml, export_library_to_xml
 from xmodule.modulestore.xml_importer import import_library_from_xml
 from xmodule.modulestore import LIBRARY_ROOT
 from contentstore.utils import reverse_course_url
@@ -368,6 +369,36 @@ class ExportTestCase(CourseTestCase):
         self.assertEquals(resp.status_code, 200)
         self.assertTrue(resp.get('Content-Disposition').startswith('attachment'))
 
+    def test_export_targz_matches_directory_export(self):
+        """
+        The tarball, which is written without exporting to disk first, has the files of a directory export.
+        """
+        vertical = ItemFactory.create(parent_location=self.course.location, category='vertical', display_name='foo')
+        ItemFactory.create(parent_location=vertical.location, category='html', data='<p>Hello</p>')
+        resp = self.client.get(self.url, HTTP_ACCEPT='application/x-tgz')
+        self._verify_export_succeeded(resp)
+        self.assertEquals(int(resp['Content-Length']), len(resp.content))
+
+        with tarfile.open(fileobj=StringIO(resp.content), mode='r:gz') as tar_file:
+            tar_files = set(
+                os.path.relpath(member.name, self.course.url_name)
+                for member in tar_file.getmembers() if member.isfile()
+            )
+
+        root_dir = path(tempfile.mkdtemp())
+        try:
+            export_course_to_xml(self.store, contentstore(), self.course.id, root_dir, 'course')
+            directory_files = set(
+                os.path.relpath(os.path.join(dirpath, filename), root_dir / 'course')
+                for dirpath, __, filenames in os.walk(root_dir / 'course')
+                for filename in filenames
+            )
+        finally:
+            shutil.rmtree(root_dir)
+
+        self.assertEquals(tar_files, directory_files)
+        self.assertIn('course.xml', tar_files)
+
     def test_export_failure_top_level(self):
         """
         Export failure.
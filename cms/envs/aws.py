@@ -259,6 +259,9 @@ else:
 
 DATABASES = AUTH_TOKENS['DATABASES']
 MODULESTORE = convert_module_store_setting_if_needed(AUTH_TOKENS.get('MODULESTORE', MODULESTORE))
+COURSE_STRUCTURE_LOCAL_CACHE_SIZE = ENV_TOKENS.get('COURSE_STRUCTURE_LOCAL_CACHE_SIZE', COURSE_STRUCTURE_LOCAL_CACHE_SIZE)
+ASSET_DISK_CACHE = ENV_TOKENS.get('ASSET_DISK_CACHE', ASSET_DISK_CACHE)
+STATIC_CONTENT_CACHE_MAX_AGE = ENV_TOKENS.get('STATIC_CONTENT_CACHE_MAX_AGE', STATIC_CONTENT_CACHE_MAX_AGE)
 CONTENTSTORE = AUTH_TOKENS['CONTENTSTORE']
 DOC_STORE_CONFIG = AUTH_TOKENS['DOC_STORE_CONFIG']
 # Datadog for events!
@@ -386,6 +386,19 @@ MODULESTORE = {
     }
 }
 
+# The number of split modulestore structures each process keeps in memory, in front of
+# the (optional) 'course_structure_cache' django cache. 0 disables the in-process cache.
+COURSE_STRUCTURE_LOCAL_CACHE_SIZE = 0
+
+# Assets larger than 1MB (which aren't kept in the django cache) can be cached on local
+# disk by the StaticContentServer, e.g. {'DIRECTORY': '/var/tmp/asset_cache', 'MAX_ASSET_SIZE': None}.
+# The directory isn't pruned automatically. Disabled when DIRECTORY isn't set.
+ASSET_DISK_CACHE = {}
+
+# How long (in seconds) browsers and CDNs may cache unlocked course assets without
+# revalidating them. 0 leaves out the Cache-Control header.
+STATIC_CONTENT_CACHE_MAX_AGE = 0
+
 ############################ DJANGO_BUILTINS ################################
 # Change DEBUG/TEMPLATE_DEBUG in your environment settings files, not here
 DEBUG = False
@@ -0,0 +1,153 @@
+"""
+A local disk cache for course assets which are too large to be kept in the django cache.
+
+Cached files are named after the asset's location and the digest of its content, so a
+re-uploaded asset is simply cached under a new name. The GridFS metadata (which holds the
+asset's lock state, content type, etc.) is still looked up for every request; only the
+(expensive) chunk reads are served from disk.
+"""
+import hashlib
+import logging
+import mmap
+import os
+import tempfile
+
+from django.conf import settings
+
+from xmodule.contentstore.content import StaticContent
+
+log = logging.getLogger(__name__)
+
+# The size of the chunks the memory-mapped files are streamed in
+DISK_CACHE_CHUNK_SIZE = 64 * 1024
+
+
+class MappedStaticContent(StaticContent):
+    """
+    StaticContent whose data is read from a memory-mapped file in the asset disk cache.
+    """
+    def __init__(self, content, path):
+        super(MappedStaticContent, self).__init__(
+            content.location, content.name, content.content_type, None,
+            last_modified_at=content.last_modified_at, thumbnail_location=content.thumbnail_location,
+            import_path=content.import_path, length=content.length, locked=getattr(content, 'locked', False),
+            content_digest=content.content_digest,
+        )
+        self.path = path
+
+    @property
+    def data(self):
+        with open(self.path, 'rb') as asset_file:
+            return asset_file.read()
+
+    def stream_data(self):
+        return self.stream_data_in_range(0, self.length - 1)
+
+    def stream_data_in_range(self, first_byte, last_byte):
+        """
+        Stream the data between first_byte and last_byte (included)
+        """
+        with open(self.path, 'rb') as asset_file:
+            mapped_file = mmap.mmap(asset_file.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                position = first_byte
+                while position <= last_byte:
+                    end = min(position + DISK_CACHE_CHUNK_SIZE, last_byte + 1)
+                    yield mapped_file[position:end]
+                    position = end
+            finally:
+                mapped_file.close()
+
+
+class AssetDiskCache(object):
+    """
+    Caches the content of assets in files under `directory`.
+    """
+    def __init__(self, directory, max_asset_size=None):
+        """
+        Arguments:
+            directory (str): where to put the cached files.
+            max_asset_size (int): don't cache assets larger than this many bytes.
+        """
+        self.directory = directory
+        self.max_asset_size = max_asset_size
+
+    def _path(self, content):
+        """
+        The path of the cache file for `content`.
+        """
+        location_hash = hashlib.sha1(unicode(content.location).encode('utf-8')).hexdigest()
+        return os.path.join(
+            self.directory, location_hash[:2], u'{}-{}'.format(location_hash, content.content_digest)
+        )
+
+    def is_cacheable(self, content):
+        """
+        Whether `content` may be put in the cache.
+        """
+        return (
+            getattr(content, 'content_digest', None) is not None and
+            bool(content.length) and
+            (self.max_asset_size is None or content.length <= self.max_asset_size)
+        )
+
+    def get(self, content):
+        """
+        Return a MappedStaticContent for `content` if it's in the cache, otherwise None.
+        """
+        path = self._path(content)
+        if os.path.exists(path):
+            return MappedStaticContent(content, path)
+        return None
+
+    def store(self, content):
+        """
+        Write the data of `content` (a StaticContent or StaticContentStream) to the cache,
+        and return a MappedStaticContent reading it from there.
+        """
+        path = self._path(content)
+        directory = os.path.dirname(path)
+        if not os.path.isdir(directory):
+            try:
+                os.makedirs(directory)
+            except OSError:
+                # created by another process in the meantime
+                if not os.path.isdir(directory):
+                    raise
+
+        # write to a temporary file first, so that no other process ever serves a partial file
+        with tempfile.NamedTemporaryFile(dir=directory, delete=False) as temp_file:
+            try:
+                for chunk in content.stream_data():
+                    temp_file.write(chunk)
+            except Exception:
+                os.remove(temp_file.name)
+                raise
+        if os.path.getsize(temp_file.name) != content.length:
+            os.remove(temp_file.name)
+            raise IOError(u'Incomplete copy of {} for the asset disk cache'.format(content.location))
+        os.rename(temp_file.name, path)
+        return MappedStaticContent(content, path)
+
+    def get_or_store(self, content):
+        """
+        Return a MappedStaticContent for `content`, adding it to the cache if needed. Returns None
+        if it can't be cached (in which case `content`'s stream may have been partially read).
+        """
+        if not self.is_cacheable(content):
+            return None
+        try:
+            return self.get(content) or self.store(content)
+        except (IOError, OSError):
+            log.exception(u'Unable to use the asset disk cache for %s', content.location)
+            return None
+
+
+def get_asset_disk_cache():
+    """
+    Return the AssetDiskCache configured by the ASSET_DISK_CACHE setting, or None if it's disabled.
+    """
+    config = getattr(settings, 'ASSET_DISK_CACHE', None) or {}
+    if not config.get('DIRECTORY'):
+        return None
+    return AssetDiskCache(config['DIRECTORY'], config.get('MAX_ASSET_SIZE'))
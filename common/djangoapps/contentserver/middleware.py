@@ -2,11 +2,14 @@
 Middleware to serve assets.
 """
 
+import calendar
 import logging
 
+from django.conf import settings
 from django.http import (
     HttpResponse, HttpResponseNotModified, HttpResponseForbidden
 )
+from django.utils.http import http_date, parse_http_date_safe
 from student.models import CourseEnrollment
 
 from xmodule.assetstore.assetmgr import AssetManager
@@ -15,6 +18,7 @@ from xmodule.modulestore import InvalidLocationError
 from opaque_keys import InvalidKeyError
 from opaque_keys.edx.locator import AssetLocator
 from cache_toolbox.core import get_cached_content, set_cached_content
+from contentserver.disk_cache import get_asset_disk_cache
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.exceptions import NotFoundError
 
@@ -23,6 +27,9 @@ from xmodule.exceptions import NotFoundError
 
 log = logging.getLogger(__name__)
 
+# Assets smaller than this are kept in the django cache
+MAX_CACHED_CONTENT_SIZE = 1048576
+
 
 class StaticContentServer(object):
     def process_request(self, request):
@@ -55,10 +62,21 @@ class StaticContentServer(object):
                 # since we fetched it from DB, let's cache it going forward, but only if it's < 1MB
                 # this is because I haven't been able to find a means to stream data out of memcached
                 if content.length is not None:
-                    if content.length < 1048576:
+                    if content.length < MAX_CACHED_CONTENT_SIZE:
                         # since we've queried as a stream, let's read in the stream into memory to set in cache
                         content = content.copy_to_in_mem()
                         set_cached_content(content)
+                    else:
+                        # larger assets are served from the local disk cache (if there is one), so that
+                        # only their metadata has to be read from the DB
+                        disk_cache = get_asset_disk_cache()
+                        if disk_cache is not None and disk_cache.is_cacheable(content):
+                            cached_content = disk_cache.get_or_store(content)
+                            if cached_content is None:
+                                # the stream may have been consumed by the failed attempt
+                                content = AssetManager.find(loc, as_stream=True)
+                            else:
+                                content = cached_content
             else:
                 # NOP here, but we may wish to add a "cache-hit" counter in the future
                 pass
@@ -77,16 +95,11 @@ class StaticContentServer(object):
                     ):
                         return HttpResponseForbidden('Unauthorized')
 
-            # convert over the DB persistent last modified timestamp to a HTTP compatible
-            # timestamp, so we can simply compare the strings
-            last_modified_at_str = content.last_modified_at.strftime("%a, %d-%b-%Y %H:%M:%S GMT")
-
-            # see if the client has cached this content, if so then compare the
-            # timestamps, if they are the same then just return a 304 (Not Modified)
-            if 'HTTP_IF_MODIFIED_SINCE' in request.META:
-                if_modified_since = request.META['HTTP_IF_MODIFIED_SINCE']
-                if if_modified_since == last_modified_at_str:
-                    return HttpResponseNotModified()
+            # see if the client has cached this content, if so then just return a 304 (Not Modified)
+            if is_not_modified(request, content):
+                response = HttpResponseNotModified()
+                set_caching_headers(response, content)
+                return response
 
             # *** File streaming within a byte range ***
             # If a Range is provided, parse Range attribute of the request
@@ -96,10 +109,6 @@ class StaticContentServer(object):
             # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.35
             response = None
             if request.META.get('HTTP_RANGE'):
-                # Data from cache (StaticContent) has no easy byte management, so we use the DB instead (StaticContentStream)
-                if type(content) == StaticContent:
-                    content = AssetManager.find(loc, as_stream=True)
-
                 header_value = request.META['HTTP_RANGE']
                 try:
                     unit, ranges = parse_range_header(header_value, content.length)
@@ -144,11 +153,60 @@ class StaticContentServer(object):
             # "Accept-Ranges: bytes" tells the user that only "bytes" ranges are allowed
             response['Accept-Ranges'] = 'bytes'
             response['Content-Type'] = content.content_type
-            response['Last-Modified'] = last_modified_at_str
+            set_caching_headers(response, content)
 
             return response
 
 
+def get_etag(content):
+    """
+    Returns the (strong) ETag of the content, or None if the digest of its data isn't known.
+    """
+    content_digest = getattr(content, 'content_digest', None)
+    if content_digest is None:
+        return None
+    return '"{}"'.format(content_digest)
+
+
+def is_not_modified(request, content):
+    """
+    Returns whether the copy of the content the client holds, as described by the
+    If-None-Match or If-Modified-Since request headers, is still current.
+
+    See spec for details: http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.26
+    """
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        # If-None-Match takes precedence over If-Modified-Since
+        etag = get_etag(content)
+        if etag is None:
+            return False
+        etags = [value.strip() for value in if_none_match.split(',')]
+        return '*' in etags or etag in etags or 'W/' + etag in etags
+
+    if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+    if if_modified_since is None:
+        return False
+    # HTTP dates have a one second resolution
+    return calendar.timegm(content.last_modified_at.utctimetuple()) <= if_modified_since
+
+
+def set_caching_headers(response, content):
+    """
+    Sets the headers which let clients and intermediate caches reuse the content.
+    """
+    response['Last-Modified'] = http_date(calendar.timegm(content.last_modified_at.utctimetuple()))
+    etag = get_etag(content)
+    if etag is not None:
+        response['ETag'] = etag
+
+    if getattr(content, 'locked', False):
+        # locked content must never be served to other users by a shared cache
+        response['Cache-Control'] = 'private, no-cache'
+    elif settings.STATIC_CONTENT_CACHE_MAX_AGE:
+        response['Cache-Control'] = 'public, max-age={}'.format(settings.STATIC_CONTENT_CACHE_MAX_AGE)
+
+
 def parse_range_header(header_value, content_length):
     """
     Returns the unit and a list of (start, end) tuples of ranges.
@@ -3,14 +3,23 @@ Tests for StaticContentServer
 """
 import copy
 import ddt
+import hashlib
 import logging
+import os
+import shutil
+import tempfile
 import unittest
 from uuid import uuid4
 
+from mock import patch
+
 from django.conf import settings
 from django.test.client import Client
 from django.test.utils import override_settings
+from django.utils.http import http_date, parse_http_date
 
+from opaque_keys.edx.locations import AssetLocation
+from xmodule.contentstore.content import StaticContent
 from xmodule.contentstore.django import contentstore
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
@@ -18,6 +27,7 @@ from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.xml_importer import import_course_from_xml
 
 from contentserver.middleware import parse_range_header
+from contentserver.disk_cache import AssetDiskCache, MappedStaticContent
 from student.models import CourseEnrollment
 
 log = logging.getLogger(__name__)
@@ -144,6 +154,79 @@ class ContentStoreToyCourseTest(ModuleStoreTestCase):
             first=first_byte, last=last_byte, length=self.length_unlocked))
         self.assertEqual(resp['Content-Length'], str(last_byte - first_byte + 1))
 
+    def test_range_request_from_cache(self):
+        """
+        Test that range requests for assets in the django cache don't go back to the DB.
+        """
+        full_content = self.client.get(self.url_unlocked).content
+        with patch('contentserver.middleware.AssetManager.find') as mock_find:
+            resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=1-3')
+        self.assertFalse(mock_find.called)
+        self.assertEqual(resp.status_code, 206)
+        self.assertEqual(resp.content, full_content[1:4])
+
+    def test_disk_cache(self):
+        """
+        Test that large assets are served, in full and in ranges, from the disk cache.
+        """
+        full_content = self.client.get(self.url_unlocked).content
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+
+        with patch('contentserver.middleware.MAX_CACHED_CONTENT_SIZE', 0):
+            with override_settings(ASSET_DISK_CACHE={'DIRECTORY': cache_dir}):
+                with patch('contentserver.middleware.get_cached_content', return_value=None):
+                    resp = self.client.get(self.url_unlocked)
+                    self.assertEqual(resp.status_code, 200)
+                    self.assertEqual(resp.content, full_content)
+                    self.assertEqual(sum(len(files) for __, __, files in os.walk(cache_dir)), 1)
+
+                    resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=1-3')
+                    self.assertEqual(resp.status_code, 206)
+                    self.assertEqual(resp.content, full_content[1:4])
+                    self.assertTrue(resp['ETag'])
+
+    def test_etag(self):
+        """
+        Test that the ETag is the digest of the asset and is honored by If-None-Match.
+        """
+        resp = self.client.get(self.url_unlocked)
+        self.assertEqual(resp['ETag'], '"{}"'.format(hashlib.md5(resp.content).hexdigest()))
+
+        resp = self.client.get(self.url_unlocked, HTTP_IF_NONE_MATCH=resp['ETag'])
+        self.assertEqual(resp.status_code, 304)
+        self.assertIn('ETag', resp)
+
+        resp = self.client.get(self.url_unlocked, HTTP_IF_NONE_MATCH='"not-the-etag"')
+        self.assertEqual(resp.status_code, 200)
+
+    def test_if_modified_since(self):
+        """
+        Test that If-Modified-Since is compared as a date, not as a string.
+        """
+        last_modified = parse_http_date(self.client.get(self.url_unlocked)['Last-Modified'])
+
+        resp = self.client.get(self.url_unlocked, HTTP_IF_MODIFIED_SINCE=http_date(last_modified))
+        self.assertEqual(resp.status_code, 304)
+        resp = self.client.get(self.url_unlocked, HTTP_IF_MODIFIED_SINCE=http_date(last_modified + 3600))
+        self.assertEqual(resp.status_code, 304)
+        resp = self.client.get(self.url_unlocked, HTTP_IF_MODIFIED_SINCE=http_date(last_modified - 3600))
+        self.assertEqual(resp.status_code, 200)
+        resp = self.client.get(self.url_unlocked, HTTP_IF_MODIFIED_SINCE='not a date')
+        self.assertEqual(resp.status_code, 200)
+
+    def test_cache_control(self):
+        """
+        Test that only unlocked assets may be cached by shared caches.
+        """
+        with override_settings(STATIC_CONTENT_CACHE_MAX_AGE=3600):
+            resp = self.client.get(self.url_unlocked)
+            self.assertEqual(resp['Cache-Control'], 'public, max-age=3600')
+
+            self.client.login(username=self.staff_usr, password=self.staff_pwd)
+            resp = self.client.get(self.url_locked)
+            self.assertEqual(resp['Cache-Control'], 'private, no-cache')
+
     def test_range_request_multiple_ranges(self):
         """
         Test that multiple ranges in request outputs the full content.
@@ -193,6 +276,38 @@ class ContentStoreToyCourseTest(ModuleStoreTestCase):
         self.assertEqual(resp.status_code, 416)
 
 
+class AssetDiskCacheTestCase(unittest.TestCase):
+    """
+    Tests for the AssetDiskCache.
+    """
+    def setUp(self):
+        super(AssetDiskCacheTestCase, self).setUp()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.cache = AssetDiskCache(self.directory, max_asset_size=100)
+        self.data = ''.join(chr(i % 256) for i in range(50))
+        self.content = StaticContent(
+            AssetLocation('org', 'course', 'run', 'asset', 'file.bin'), 'file.bin', 'application/octet-stream',
+            self.data, length=len(self.data), content_digest='abcdef',
+        )
+
+    def test_store_and_get(self):
+        self.assertIsNone(self.cache.get(self.content))
+        mapped = self.cache.get_or_store(self.content)
+        self.assertIsInstance(mapped, MappedStaticContent)
+        self.assertEqual(mapped.data, self.data)
+        self.assertEqual(''.join(mapped.stream_data_in_range(10, 19)), self.data[10:20])
+        self.assertEqual(self.cache.get(self.content).path, mapped.path)
+
+    def test_not_cacheable(self):
+        self.content.content_digest = None
+        self.assertIsNone(self.cache.get_or_store(self.content))
+        self.content.content_digest = 'abcdef'
+        self.content.length = 101
+        self.assertIsNone(self.cache.get_or_store(self.content))
+        self.assertEqual(os.listdir(self.directory), [])
+
+
 @ddt.ddt
 class ParseRangeHeaderTestCase(unittest.TestCase):
     """
@@ -1,8 +1,17 @@
 import threading
 
-_request_cache_threadlocal = threading.local()
-_request_cache_threadlocal.data = {}
-_request_cache_threadlocal.request = None
+class _RequestCacheThreadLocal(threading.local):
+    """
+    The request cache of each thread.  Threads the middleware never runs in
+    (e.g. worker threads) start out with an empty cache and no current request.
+    """
+    def __init__(self):
+        super(_RequestCacheThreadLocal, self).__init__()
+        self.data = {}
+        self.request = None
+
+
+_request_cache_threadlocal = _RequestCacheThreadLocal()
 
 
 class RequestCache(object):
@@ -18,6 +27,17 @@ class RequestCache(object):
         """
         return _request_cache_threadlocal.request
 
+    @classmethod
+    def get_current_request_cache(cls):
+        """
+        Get the data dictionary of the request cache, if we are presently
+        servicing a request, or None.  Outside of a request (e.g. in a celery
+        task) nothing ever clears the cache, so nothing should be kept there.
+        """
+        if cls.get_current_request() is None:
+            return None
+        return _request_cache_threadlocal.data
+
     @classmethod
     def clear_request_cache(cls):
         """
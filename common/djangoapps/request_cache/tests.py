@@ -0,0 +1,30 @@
+"""
+Tests of RequestCache
+"""
+import threading
+
+from django.test import TestCase
+
+from request_cache.middleware import RequestCache
+from util.testing import RequestCacheTestMixin
+
+
+class RequestCacheTests(RequestCacheTestMixin, TestCase):
+    """
+    Tests of the request cache, inside and outside of requests.
+    """
+    def test_no_request(self):
+        self.assertIsNone(RequestCache.get_current_request_cache())
+
+    def test_request(self):
+        self.start_request()
+        RequestCache.get_current_request_cache()['key'] = 'value'
+        self.assertEqual(RequestCache.get_current_request_cache(), {'key': 'value'})
+
+    def test_worker_thread(self):
+        self.start_request()
+        results = []
+        thread = threading.Thread(target=lambda: results.append(RequestCache.get_current_request_cache()))
+        thread.start()
+        thread.join()
+        self.assertEqual(results, [None])
@@ -8,6 +8,7 @@ from abc import ABCMeta, abstractmethod
 from django.contrib.auth.models import User
 import logging
 
+from request_cache.middleware import RequestCache
 from student.models import CourseAccessRole
 from xmodule_django.models import CourseKeyField
 
@@ -17,6 +18,8 @@ log = logging.getLogger(__name__)
 # A list of registered access roles.
 REGISTERED_ACCESS_ROLES = {}
 
+ROLE_CACHE_KEY = "student.roles.role_cache"
+
 
 def register_access_role(cls):
     """
@@ -39,20 +42,55 @@ class RoleCache(object):
     A cache of the CourseAccessRoles held by a particular user
     """
     def __init__(self, user):
+        # Stored as tuples, rather than django models, so that lookups are cheap
         self._roles = set(
-            CourseAccessRole.objects.filter(user=user).all()
+            (access_role.role, access_role.course_id, access_role.org)
+            for access_role in CourseAccessRole.objects.filter(user=user)
         )
 
     def has_role(self, role, course_id, org):
         """
         Return whether this RoleCache contains a role with the specified role, course_id, and org
         """
-        return any(
-            access_role.role == role and
-            access_role.course_id == course_id and
-            access_role.org == org
-            for access_role in self._roles
-        )
+        return (role, course_id, org) in self._roles
+
+    def roles(self):
+        """
+        Return the (role, course_id, org) tuples of all of the roles in this RoleCache
+        """
+        return frozenset(self._roles)
+
+
+def get_role_cache(user):
+    """
+    Return the RoleCache of the supplied (authenticated) django user.
+
+    It is kept on the user object and, while a request is being served, shared by
+    all of the objects representing that user for the rest of the request. A new
+    RoleCache is built once the user's roles are changed.
+    """
+    # pylint: disable=protected-access
+    if not hasattr(user, '_roles'):
+        request_cache = RequestCache.get_current_request_cache()
+        if request_cache is not None:
+            key = (ROLE_CACHE_KEY, user.id)
+            if key not in request_cache:
+                request_cache[key] = RoleCache(user)
+            user._roles = request_cache[key]
+        else:
+            user._roles = RoleCache(user)
+    return user._roles
+
+
+def _clear_role_cache(user):
+    """
+    Drop the RoleCache of the supplied django user, after its roles have changed.
+    """
+    if hasattr(user, '_roles'):
+        del user._roles  # pylint: disable=protected-access
+    request_cache = RequestCache.get_current_request_cache()
+    if request_cache is not None:
+        request_cache.pop((ROLE_CACHE_KEY, user.id), None)
 
 
 class AccessRole(object):
@@ -137,13 +175,7 @@ class RoleBase(AccessRole):
         if not (user.is_authenticated() and user.is_active):
             return False
 
-        # pylint: disable=protected-access
-        if not hasattr(user, '_roles'):
-            # Cache a list of tuples identifying the particular roles that a user has
-            # Stored as tuples, rather than django models, to make it cheaper to construct objects for comparison
-            user._roles = RoleCache(user)
-
-        return user._roles.has_role(self._role_name, self.course_key, self.org)
+        return get_role_cache(user).has_role(self._role_name, self.course_key, self.org)
 
     def add_users(self, *users):
         """
@@ -156,8 +188,7 @@ class RoleBase(AccessRole):
             if user.is_authenticated and user.is_active and not self.has_user(user):
                 entry = CourseAccessRole(user=user, role=self._role_name, course_id=self.course_key, org=self.org)
                 entry.save()
-                if hasattr(user, '_roles'):
-                    del user._roles
+                _clear_role_cache(user)
 
     def remove_users(self, *users):
         """
@@ -168,8 +199,7 @@ class RoleBase(AccessRole):
         )
         entries.delete()
         for user in users:
-            if hasattr(user, '_roles'):
-                del user._roles
+            _clear_role_cache(user)
 
     def users_with_role(self):
         """
@@ -328,11 +358,7 @@ class UserBasedRole(object):
         if not (self.user.is_authenticated() and self.user.is_active):
             return False
 
-        # pylint: disable=protected-access
-        if not hasattr(self.user, '_roles'):
-            self.user._roles = RoleCache(self.user)
-
-        return self.user._roles.has_role(self.role, course_key, course_key.org)
+        return get_role_cache(self.user).has_role(self.role, course_key, course_key.org)
 
     def add_course(self, *course_keys):
         """
@@ -342,8 +368,7 @@ class UserBasedRole(object):
             for course_key in course_keys:
                 entry = CourseAccessRole(user=self.user, role=self.role, course_id=course_key, org=course_key.org)
                 entry.save()
-            if hasattr(self.user, '_roles'):
-                del self.user._roles
+            _clear_role_cache(self.user)
         else:
             raise ValueError("user is not active. Cannot grant access to courses")
 
@@ -353,8 +378,7 @@ class UserBasedRole(object):
         """
         entries = CourseAccessRole.objects.filter(user=self.user, role=self.role, course_id__in=course_keys)
         entries.delete()
-        if hasattr(self.user, '_roles'):
-            del self.user._roles
+        _clear_role_cache(self.user)
 
     def courses_with_role(self):
         """
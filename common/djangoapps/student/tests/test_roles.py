@@ -2,14 +2,16 @@
 Tests of student.roles
 """
 import ddt
+from django.contrib.auth.models import User
 from django.test import TestCase
 
 from courseware.tests.factories import UserFactory, StaffFactory, InstructorFactory
 from student.tests.factories import AnonymousUserFactory
+from util.testing import RequestCacheTestMixin
 
 from student.roles import (
     GlobalStaff, CourseRole, CourseStaffRole, CourseInstructorRole,
-    OrgStaffRole, OrgInstructorRole, RoleCache, CourseBetaTesterRole
+    OrgStaffRole, OrgInstructorRole, RoleCache, CourseBetaTesterRole, get_role_cache
 )
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 
@@ -158,7 +160,7 @@ class RolesTestCase(TestCase):
 
 
 @ddt.ddt
-class RoleCacheTestCase(TestCase):
+class RoleCacheTestCase(RequestCacheTestMixin, TestCase):
 
     IN_KEY = SlashSeparatedCourseKey('edX', 'toy', '2012_Fall')
     NOT_IN_KEY = SlashSeparatedCourseKey('edX', 'toy', '2013_Fall')
@@ -193,3 +195,12 @@ class RoleCacheTestCase(TestCase):
     def test_empty_cache(self, role, target):
         cache = RoleCache(self.user)
         self.assertFalse(cache.has_role(*target))
+
+    def test_shared_within_request(self):
+        self.start_request()
+        same_user = User.objects.get(id=self.user.id)
+        with self.assertNumQueries(1):
+            self.assertIs(get_role_cache(self.user), get_role_cache(same_user))
+
+        CourseStaffRole(self.IN_KEY).add_users(self.user)
+        self.assertTrue(CourseStaffRole(self.IN_KEY).has_user(User.objects.get(id=self.user.id)))
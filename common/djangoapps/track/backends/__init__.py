@@ -26,3 +26,12 @@ class BaseBackend(object):
     def send(self, event):
         """Send event to tracker."""
         pass
+
+    def send_many(self, events):
+        """
+        Send a list of events to tracker.
+
+        Backends that can store several events at once should override this.
+        """
+        for event in events:
+            self.send(event)
@@ -0,0 +1,283 @@
+"""
+Event tracker backend that writes events to a file in a compact format.
+
+The fields that are repeated for every event of a request (user, ip,
+agent, context, etc.) are written once, as a context record, and
+referenced by the events that follow it. Each record is a JSON object on
+its own line::
+
+  {"ctx": 1, "fields": {"username": "bob", "ip": "10.0.0.1", "context": {...}, ...}}
+  {"ref": 1, "event_type": "play_video", "time": "...", "event": "..."}
+  {"ref": 1, "event_type": "pause_video", "time": "...", "event": "..."}
+
+Use `read_events` (or the `expand_tracking_log` management command) to
+turn these records back into the events that were sent.
+
+Context ids are only meaningful within the file they were written to, so
+each process writes its own file: `{pid}` in the filename is replaced by
+the id of the process.
+
+"""
+
+from __future__ import absolute_import
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+
+from track.backends import BaseBackend
+from track.utils import DateTimeJSONEncoder
+
+log = logging.getLogger('track.backends.compact')
+
+
+# The fields of an event that are the same for every event of a request
+CONTEXT_FIELDS = (
+    'username',
+    'session',
+    'ip',
+    'agent',
+    'host',
+    'referer',
+    'accept_language',
+    'event_source',
+    'page',
+    'context',
+)
+
+
+class CompactEventEncoder(object):
+    """
+    Turns events into compact records, interning their context fields.
+    """
+    def __init__(self, max_contexts=1000):
+        """
+        :Parameters:
+          - `max_contexts`: how many contexts to remember. When there are
+            more, the contexts are forgotten and numbered from 1 again.
+
+        """
+        self.max_contexts = max_contexts
+        self.contexts = {}
+        # The last context seen for each user and page, so that the context of
+        # the events of a request doesn't have to be serialized to be looked up.
+        self.recent_contexts = {}
+        self.encoder = DateTimeJSONEncoder(separators=(',', ':'))
+
+    def encode(self, event):
+        """
+        Return the lines (without newlines) recording `event`.
+        """
+        context = {field: event[field] for field in CONTEXT_FIELDS if field in event}
+        record = {field: value for field, value in event.iteritems() if field not in CONTEXT_FIELDS}
+
+        recent_key = (event.get('username'), event.get('page'))
+        recent = self.recent_contexts.get(recent_key)
+        if recent is not None and recent[0] == context:
+            record['ref'] = recent[1]
+            return [self.encoder.encode(record)]
+
+        context_str = self.encoder.encode(context)
+        context_id = self.contexts.get(context_str)
+        if context_id is not None:
+            record['ref'] = context_id
+            lines = [self.encoder.encode(record)]
+        else:
+            if len(self.contexts) >= self.max_contexts:
+                self.contexts.clear()
+                self.recent_contexts.clear()
+            record['ref'] = len(self.contexts) + 1
+            lines = [
+                '{{"ctx":{0},"fields":{1}}}'.format(record['ref'], context_str),
+                self.encoder.encode(record),
+            ]
+            # Only remember the context once the event could be serialized
+            self.contexts[context_str] = record['ref']
+        self.recent_contexts[recent_key] = (context, record['ref'])
+        return lines
+
+
+def read_events(lines):
+    """
+    Return a generator of the events recorded by `lines`, in the compact format.
+
+    Records referencing a context that isn't in `lines` (e.g. because the
+    start of the file was truncated away) are logged and skipped.
+    """
+    contexts = {}
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        record = json.loads(line)
+        if 'ctx' in record:
+            contexts[record['ctx']] = record['fields']
+            continue
+        context = contexts.get(record.pop('ref', None))
+        if context is None:
+            log.warning('Skipping tracking event record with an unknown context: %s', line)
+            continue
+        event = dict(context)
+        event.update(record)
+        yield event
+
+
+class CompactFileBackend(BaseBackend):
+    """
+    Event tracker backend that writes events to a file in a compact format.
+
+    Events are buffered, and written to the file every `flush_interval`
+    seconds, by a background thread or by the next event sent. Like
+    logging.handlers.WatchedFileHandler, the file is reopened if it was
+    moved, deleted or truncated (e.g. when it is rotated by logrotate).
+    Unlike LoggerBackend, records aren't truncated, as a truncated record
+    couldn't be read back.
+
+    """
+    def __init__(self, filename, flush_interval=1.0, max_buffered_events=1000, max_contexts=1000, **kwargs):
+        """
+        :Parameters:
+          - `filename`: the file to append the records to. `{pid}` is
+            replaced by the id of the process.
+          - `flush_interval`: how many seconds events may stay in the
+            buffer before being written to the file.
+          - `max_buffered_events`: how many events may be buffered before
+            being written to the file.
+          - `max_contexts`: see CompactEventEncoder.
+
+        """
+        super(CompactFileBackend, self).__init__(**kwargs)
+        self.filename = filename
+        self.flush_interval = flush_interval
+        self.max_buffered_events = max_buffered_events
+        self.max_contexts = max_contexts
+        self.lock = threading.Lock()
+        self.pid = None
+        self.path = None
+        self.output = None
+        self.output_size = None
+        self.encoder = None
+        self.buffer = []
+        self.last_flush = None
+        atexit.register(self.flush)
+
+    def _open(self):
+        """
+        Open the file of this process, if it isn't open yet.
+        """
+        if self.pid == os.getpid():
+            return
+        # Forked processes must neither write to their parent's file, nor
+        # reference the contexts written to it.
+        self.path = self.filename.format(pid=os.getpid())
+        self._open_file()
+        self.buffer = []
+        self.last_flush = time.time()
+        self.pid = os.getpid()
+        # Write the buffered events even when no more events are sent, so
+        # that they aren't lost if the process is killed while idle.
+        thread = threading.Thread(target=self._flush_periodically, args=(self.pid,), name='track.backends.compact')
+        thread.daemon = True
+        thread.start()
+
+    def _open_file(self):
+        """
+        Open the file, with a new encoder, as records can only reference the
+        contexts written to the same file.
+        """
+        self.output = open(self.path, 'ab')
+        self.output_size = os.fstat(self.output.fileno()).st_size
+        self.encoder = CompactEventEncoder(self.max_contexts)
+
+    def _reopen_if_rotated(self):
+        """
+        Reopen the file if it was moved, deleted or truncated since it was
+        last written to.
+        """
+        try:
+            path_stat = os.stat(self.path)
+        except OSError:
+            path_stat = None
+        output_stat = os.fstat(self.output.fileno())
+        if (
+                path_stat is not None and
+                (path_stat.st_dev, path_stat.st_ino) == (output_stat.st_dev, output_stat.st_ino) and
+                output_stat.st_size >= self.output_size
+        ):
+            return
+        self.output.close()
+        self._open_file()
+
+    def send(self, event):
+        self.send_many([event])
+
+    def send_many(self, events):
+        with self.lock:
+            try:
+                self._open()
+                self.buffer.extend(events)
+                if (
+                        len(self.buffer) >= self.max_buffered_events or
+                        time.time() - self.last_flush >= self.flush_interval
+                ):
+                    self._flush()
+            except (IOError, OSError):
+                log.exception('Error writing to the compact event tracker backend')
+
+    def _flush_periodically(self, pid):
+        """
+        Write the buffered events to the file every `flush_interval` seconds,
+        until the file of process `pid` is no longer the one written to.
+        """
+        # Module globals may already be cleared when this thread wakes up
+        # while the interpreter exits (the buffer is then empty, see atexit).
+        sleep, now = time.sleep, time.time
+        while True:
+            sleep(self.flush_interval)
+            with self.lock:
+                if self.pid != pid:
+                    return
+                if not self.buffer or now() - self.last_flush < self.flush_interval:
+                    continue
+                try:
+                    self._flush()
+                except (IOError, OSError):
+                    log.exception('Error writing to the compact event tracker backend')
+
+    def _flush(self):
+        """
+        Write the buffered events to the file.
+
+        Events are only encoded now, once it is known which file their
+        records are written to.
+        """
+        events, self.buffer = self.buffer, []
+        self.last_flush = time.time()
+        if not events:
+            return
+        self._reopen_if_rotated()
+        lines = []
+        for event in events:
+            try:
+                lines.extend(self.encoder.encode(event))
+            except (TypeError, ValueError):
+                log.exception('Unable to serialize event for the compact event tracker backend')
+        if not lines:
+            return
+        self.output.write('\n'.join(lines) + '\n')
+        self.output.flush()
+        self.output_size = os.fstat(self.output.fileno()).st_size
+
+    def flush(self):
+        """
+        Write the buffered events to the file.
+        """
+        with self.lock:
+            if self.pid == os.getpid():
+                try:
+                    self._flush()
+                except (IOError, OSError):
+                    log.exception('Error writing to the compact event tracker backend')
@@ -0,0 +1,143 @@
+from __future__ import absolute_import
+
+import datetime
+import os
+import shutil
+import tempfile
+import time
+
+from django.test import TestCase
+
+from track.backends.compact import CompactEventEncoder, CompactFileBackend, read_events
+
+
+def make_event(username, event_type):
+    """Return an event sent by `username`"""
+    return {
+        'username': username,
+        'ip': '127.0.0.1',
+        'event_source': 'browser',
+        'context': {'course_id': 'edX/Test/2014', 'user_id': 1},
+        'event_type': event_type,
+        'event': '{"id": "video"}',
+        'time': datetime.datetime(2012, 05, 01, 07, 27, 01, 200),
+    }
+
+
+class TestCompactEventEncoder(TestCase):
+    def setUp(self):
+        super(TestCompactEventEncoder, self).setUp()
+        self.encoder = CompactEventEncoder(max_contexts=2)
+
+    def test_context_written_once(self):
+        first = self.encoder.encode(make_event('alice', 'play_video'))
+        second = self.encoder.encode(make_event('alice', 'pause_video'))
+        third = self.encoder.encode(make_event('bob', 'play_video'))
+
+        self.assertEqual(len(first), 2)
+        self.assertEqual(len(second), 1)
+        self.assertEqual(len(third), 2)
+
+    def test_round_trip(self):
+        events = [
+            make_event(username, event_type)
+            for username in ('alice', 'bob', 'carol', 'alice')
+            for event_type in ('play_video', 'pause_video')
+        ]
+        lines = [line for event in events for line in self.encoder.encode(event)]
+
+        for event, read_event in zip(events, read_events(lines)):
+            self.assertEqual(read_event['username'], event['username'])
+            self.assertEqual(read_event['event_type'], event['event_type'])
+            self.assertEqual(read_event['context'], event['context'])
+            self.assertEqual(read_event['time'], '2012-05-01T07:27:01.000200+00:00')
+        self.assertEqual(len(list(read_events(lines))), len(events))
+
+    def test_unserializable_event(self):
+        event = make_event('alice', 'play_video')
+        event['event'] = object()
+
+        with self.assertRaises(TypeError):
+            self.encoder.encode(event)
+
+        # The context wasn't recorded, so it is written with the next event
+        self.assertEqual(len(self.encoder.encode(make_event('alice', 'play_video'))), 2)
+
+    def test_read_unknown_context(self):
+        lines = self.encoder.encode(make_event('alice', 'play_video'))
+        lines += self.encoder.encode(make_event('alice', 'pause_video'))
+
+        # The context record was lost, e.g. truncated away by log rotation
+        events = list(read_events(lines[1:] + self.encoder.encode(make_event('bob', 'play_video'))))
+
+        self.assertEqual([event['username'] for event in events], ['bob'])
+
+
+class TestCompactFileBackend(TestCase):
+    def setUp(self):
+        super(TestCompactFileBackend, self).setUp()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.backend = CompactFileBackend(
+            filename=os.path.join(self.directory, 'tracking-{pid}.log'), flush_interval=60
+        )
+        self.path = os.path.join(self.directory, 'tracking-{}.log'.format(os.getpid()))
+
+    def read_file(self):
+        """Return the events written to the file"""
+        with open(self.path, 'rb') as log_file:
+            return list(read_events(log_file))
+
+    def test_buffered_until_flush(self):
+        self.backend.send(make_event('alice', 'play_video'))
+        self.backend.send_many([make_event('alice', 'pause_video'), make_event('bob', 'play_video')])
+
+        self.assertEqual(self.read_file(), [])
+
+        self.backend.flush()
+
+        events = self.read_file()
+        self.assertEqual(
+            [(event['username'], event['event_type']) for event in events],
+            [('alice', 'play_video'), ('alice', 'pause_video'), ('bob', 'play_video')]
+        )
+
+    def test_flushed_after_interval(self):
+        self.backend.flush_interval = 0
+
+        self.backend.send(make_event('alice', 'play_video'))
+
+        self.assertEqual(len(self.read_file()), 1)
+
+    def test_flushed_when_idle(self):
+        self.backend.flush_interval = 0.01
+
+        self.backend.send(make_event('alice', 'play_video'))
+
+        deadline = time.time() + 5
+        while not self.read_file() and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(len(self.read_file()), 1)
+
+    def test_reopened_after_truncation(self):
+        self.backend.send(make_event('alice', 'play_video'))
+        self.backend.flush()
+
+        # e.g. logrotate's copytruncate
+        open(self.path, 'wb').close()
+        self.backend.send(make_event('alice', 'pause_video'))
+        self.backend.flush()
+
+        events = self.read_file()
+        self.assertEqual([(event['username'], event['event_type']) for event in events], [('alice', 'pause_video')])
+
+    def test_reopened_after_move(self):
+        self.backend.send(make_event('alice', 'play_video'))
+        self.backend.flush()
+
+        os.rename(self.path, self.path + '.1')
+        self.backend.send(make_event('alice', 'pause_video'))
+        self.backend.flush()
+
+        events = self.read_file()
+        self.assertEqual([(event['username'], event['event_type']) for event in events], [('alice', 'pause_video')])
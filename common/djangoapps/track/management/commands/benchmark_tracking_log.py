@@ -0,0 +1,109 @@
+"""
+Compare the cost of logging tracking events with the logger and compact backends.
+"""
+import datetime
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+from optparse import make_option
+
+from django.core.management.base import BaseCommand
+
+from track.backends.compact import CompactFileBackend
+from track.backends.logger import LoggerBackend
+
+
+def sample_events(count, events_per_request):
+    """
+    Return `count` video events, like those sent by requests sending `events_per_request` events each.
+    """
+    events = []
+    for index in xrange(count):
+        request = index // events_per_request
+        events.append({
+            'username': 'user{}'.format(request % 100),
+            'session': 'a' * 32,
+            'ip': '10.0.0.{}'.format(request % 256),
+            'agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/38.0 Safari/537.36',
+            'host': 'courses.example.com',
+            'referer': 'https://courses.example.com/courses/Org/Course/Run/courseware/chapter/section/',
+            'accept_language': 'en-US,en;q=0.8',
+            'event_source': 'browser',
+            'page': 'https://courses.example.com/courses/Org/Course/Run/courseware/chapter/section/',
+            'context': {
+                'course_id': 'Org/Course/Run',
+                'org_id': 'Org',
+                'user_id': request % 100,
+                'path': '/event',
+            },
+            'event_type': 'play_video',
+            'event': json.dumps({
+                'id': 'i4x-Org-Course-video-{}'.format(index % 10),
+                'currentTime': index,
+                'code': 'html5',
+            }),
+            'time': datetime.datetime.utcnow(),
+        })
+    return events
+
+
+def time_backend(backend, events):
+    """
+    Return how many seconds `backend` takes to send `events`.
+    """
+    start = time.time()
+    for event in events:
+        backend.send(event)
+    return time.time() - start
+
+
+class Command(BaseCommand):
+    """
+    Write sample events to files with both the logger and the compact backends, and print the time
+    and number of bytes each took.
+    """
+    help = 'Compare logging tracking events with the logger and compact backends.'
+
+    option_list = BaseCommand.option_list + (
+        make_option('--events',
+                    type='int',
+                    dest='events',
+                    default=100000,
+                    help='How many events to serialize.'),
+        make_option('--events-per-request',
+                    type='int',
+                    dest='events_per_request',
+                    default=10,
+                    help='How many consecutive events share their context fields.'),
+    )
+
+    def handle(self, *args, **options):
+        stdout = options.get('stdout', sys.stdout)
+        events = sample_events(options['events'], options['events_per_request'])
+        directory = tempfile.mkdtemp()
+        try:
+            logger_path = os.path.join(directory, 'logger.log')
+            handler = logging.FileHandler(logger_path)
+            event_logger = logging.getLogger('track.benchmark')
+            event_logger.propagate = False
+            event_logger.setLevel(logging.INFO)
+            event_logger.addHandler(handler)
+            try:
+                logger_time = time_backend(LoggerBackend(name='track.benchmark'), events)
+            finally:
+                event_logger.removeHandler(handler)
+                handler.close()
+
+            compact_path = os.path.join(directory, 'compact.log')
+            compact_backend = CompactFileBackend(filename=compact_path)
+            compact_time = time_backend(compact_backend, events)
+            compact_backend.flush()
+
+            for name, seconds, path in (('logger', logger_time, logger_path), ('compact', compact_time, compact_path)):
+                stdout.write('{0:8} {1:8.3f}s {2:12d} bytes\n'.format(name, seconds, os.path.getsize(path)))
+        finally:
+            shutil.rmtree(directory)
@@ -0,0 +1,28 @@
+"""
+Convert a tracking log written by the compact backend to one JSON event per line.
+"""
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from track.backends.compact import read_events
+
+
+class Command(BaseCommand):
+    """
+    Print the events of a tracking log written by track.backends.compact.CompactFileBackend,
+    in the format of track.backends.logger.LoggerBackend.
+    """
+    args = '<filename>'
+    help = 'Print the events of a compact tracking log, one JSON event per line.'
+
+    def handle(self, *args, **options):
+        if len(args) != 1:
+            raise CommandError('expand_tracking_log requires one argument: <filename>')
+
+        stdout = options.get('stdout', sys.stdout)
+        with open(args[0], 'rb') as log_file:
+            for event in read_events(log_file):
+                stdout.write(json.dumps(event))
+                stdout.write('\n')
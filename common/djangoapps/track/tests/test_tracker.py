@@ -1,6 +1,10 @@
+import os
+import Queue
+
 from django.conf import settings
 from django.test import TestCase
 from django.test.utils import override_settings
+from mock import patch
 
 import track.tracker as tracker
 from track.backends import BaseBackend
@@ -107,12 +111,107 @@ class TestTrackerDjangoInstantiation(TestCase):
         return tracker.backends
 
 
+ASYNC_SETTINGS = {
+    'ENABLED': True,
+    'QUEUE_SIZE': 100,
+    'BATCH_SIZE': 4,
+    'FLUSH_INTERVAL': 0.1,
+}
+
+
+class TestAsyncEventPipeline(TestCase):
+    """Test sending events to the backends from a background thread."""
+
+    def setUp(self):
+        super(TestAsyncEventPipeline, self).setUp()
+        # pylint: disable=protected-access
+        self.addCleanup(tracker._initialize_backends_from_django_settings)
+
+    @override_settings(TRACKING_BACKENDS=MULTI_SETTINGS, TRACKING_ASYNC=ASYNC_SETTINGS)
+    def test_events_sent_in_batches(self):
+        # pylint: disable=protected-access
+        tracker._initialize_backends_from_django_settings()
+        backends = tracker.backends.values()
+
+        for _ in xrange(10):
+            tracker.send({})
+        tracker.flush()
+
+        for backend in backends:
+            self.assertEqual(backend.count, 10)
+            self.assertTrue(all(size <= 4 for size in backend.batch_sizes))
+            self.assertEqual(sum(backend.batch_sizes), 10)
+
+    @override_settings(TRACKING_BACKENDS=SIMPLE_SETTINGS, TRACKING_ASYNC=ASYNC_SETTINGS)
+    def test_backend_error(self):
+        # pylint: disable=protected-access
+        tracker._initialize_backends_from_django_settings()
+        backend = tracker.backends.values()[0]
+
+        with patch.object(backend, 'send_many', side_effect=Exception):
+            tracker.send({})
+            tracker.flush()
+        tracker.send({})
+        tracker.flush()
+
+        self.assertEqual(backend.count, 1)
+
+    @override_settings(TRACKING_BACKENDS=SIMPLE_SETTINGS, TRACKING_ASYNC=ASYNC_SETTINGS)
+    def test_database_connections_closed_after_batch(self):
+        # pylint: disable=protected-access
+        tracker._initialize_backends_from_django_settings()
+        backend = tracker.backends.values()[0]
+
+        with patch('track.tracker.db.close_connection') as mock_close:
+            with patch.object(backend, 'send_many', side_effect=Exception):
+                tracker.send({})
+                tracker.flush()
+            self.assertEqual(mock_close.call_count, 1)
+
+            tracker.send({})
+            tracker.flush()
+            self.assertEqual(mock_close.call_count, 2)
+
+        self.assertEqual(backend.count, 1)
+
+    @patch('track.tracker.dog_stats_api')
+    def test_full_queue_drops_events(self, mock_stats):
+        backend = DummyBackend()
+        pipeline = tracker.AsyncEventPipeline(
+            {'default': backend}, queue_size=2, batch_size=10, flush_interval=0, full_timeout=0
+        )
+        # Pretend the background thread is started, so that nothing is taken off the queue
+        pipeline.queue = Queue.Queue(2)
+        pipeline.pid = os.getpid()
+
+        for _ in xrange(3):
+            pipeline.put({})
+
+        self.assertEqual(pipeline.queue.qsize(), 2)
+        mock_stats.increment.assert_called_once_with('track.send.dropped')
+
+    @override_settings(TRACKING_BACKENDS=SIMPLE_SETTINGS)
+    def test_disabled_by_default(self):
+        # pylint: disable=protected-access
+        tracker._initialize_backends_from_django_settings()
+
+        tracker.send({})
+
+        self.assertIsNone(tracker.pipeline)
+        self.assertEqual(tracker.backends.values()[0].count, 1)
+
+
 class DummyBackend(BaseBackend):
     def __init__(self, **options):
         super(DummyBackend, self).__init__(**options)
         self.flag = options.get('flag', False)
         self.count = 0
+        self.batch_sizes = []
 
     # pylint: disable=unused-argument
     def send(self, event):
         self.count += 1
+
+    def send_many(self, events):
+        self.batch_sizes.append(len(events))
+        super(DummyBackend, self).send_many(events)
@@ -16,13 +16,35 @@ below::
       }
   }
 
+By default events are sent to the backends as they are tracked. They
+can instead be put on a bounded queue, from which a background thread
+sends them to the backends in batches::
+
+  TRACKING_ASYNC = {
+      'ENABLED': True,
+      'QUEUE_SIZE': 10000,    # events waiting to be sent
+      'BATCH_SIZE': 100,      # events sent to the backends at once
+      'FLUSH_INTERVAL': 1.0,  # seconds to wait for a batch to fill up
+      'FULL_TIMEOUT': 0,      # seconds to wait for room in a full queue
+  }
+
+When the queue is full, `send` waits up to FULL_TIMEOUT seconds for the
+background thread to catch up, and then drops the event.
+
 """
 
+import atexit
 import inspect
 from importlib import import_module
+import logging
+import os
+import Queue
+import threading
+import time
 
 from dogapi import dog_stats_api
 
+from django import db
 from django.conf import settings
 
 from track.backends import BaseBackend
@@ -30,8 +52,10 @@ from track.backends import BaseBackend
 
 __all__ = ['send']
 
+log = logging.getLogger(__name__)
 
 backends = {}
+pipeline = None
 
 
 def _initialize_backends_from_django_settings():
@@ -40,6 +64,8 @@ def _initialize_backends_from_django_settings():
     configuration in django settings
 
     """
+    global pipeline  # pylint: disable=global-statement
+
     backends.clear()
 
     config = getattr(settings, 'TRACKING_BACKENDS', {})
@@ -51,6 +77,18 @@ def _initialize_backends_from_django_settings():
             options = values.get('OPTIONS', {})
             backends[name] = _instantiate_backend_from_name(engine, options)
 
+    async_config = getattr(settings, 'TRACKING_ASYNC', {})
+    if async_config.get('ENABLED', False):
+        pipeline = AsyncEventPipeline(
+            backends,
+            queue_size=async_config.get('QUEUE_SIZE', 10000),
+            batch_size=async_config.get('BATCH_SIZE', 100),
+            flush_interval=async_config.get('FLUSH_INTERVAL', 1.0),
+            full_timeout=async_config.get('FULL_TIMEOUT', 0),
+        )
+    else:
+        pipeline = None
+
 
 def _instantiate_backend_from_name(name, options):
     """
@@ -83,6 +121,102 @@ def _instantiate_backend_from_name(name, options):
     return backend
 
 
+class AsyncEventPipeline(object):
+    """
+    Sends events to the backends in batches, from a background thread.
+
+    The thread is started by the first event sent by each process, so
+    that processes forked after the backends were initialized get their
+    own thread.
+
+    """
+    def __init__(self, backends_by_name, queue_size, batch_size, flush_interval, full_timeout):
+        self.backends = backends_by_name
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.full_timeout = full_timeout
+        self.queue = None
+        self.pid = None
+        self.lock = threading.Lock()
+
+    def put(self, event):
+        """
+        Queue an event to be sent, dropping it if the queue stays full.
+        """
+        self._start()
+        try:
+            if self.full_timeout:
+                self.queue.put(event, timeout=self.full_timeout)
+            else:
+                self.queue.put_nowait(event)
+        except Queue.Full:
+            dog_stats_api.increment('track.send.dropped')
+            log.warning('Tracking event queue is full, dropping event')
+
+    def flush(self):
+        """
+        Wait until all of the queued events have been sent.
+        """
+        if self.queue is not None and self.pid == os.getpid():
+            self.queue.join()
+
+    def _start(self):
+        """
+        Create the queue and start the background thread, if this process
+        hasn't done so yet.
+        """
+        if self.pid == os.getpid():
+            return
+        with self.lock:
+            if self.pid == os.getpid():
+                return
+            self.queue = Queue.Queue(self.queue_size)
+            thread = threading.Thread(target=self._run, args=(self.queue,), name='track.tracker')
+            thread.daemon = True
+            thread.start()
+            self.pid = os.getpid()
+
+    def _run(self, queue):
+        """
+        Send the events of `queue` in batches of up to `batch_size`, waiting
+        up to `flush_interval` seconds for each batch to fill up.
+        """
+        while True:
+            batch = [queue.get()]
+            deadline = time.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(queue.get(timeout=remaining))
+                except Queue.Empty:
+                    break
+            try:
+                _send_to_backends(self.backends, batch)
+            finally:
+                # Like a request, each batch gets fresh database connections, so
+                # that a connection dropped by the server while this thread was
+                # idle doesn't fail every batch sent after it.
+                db.close_connection()
+                for _ in batch:
+                    queue.task_done()
+
+
+def _send_to_backends(backends_by_name, events):
+    """
+    Send a list of events to all of the given backends.
+    """
+    dog_stats_api.histogram('track.send.batch_size', len(events))
+    for name, backend in backends_by_name.iteritems():
+        with dog_stats_api.timer('track.send.backend.{0}'.format(name)):
+            try:
+                backend.send_many(events)
+            except Exception:  # pylint: disable=broad-except
+                log.exception('Error sending events to the %s tracking backend', name)
+
+
 @dog_stats_api.timed('track.send')
 def send(event):
     """
@@ -91,9 +225,23 @@ def send(event):
     """
     dog_stats_api.increment('track.send.count')
 
+    if pipeline is not None:
+        pipeline.put(event)
+        return
+
     for name, backend in backends.iteritems():
         with dog_stats_api.timer('track.send.backend.{0}'.format(name)):
             backend.send(event)
 
 
+def flush():
+    """
+    Wait until all of the events sent so far have reached the backends.
+
+    """
+    if pipeline is not None:
+        pipeline.flush()
+
+
 _initialize_backends_from_django_settings()
+atexit.register(flush)
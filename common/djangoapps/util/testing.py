@@ -4,6 +4,9 @@ from mock import patch
 
 from django.conf import settings
 from django.core.urlresolvers import clear_url_caches, resolve
+from django.test.client import RequestFactory
+
+from request_cache.middleware import RequestCache
 
 
 class UrlResetMixin(object):
@@ -90,3 +93,16 @@ class EventTestMixin(object):
         Reset the mock tracker in order to forget about old events.
         """
         self.mock_tracker.reset_mock()
+
+
+class RequestCacheTestMixin(object):
+    """
+    Mixin for tests of code which keeps data in the request cache while a
+    request is being served.
+    """
+    def start_request(self):
+        """
+        Serve a request, with an empty request cache, for the rest of the test.
+        """
+        RequestCache().process_request(RequestFactory().get('/'))
+        self.addCleanup(RequestCache.clear_request_cache)
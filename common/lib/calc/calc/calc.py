@@ -7,6 +7,9 @@ Uses pyparsing to parse. Main function as of now is evaluator().
 import math
 import operator
 import numbers
+import threading
+from collections import OrderedDict
+
 import numpy
 import scipy.constants
 import functions
@@ -72,6 +75,11 @@ SUFFIXES = {
     'c': 1e-2, 'm': 1e-3, 'u': 1e-6, 'n': 1e-9, 'p': 1e-12
 }
 
+# How many compiled expressions to keep, keyed by (math_expr, case_sensitive)
+COMPILED_EXPRESSION_CACHE_SIZE = 1024
+_compiled_expressions = OrderedDict()
+_compiled_expressions_lock = threading.Lock()
+
 
 class UndefinedVariable(Exception):
     """
@@ -155,6 +163,13 @@ def eval_parallel(parse_result):
     """
     if len(parse_result) == 1:
         return parse_result[0]
+    if any(isinstance(e, numpy.ndarray) for e in parse_result):
+        # Evaluating many samples at once (see `vectorized_evaluator`).
+        inputs = [e for e in parse_result if isinstance(e, (numbers.Number, numpy.ndarray))]
+        has_zero = reduce(numpy.logical_or, [e == 0 for e in inputs])
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            result = 1. / sum(1. / e for e in inputs)
+        return numpy.where(has_zero, float('nan'), result)
     if 0 in parse_result:
         return float('nan')
     reciprocals = [1. / e for e in parse_result
@@ -224,38 +239,107 @@ def evaluator(variables, functions, math_expr, case_sensitive=False):
      python numbers.
     -Unary functions are passed as a dictionary from string to function.
     """
+    return compile_expression(math_expr, case_sensitive)(variables, functions)
+
+
+def vectorized_evaluator(var_dict_list, functions, math_expr, case_sensitive=False):
+    """
+    Evaluate an expression for each of the dictionaries of variables in
+    `var_dict_list`, and return the list of results.
+
+    Gives the same results as calling `evaluator` for each dictionary, but
+    when they all define the same (numeric) variables, all the samples are
+    evaluated in one pass over NumPy arrays. Expressions which can't be
+    evaluated that way (e.g. using `fact`), or which give an error or a
+    non-finite value for some sample, are evaluated one sample at a time, so
+    that errors are raised exactly as `evaluator` raises them.
+    """
+    evaluate = compile_expression(math_expr, case_sensitive)
+
+    values = None
+    if len(var_dict_list) > 1:
+        values = _evaluate_arrays(evaluate, var_dict_list, functions)
+    if values is None:
+        values = [evaluate(var_dict, functions) for var_dict in var_dict_list]
+    return values
+
+
+def _evaluate_arrays(evaluate, var_dict_list, functions):
+    """
+    Evaluate the compiled expression with arrays of the variables' values.
+
+    Return None if the samples can't be evaluated together.
+    """
+    names = set(var_dict_list[0])
+    if any(set(var_dict) != names for var_dict in var_dict_list):
+        return None
+
+    variables = {}
+    for name in names:
+        variables[name] = numpy.array([var_dict[name] for var_dict in var_dict_list])
+        if variables[name].dtype.kind not in 'biufc':  # only numbers
+            return None
+
+    try:
+        with numpy.errstate(all='ignore'):
+            values = numpy.asarray(evaluate(variables, functions))
+    except Exception:  # pylint: disable=broad-except
+        return None
+
+    if values.ndim == 0:
+        # The expression doesn't depend on the variables.
+        values = numpy.repeat(values, len(var_dict_list))
+    if values.shape != (len(var_dict_list),) or values.dtype.kind not in 'biufc':
+        return None
+    if not numpy.all(numpy.isfinite(values)):
+        return None
+    return values.tolist()
+
+
+def compile_expression(math_expr, case_sensitive=False):
+    """
+    Parse an expression once, and return a function evaluating it.
+
+    The returned function takes the same `variables` and `functions` as
+    `evaluator`, so evaluating an expression for many sets of variables only
+    parses it once. Compiled expressions are cached, so this is cheap to call
+    repeatedly with the same expression.
+
+    Raises a ParseException if the expression can't be parsed.
+    """
     # No need to go further.
     if math_expr.strip() == "":
-        return float('nan')
+        return lambda variables, functions: float('nan')
 
-    # Parse the tree.
+    key = (math_expr, case_sensitive)
+    with _compiled_expressions_lock:
+        evaluate = _compiled_expressions.pop(key, None)
+        if evaluate is not None:
+            _compiled_expressions[key] = evaluate
+            return evaluate
+
+    # Parse the tree (outside of the lock, this is the slow part).
     math_interpreter = ParseAugmenter(math_expr, case_sensitive)
     math_interpreter.parse_algebra()
+    evaluate_tree = math_interpreter.compile_tree()
 
-    # Get our variables together.
-    all_variables, all_functions = add_defaults(variables, functions, case_sensitive)
-
-    # ...and check them
-    math_interpreter.check_variables(all_variables, all_functions)
+    def evaluate(variables, functions):
+        """
+        Evaluate the compiled expression.
+        """
+        # Get our variables together.
+        all_variables, all_functions = add_defaults(variables, functions, case_sensitive)
 
-    # Create a recursion to evaluate the tree.
-    if case_sensitive:
-        casify = lambda x: x
-    else:
-        casify = lambda x: x.lower()  # Lowercase for case insens.
+        # ...and check them
+        math_interpreter.check_variables(all_variables, all_functions)
 
-    evaluate_actions = {
-        'number': eval_number,
-        'variable': lambda x: all_variables[casify(x[0])],
-        'function': lambda x: all_functions[casify(x[0])](x[1]),
-        'atom': eval_atom,
-        'power': eval_power,
-        'parallel': eval_parallel,
-        'product': eval_product,
-        'sum': eval_sum
-    }
+        return evaluate_tree(all_variables, all_functions)
 
-    return math_interpreter.reduce_tree(evaluate_actions)
+    with _compiled_expressions_lock:
+        _compiled_expressions[key] = evaluate
+        while len(_compiled_expressions) > COMPILED_EXPRESSION_CACHE_SIZE:
+            _compiled_expressions.popitem(last=False)
+    return evaluate
 
 
 class ParseAugmenter(object):
@@ -397,6 +481,105 @@ class ParseAugmenter(object):
         # Find the value of the entire tree.
         return handle_node(self.tree)
 
+    def compile_tree(self):
+        """
+        Turn `self.tree` into a function evaluating it.
+
+        The function takes dictionaries of all the variables and functions
+        (as given by `add_defaults`) and returns the value of the expression.
+        It gives the same results as reducing the tree with the `eval_*`
+        actions, but the constant parts (numbers, operators and names) are
+        only worked out once.
+        """
+        if self.case_sensitive:
+            casify = lambda x: x
+        else:
+            casify = lambda x: x.lower()  # Lowercase for case insens.
+
+        def compile_node(node):
+            """
+            Return a function of (variables, functions) giving the value of the node.
+            """
+            node_name = node.getName()
+
+            if node_name in ('sum', 'product'):
+                if node_name == 'sum':
+                    total, current_op = 0.0, operator.add
+                    operators = {'+': operator.add, '-': operator.sub}
+                else:
+                    total, current_op = 1.0, operator.mul
+                    operators = {'*': operator.mul, '/': operator.truediv}
+
+                # Pair each operand with the operator preceding it, as in
+                # `eval_sum` and `eval_product`.
+                terms = []
+                for token in node:
+                    if isinstance(token, ParseResults):
+                        terms.append((current_op, compile_node(token)))
+                    else:
+                        current_op = operators[token]
+
+                def combine(variables, functions, initial=total):
+                    """
+                    Add (or multiply) the terms together.
+                    """
+                    result = initial
+                    for term_op, term in terms:
+                        result = term_op(result, term(variables, functions))
+                    return result
+                return combine
+
+            # Other than in sums and products, operators and parenthesis can be
+            # ignored.
+            kids = [compile_node(k) for k in node if isinstance(k, ParseResults)]
+
+            if node_name == 'number':
+                value = eval_number(node)
+                return lambda variables, functions: value
+
+            elif node_name == 'variable':
+                varname = casify(node[0])
+                return lambda variables, functions: variables[varname]
+
+            elif node_name == 'function':
+                funcname = casify(node[0])
+                argument = kids[0]
+                return lambda variables, functions: functions[funcname](argument(variables, functions))
+
+            elif node_name == 'atom':
+                return kids[0]
+
+            elif node_name == 'power':
+                if len(kids) == 1:
+                    return kids[0]
+
+                def power(variables, functions):
+                    """
+                    Exponentiate right to left, like `eval_power`.
+
+                    The operands may be arrays of samples (see
+                    `vectorized_evaluator`), which `eval_power` would skip.
+                    """
+                    operands = reversed([kid(variables, functions) for kid in kids])
+                    return reduce(lambda a, b: b ** a, operands)
+                return power
+
+            elif node_name == 'parallel':
+                if len(kids) == 1:
+                    return kids[0]
+
+                def parallel(variables, functions):
+                    """
+                    Combine like `eval_parallel`.
+                    """
+                    return eval_parallel([kid(variables, functions) for kid in kids])
+                return parallel
+
+            else:  # pragma: no cover
+                raise Exception(u"Unknown branch name '{}'".format(node_name))
+
+        return compile_node(self.tree)
+
     def check_variables(self, valid_variables, valid_functions):
         """
         Confirm that all the variables used in the tree are valid/defined.
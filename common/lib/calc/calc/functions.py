@@ -49,6 +49,10 @@ def arccot(val):
     """
     Inverse cotangent
     """
+    if numpy.ndim(val) > 0:
+        return numpy.where(
+            numpy.real(val) < 0, -numpy.pi / 2 - numpy.arctan(val), numpy.pi / 2 - numpy.arctan(val)
+        )
     if numpy.real(val) < 0:
         return -numpy.pi / 2 - numpy.arctan(val)
     else:
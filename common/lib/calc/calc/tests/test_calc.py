@@ -559,3 +559,118 @@ class EvaluatorTest(unittest.TestCase):
             calc.evaluator({'r1': 5}, {}, "r1+r2")
         with self.assertRaisesRegexp(calc.UndefinedVariable, 'r1 r3'):
             calc.evaluator(variables, {}, "r1*r3", case_sensitive=True)
+
+
+class CompileExpressionTest(unittest.TestCase):
+    """
+    Test calc.compile_expression and its cache
+    """
+
+    def setUp(self):
+        super(CompileExpressionTest, self).setUp()
+        calc.calc._compiled_expressions.clear()  # pylint: disable=protected-access
+
+    def test_evaluate_many_times(self):
+        """
+        A compiled expression can be evaluated for different variables
+        """
+        evaluate = calc.compile_expression('2*x^2 - x/4 + sin(0)')
+        for value in (0.0, 1.0, -3.5, 2j):
+            self.assertEqual(evaluate({'x': value}, {}), 2 * value ** 2 - value / 4)
+
+    def test_same_as_reduce_tree(self):
+        """
+        The compiled tree should give the same results as reducing it
+        """
+        variables, functions = calc.add_defaults({'x': 2.5, 'R': 3.0}, {}, False)
+        actions = {
+            'number': calc.eval_number,
+            'variable': lambda x: variables[x[0].lower()],
+            'function': lambda x: functions[x[0].lower()](x[1]),
+            'atom': calc.eval_atom,
+            'power': calc.eval_power,
+            'parallel': calc.eval_parallel,
+            'product': calc.eval_product,
+            'sum': calc.eval_sum,
+        }
+        for math_expr in ('-x', '+3 - 4 + x', '2^3^2', 'x*2/5*R', 'R||x||2', '(x+1)*(x-1)', 'sqrt(x^2)', '1.5k*3%'):
+            math_interpreter = calc.ParseAugmenter(math_expr)
+            math_interpreter.parse_algebra()
+            self.assertEqual(
+                math_interpreter.compile_tree()(variables, functions),
+                math_interpreter.reduce_tree(actions),
+                msg=math_expr
+            )
+
+    def test_cache(self):
+        """
+        Compiled expressions are reused, up to the size of the cache
+        """
+        evaluate = calc.compile_expression('x+1')
+        self.assertIs(calc.compile_expression('x+1'), evaluate)
+        self.assertIsNot(calc.compile_expression('x+1', case_sensitive=True), evaluate)
+
+        cache_size = calc.calc.COMPILED_EXPRESSION_CACHE_SIZE
+        calc.calc.COMPILED_EXPRESSION_CACHE_SIZE = 2
+        try:
+            calc.compile_expression('x+2')
+            calc.compile_expression('x+3')
+            self.assertEqual(len(calc.calc._compiled_expressions), 2)  # pylint: disable=protected-access
+            self.assertIsNot(calc.compile_expression('x+1'), evaluate)
+        finally:
+            calc.calc.COMPILED_EXPRESSION_CACHE_SIZE = cache_size
+
+    def test_undefined_vars_checked_on_each_evaluation(self):
+        """
+        Check that variables are validated for each evaluation, not only once
+        """
+        evaluate = calc.compile_expression('x+y')
+        self.assertEqual(evaluate({'x': 1, 'y': 2}, {}), 3)
+        with self.assertRaisesRegexp(calc.UndefinedVariable, 'y'):
+            evaluate({'x': 1}, {})
+
+
+class VectorizedEvaluatorTest(unittest.TestCase):
+    """
+    Test calc.vectorized_evaluator against calc.evaluator
+    """
+
+    def assert_same_as_evaluator(self, math_expr, var_dict_list, case_sensitive=False):
+        """
+        Check that evaluating all the samples at once gives the results of `evaluator`
+        """
+        results = calc.vectorized_evaluator(var_dict_list, {}, math_expr, case_sensitive=case_sensitive)
+        self.assertEqual(len(results), len(var_dict_list))
+        for var_dict, result in zip(var_dict_list, results):
+            expected = calc.evaluator(var_dict, {}, math_expr, case_sensitive=case_sensitive)
+            if numpy.isnan(expected):
+                self.assertTrue(numpy.isnan(result), msg=math_expr)
+            else:
+                self.assertAlmostEqual(result, expected, delta=1e-9 * max(1, abs(expected)), msg=math_expr)
+
+    def test_expressions(self):
+        samples = [{'x': x, 'y': y} for x, y in ((0.5, 2.0), (1.5, -3.0), (2.25, 7.0), (3.0, 0.125))]
+        for math_expr in ('x+y', '-x*y/4', 'x^2^0.5', 'sin(x)*cos(y)', 'sqrt(x)+j*y', 'x||y', 'arccot(y)',
+                          'exp(x) - ln(x)', '3', 'abs(y)*pi'):
+            self.assert_same_as_evaluator(math_expr, samples)
+
+    def test_fall_back_to_samples(self):
+        """
+        Expressions which can't be evaluated as arrays still give the right results
+        """
+        samples = [{'x': x} for x in (0.0, 1.0, 2.0)]
+        self.assert_same_as_evaluator('x||1', samples)
+        self.assert_same_as_evaluator('fact(x)', samples)
+        self.assert_same_as_evaluator('x', [{'x': 1.0}, {'x': 2.0, 'y': 3.0}])
+
+    def test_errors(self):
+        """
+        Errors are raised as `evaluator` raises them
+        """
+        samples = [{'x': x} for x in (-1.0, 0.0, 1.0)]
+        with self.assertRaises(ZeroDivisionError):
+            calc.vectorized_evaluator(samples, {}, '1/x')
+        with self.assertRaises(ValueError):
+            calc.vectorized_evaluator(samples, {}, 'fact(x-0.5)')
+        with self.assertRaisesRegexp(calc.UndefinedVariable, 'y'):
+            calc.vectorized_evaluator(samples, {}, 'x+y')
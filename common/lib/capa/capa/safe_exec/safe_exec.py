@@ -6,7 +6,11 @@ from codejail.safe_exec import json_safe, SafeExecException
 from . import lazymod
 from dogapi import dog_stats_api
 
+from collections import OrderedDict
+import copy
 import hashlib
+import threading
+import time
 
 # Establish the Python environment for Capa.
 # Capa assumes float-friendly division always.
@@ -70,7 +74,60 @@ def update_hash(hasher, obj):
         hasher.update(repr(obj))
 
 
-@dog_stats_api.timed('capa.safe_exec.time')
+class LocalCache(object):
+    """
+    An in-process LRU cache of safe_exec results, in front of a shared cache.
+
+    Has the .get(key) and .set(key, value) methods safe_exec expects of its `cache`.
+    Results found in the shared cache are kept locally too, so that the problems
+    a process keeps on grading don't cost a round-trip to the shared cache.
+    """
+    def __init__(self, shared_cache=None, size=1000):
+        """
+        Arguments:
+            shared_cache: an object with .get(key) and .set(key, value) methods, or None.
+            size (int): the maximum number of results to keep in process.
+        """
+        self.shared_cache = shared_cache
+        self.size = size
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._results.pop(key, None)
+            if value is not None:
+                self._results[key] = value
+        if value is not None:
+            dog_stats_api.increment('capa.safe_exec.cache', tags=['tier:local'])
+            # callers may modify the globals they get back
+            return copy.deepcopy(value)
+
+        if self.shared_cache is not None:
+            value = self.shared_cache.get(key)
+        if value is not None:
+            dog_stats_api.increment('capa.safe_exec.cache', tags=['tier:shared'])
+            self._set_local(key, copy.deepcopy(value))
+        else:
+            dog_stats_api.increment('capa.safe_exec.cache', tags=['tier:miss'])
+        return value
+
+    def set(self, key, value):
+        self._set_local(key, copy.deepcopy(value))
+        if self.shared_cache is not None:
+            self.shared_cache.set(key, value)
+
+    def _set_local(self, key, value):
+        """
+        Keep `value` in process, evicting the least recently used results if needed.
+        """
+        with self._lock:
+            self._results.pop(key, None)
+            self._results[key] = value
+            while len(self._results) > self.size:
+                self._results.popitem(last=False)
+
+
 def safe_exec(
     code,
     globals_dict,
@@ -106,6 +163,31 @@ def safe_exec(
 
     If `unsafely` is true, then the code will actually be executed without sandboxing.
 
+    The time taken is reported to datadog, tagged with the slug and whether the result
+    came from the cache.
+
+    """
+    start_time = time.time()
+    cached = False
+    try:
+        cached = _safe_exec(
+            code, globals_dict, random_seed=random_seed, python_path=python_path, extra_files=extra_files,
+            cache=cache, slug=slug, unsafely=unsafely,
+        )
+    except SafeExecException as exc:
+        cached = getattr(exc, 'cached', False)
+        raise
+    finally:
+        dog_stats_api.histogram(
+            'capa.safe_exec.time',
+            time.time() - start_time,
+            tags=[u'slug:{}'.format(slug), u'cached:{}'.format(cached)],
+        )
+
+
+def _safe_exec(code, globals_dict, random_seed, python_path, extra_files, cache, slug, unsafely):
+    """
+    Implementation of `safe_exec`. Returns whether the result came from the cache.
     """
     # Check the cache for a previous result.
     if cache:
@@ -121,8 +203,10 @@ def safe_exec(
             emsg, cleaned_results = cached
             globals_dict.update(cleaned_results)
             if emsg:
-                raise SafeExecException(emsg)
-            return
+                exception = SafeExecException(emsg)
+                exception.cached = True
+                raise exception
+            return True
 
     # Create the complete code we'll run.
     code_prolog = CODE_PROLOG % random_seed
@@ -153,3 +237,4 @@ def safe_exec(
     # If an exception happened, raise it now.
     if emsg:
         raise e
+    return False
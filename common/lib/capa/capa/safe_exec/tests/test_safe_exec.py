@@ -9,7 +9,7 @@ import unittest
 
 from nose.plugins.skip import SkipTest
 
-from capa.safe_exec import safe_exec, update_hash
+from capa.safe_exec import safe_exec, update_hash, LocalCache
 from codejail.safe_exec import SafeExecException
 from codejail.jail_code import is_configured
 
@@ -177,6 +177,48 @@ class TestSafeExecCaching(unittest.TestCase):
                 self.fail("Tried executing code with non-ASCII unicode: {0}".format(code))
 
 
+class TestLocalCache(unittest.TestCase):
+    """Test the in-process cache of safe_exec results."""
+
+    def test_local_then_shared(self):
+        shared = {}
+        cache = LocalCache(DictCache(shared), size=10)
+
+        g = {}
+        safe_exec("a = [int(math.pi)]", g, cache=cache)
+        self.assertEqual(g['a'], [3])
+        self.assertEqual(shared.values()[0], (None, {'a': [3]}))
+
+        # The local copy is used before the shared one, and isn't affected by
+        # changes to the globals it was copied to.
+        shared[shared.keys()[0]] = (None, {'a': [17]})
+        g['a'].append(4)
+        g = {}
+        safe_exec("a = [int(math.pi)]", g, cache=cache)
+        self.assertEqual(g['a'], [3])
+
+        # Another process only has the shared result.
+        g = {}
+        safe_exec("a = [int(math.pi)]", g, cache=LocalCache(DictCache(shared), size=10))
+        self.assertEqual(g['a'], [17])
+
+    def test_size(self):
+        shared = {}
+        cache = LocalCache(DictCache(shared), size=2)
+        for key in ('a', 'b', 'c'):
+            cache.set(key, key.upper())
+        shared['a'] = 'shared A'
+        shared['c'] = 'shared C'
+        self.assertEqual(cache.get('c'), 'C')
+        self.assertEqual(cache.get('a'), 'shared A')
+
+    def test_no_shared_cache(self):
+        cache = LocalCache(size=2)
+        self.assertIsNone(cache.get('a'))
+        cache.set('a', 'A')
+        self.assertEqual(cache.get('a'), 'A')
+
+
 class TestUpdateHash(unittest.TestCase):
     """Test the safe_exec.update_hash function to be sure it canonicalizes properly."""
 
@@ -410,6 +410,22 @@ class FormulaResponseTest(ResponseTest):
         input_formula = "x + y"
         self.assert_grade(problem, input_formula, "incorrect")
 
+    def test_grade_power(self):
+        """
+        Test that FormulaResponse grades formulae raising variables to a power
+        """
+        sample_dict = {'x': (1, 3)}
+
+        problem = self.build_problem(sample_dict=sample_dict,
+                                     num_samples=10,
+                                     tolerance=0.01,
+                                     answer="x^2")
+
+        self.assert_grade(problem, "x*x", "correct")
+        self.assert_grade(problem, "(x^4)^0.5", "correct")
+        self.assert_grade(problem, "2^x", "incorrect")
+        self.assert_grade(problem, "x^3", "incorrect")
+
     def test_hint(self):
         """
         Test the hint-giving functionality of FormulaResponse
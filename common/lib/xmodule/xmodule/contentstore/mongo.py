@@ -1,3 +1,4 @@
+import hashlib
 import pymongo
 import gridfs
 from gridfs.errors import NoFile
@@ -76,12 +77,18 @@ class MongoContentStore(ContentStore):
                               import_path=content.import_path,
                               # getattr b/c caching may mean some pickled instances don't have attr
                               locked=getattr(content, 'locked', False)) as fp:
+            # compute the digest as we go, so that it can be used as the asset's ETag
+            content_digest = hashlib.md5()
             if hasattr(content.data, '__iter__'):
                 for chunk in content.data:
                     fp.write(chunk)
+                    content_digest.update(chunk)
             else:
                 fp.write(content.data)
+                content_digest.update(content.data)
+            fp.content_digest = content_digest.hexdigest()
 
+        content.content_digest = fp.content_digest
         return content
 
     def delete(self, location_or_id):
@@ -106,7 +113,8 @@ class MongoContentStore(ContentStore):
                     location, fp.displayname, fp.content_type, fp, last_modified_at=fp.uploadDate,
                     thumbnail_location=thumbnail_location,
                     import_path=getattr(fp, 'import_path', None),
-                    length=fp.length, locked=getattr(fp, 'locked', False)
+                    length=fp.length, locked=getattr(fp, 'locked', False),
+                    content_digest=self._content_digest(fp)
                 )
             else:
                 with self.fs.get(content_id) as fp:
@@ -120,7 +128,8 @@ class MongoContentStore(ContentStore):
                         location, fp.displayname, fp.content_type, fp.read(), last_modified_at=fp.uploadDate,
                         thumbnail_location=thumbnail_location,
                         import_path=getattr(fp, 'import_path', None),
-                        length=fp.length, locked=getattr(fp, 'locked', False)
+                        length=fp.length, locked=getattr(fp, 'locked', False),
+                        content_digest=self._content_digest(fp)
                     )
         except NoFile:
             if throw_on_not_found:
@@ -128,6 +137,14 @@ class MongoContentStore(ContentStore):
             else:
                 return None
 
+    @staticmethod
+    def _content_digest(fp):
+        """
+        The digest of the file's data. Assets saved before it was computed at upload
+        fall back to the md5 GridFS computed.
+        """
+        return getattr(fp, 'content_digest', None) or getattr(fp, 'md5', None)
+
     def export(self, location, output_directory):
         content = self.find(location)
 
@@ -153,6 +170,24 @@ class MongoContentStore(ContentStore):
             assets_policy_file: the filename for the policy file which should be in the same
                 directory as the other policy files.
         """
+        if not os.path.exists(output_directory):
+            os.makedirs(output_directory)
+        policy = self.export_all_for_course_to_fs(course_key, OSFS(output_directory))
+
+        with open(assets_policy_file, 'w') as f:
+            json.dump(policy, f, sort_keys=True, indent=4)
+
+    def export_all_for_course_to_fs(self, course_key, output_fs):
+        """
+        Export all of this course's assets to the filesystem output_fs, streaming their data from GridFS.
+
+        Args:
+            course_key (CourseKey): the :class:`CourseKey` identifying the course
+            output_fs: the (pyfilesystem) filesystem under which to put all the asset files
+
+        Returns:
+            the assets' attributes, for the assets policy file
+        """
         policy = {}
         assets, __ = self.get_all_content_for_course(course_key)
 
@@ -165,13 +200,21 @@ class MongoContentStore(ContentStore):
             #
             # When debugging course exports, this might be a good place
             # to look. -- pmitros
-            self.export(asset['asset_key'], output_directory)
+            content = self.find(asset['asset_key'], as_stream=True)
+            try:
+                asset_dir = output_fs
+                if content.import_path is not None and os.path.dirname(content.import_path):
+                    asset_dir = output_fs.makeopendir(os.path.dirname(content.import_path), recursive=True)
+                with asset_dir.open(content.name, 'wb') as asset_file:
+                    for chunk in content.stream_data():
+                        asset_file.write(chunk)
+            finally:
+                content.close()
             for attr, value in asset.iteritems():
-                if attr not in ['_id', 'md5', 'uploadDate', 'length', 'chunkSize', 'asset_key']:
+                if attr not in ['_id', 'md5', 'content_digest', 'uploadDate', 'length', 'chunkSize', 'asset_key']:
                     policy.setdefault(asset['asset_key'].name, {})[attr] = value
 
-        with open(assets_policy_file, 'w') as f:
-            json.dump(policy, f, sort_keys=True, indent=4)
+        return policy
 
     def get_all_content_thumbnails_for_course(self, course_key):
         return self._get_all_content_for_course(course_key, get_thumbnails=True)[0]
@@ -275,7 +318,7 @@ class MongoContentStore(ContentStore):
         :param location:  a c4x asset location
         """
         for attr in attr_dict.iterkeys():
-            if attr in ['_id', 'md5', 'uploadDate', 'length']:
+            if attr in ['_id', 'md5', 'content_digest', 'uploadDate', 'length']:
                 raise AttributeError("{} is a protected attribute.".format(attr))
         asset_db_key, __ = self.asset_db_key(location)
         # catch upsert error and raise NotFoundError if asset doesn't exist
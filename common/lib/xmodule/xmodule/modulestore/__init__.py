@@ -20,7 +20,7 @@ from abc import ABCMeta, abstractmethod
 from contracts import contract, new_contract
 from xblock.plugin import default_select
 
-from .exceptions import InvalidLocationError, InsufficientSpecificationError
+from .exceptions import InvalidLocationError, InsufficientSpecificationError, ItemNotFoundError
 from xmodule.errortracker import make_error_tracker
 from xmodule.assetstore import AssetMetadata
 from opaque_keys.edx.keys import CourseKey, UsageKey, AssetKey
@@ -315,6 +315,12 @@ class EditInfo(object):
     """
     Encapsulates the editing info of a block.
     """
+    # There's one of these per block of every loaded structure, so don't give them a __dict__.
+    __slots__ = (
+        'previous_version', 'update_version', 'source_version', 'edited_on', 'edited_by',
+        'original_usage', 'original_usage_version', '_subtree_edited_on', '_subtree_edited_by',
+    )
+
     def __init__(self, **kwargs):
         self.from_storable(kwargs)
 
@@ -384,6 +390,9 @@ class BlockData(object):
     Allows the storing of meta-information about a structure that doesn't persist along with
     the structure itself.
     """
+    # There's one of these per block of every loaded structure, so don't give them a __dict__.
+    __slots__ = ('fields', 'block_type', 'definition', '_defaults', 'edit_info', 'definition_loaded')
+
     def __init__(self, **kwargs):
         # Has the definition been loaded?
         self.definition_loaded = False
@@ -397,7 +406,7 @@ class BlockData(object):
             'fields': self.fields,
             'block_type': self.block_type,
             'definition': self.definition,
-            'defaults': self.defaults,
+            'defaults': self._defaults if self._defaults is not None else {},
             'edit_info': self.edit_info.to_storable()
         }
 
@@ -416,12 +425,36 @@ class BlockData(object):
         self.definition = block_data.get('definition', None)
 
         # Scope.settings default values copied from a template block (used e.g. when
-        # blocks are copied from a library to a course)
-        self.defaults = block_data.get('defaults', {})
+        # blocks are copied from a library to a course). Most blocks don't have any,
+        # so the dict is only created when it's first asked for.
+        self._defaults = block_data.get('defaults') or None
 
         # EditInfo object containing all versioning/editing data.
         self.edit_info = EditInfo(**block_data.get('edit_info', {}))
 
+    @property
+    def defaults(self):
+        """
+        The Scope.settings default values for this block.
+        """
+        if self._defaults is None:
+            self._defaults = {}
+        return self._defaults
+
+    @defaults.setter
+    def defaults(self, value):
+        """
+        Replace the Scope.settings default values for this block.
+        """
+        self._defaults = value
+
+    @property
+    def has_defaults(self):
+        """
+        Whether this block has any Scope.settings default values (without creating the dict).
+        """
+        return bool(self._defaults)
+
     def __repr__(self):
         # pylint: disable=bad-continuation, redundant-keyword-arg
         return ("{classname}(fields={self.fields}, "
@@ -800,7 +833,7 @@ class ModuleStoreRead(ModuleStoreAssetBase):
             xblock, fields = (block, block.fields)
         elif isinstance(block, BlockData):
             # BlockData is an object - compare its attributes in dict form.
-            xblock, fields = (None, block.__dict__)
+            xblock, fields = (None, {key: getattr(block, key) for key in qualifiers if hasattr(block, key)})
         else:
             xblock, fields = (None, block)
 
@@ -881,6 +914,15 @@ class ModuleStoreRead(ModuleStoreAssetBase):
         '''
         pass
 
+    @abstractmethod
+    def get_courses_by_keys(self, course_keys, depth=0, **kwargs):
+        '''
+        Look for several courses by their ids (:class:`CourseKey`).
+        Returns a dict mapping each found course's id (as given) to its course descriptor;
+        courses which aren't found are left out.
+        '''
+        pass
+
     @abstractmethod
     def has_course(self, course_id, ignore_case=False, **kwargs):
         '''
@@ -1148,6 +1190,22 @@ class ModuleStoreReadBase(BulkOperationsMixin, ModuleStoreRead):
                 return course
         return None
 
+    def get_courses_by_keys(self, course_keys, depth=0, **kwargs):
+        """
+        See ModuleStoreRead.get_courses_by_keys
+
+        Default impl--get_course for each key
+        """
+        courses = {}
+        for course_key in course_keys:
+            try:
+                course = self.get_course(course_key, depth=depth, **kwargs)
+            except ItemNotFoundError:
+                continue
+            if course is not None:
+                courses[course_key] = course
+        return courses
+
     def has_course(self, course_id, ignore_case=False, **kwargs):
         """
         Returns the course_id of the course if it was found, else None
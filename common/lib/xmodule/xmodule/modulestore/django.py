@@ -25,6 +25,8 @@ from pymongo import ReadPreference
 from xmodule.contentstore.django import contentstore
 from xmodule.modulestore.draft_and_published import BranchSettingMixin
 from xmodule.modulestore.mixed import MixedModuleStore
+from xmodule.modulestore.split_mongo.mongo_connection import CourseStructureCache
+from xmodule.modulestore.split_mongo.split import SplitMongoModuleStore
 from xmodule.util.django import get_current_request_hostname
 import xblock.reference.plugins
 
@@ -153,6 +155,9 @@ def create_modulestore_instance(
     if issubclass(class_, BranchSettingMixin):
         _options['branch_setting_func'] = _get_modulestore_branch_setting
 
+    if issubclass(class_, SplitMongoModuleStore):
+        _options['structure_cache'] = _get_course_structure_cache()
+
     if HAS_USER_SERVICE and not user_service:
         xb_user_service = DjangoXBlockUserService(get_current_user())
     else:
@@ -176,6 +181,28 @@ def create_modulestore_instance(
     )
 
 
+# A singleton instance of the CourseStructureCache, shared by all split modulestores in this process
+_COURSE_STRUCTURE_CACHE = None
+
+
+def _get_course_structure_cache():
+    """
+    Returns the CourseStructureCache backed by the 'course_structure_cache' django cache,
+    or None if neither that cache nor a local structure cache is configured.
+    """
+    global _COURSE_STRUCTURE_CACHE  # pylint: disable=global-statement
+    if _COURSE_STRUCTURE_CACHE is None:
+        try:
+            cache = get_cache('course_structure_cache')
+        except InvalidCacheBackendError:
+            cache = None
+        local_size = getattr(settings, 'COURSE_STRUCTURE_LOCAL_CACHE_SIZE', 0)
+        if cache is None and not local_size:
+            return None
+        _COURSE_STRUCTURE_CACHE = CourseStructureCache(cache, local_size)
+    return _COURSE_STRUCTURE_CACHE
+
+
 # A singleton instance of the Mixed Modulestore
 _MIXED_MODULESTORE = None
 
@@ -9,6 +9,7 @@ import logging
 from contextlib import contextmanager
 import itertools
 import functools
+from collections import defaultdict
 from contracts import contract, new_contract
 
 from opaque_keys import InvalidKeyError
@@ -328,6 +329,25 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         except ItemNotFoundError:
             return None
 
+    @strip_key
+    def get_courses_by_keys(self, course_keys, depth=0, **kwargs):
+        """
+        Returns a dict mapping each of the given course keys to its course module, leaving
+        out any course which doesn't exist. Each underlying store gets all of its courses
+        in one call, so that it can fetch them in bulk.
+
+        :param course_keys: an iterable of CourseKeys
+        """
+        keys_by_store = defaultdict(list)
+        for course_key in course_keys:
+            assert isinstance(course_key, CourseKey)
+            keys_by_store[self._get_modulestore_for_courselike(course_key)].append(course_key)
+
+        courses = {}
+        for store, store_course_keys in keys_by_store.iteritems():
+            courses.update(store.get_courses_by_keys(store_course_keys, depth=depth, **kwargs))
+        return courses
+
     @strip_key
     @contract(library_key='LibraryLocator')
     def get_library(self, library_key, depth=0, **kwargs):
@@ -3,7 +3,8 @@ Performance test for asset metadata in the modulestore.
 """
 from path import path
 import unittest
-from tempfile import mkdtemp
+from tempfile import mkdtemp, TemporaryFile
+import tarfile
 import itertools
 from shutil import rmtree
 from bson.code import Code
@@ -15,7 +16,7 @@ from nose.plugins.skip import SkipTest
 from xmodule.assetstore import AssetMetadata
 from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.xml_importer import import_course_from_xml
-from xmodule.modulestore.xml_exporter import export_course_to_xml
+from xmodule.modulestore.xml_exporter import export_course_to_xml, export_course_to_tar
 from xmodule.modulestore.tests.test_cross_modulestore_import_export import (
     MODULESTORE_SETUPS,
     SHORT_NAME_MAP,
@@ -143,6 +144,78 @@ class CrossStoreXMLRoundtrip(unittest.TestCase):
                         )
 
 
+@ddt.ddt
+# Eventually, exclude this attribute from regular unittests while running *only* tests
+# with this attribute during regular performance tests.
+# @attr("perf_test")
+@unittest.skip
+class CourseExportTarball(unittest.TestCase):
+    """
+    This class exists to time exporting a course to a tarball through an export directory,
+    against exporting it straight to the tarball.
+    """
+
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    def setUp(self):
+        super(CourseExportTarball, self).setUp()
+        self.export_dir = mkdtemp()
+        self.addCleanup(rmtree, self.export_dir, ignore_errors=True)
+
+    @ddt.data(*itertools.product(
+        MODULESTORE_SETUPS,
+        ASSET_AMOUNT_PER_TEST
+    ))
+    @ddt.unpack
+    def test_generate_export_timings(self, source_ms, num_assets):
+        """
+        Generate timings for both ways of exporting a course to a tarball.
+        """
+        if CodeBlockTimer is None:
+            raise SkipTest("CodeBlockTimer undefined.")
+
+        desc = "CourseExportTarball:{}:{}".format(
+            SHORT_NAME_MAP[source_ms],
+            num_assets
+        )
+
+        with CodeBlockTimer(desc):
+
+            make_asset_xml(num_assets, ASSET_XML_PATH)
+            validate_xml(ASSET_XSD_PATH, ASSET_XML_PATH)
+
+            with source_ms.build() as (source_content, source_store):
+                source_course_key = source_store.make_course_key('a', 'course', 'course')
+
+                import_course_from_xml(
+                    source_store,
+                    'test_user',
+                    TEST_DATA_ROOT,
+                    source_dirs=TEST_COURSE,
+                    static_content_store=source_content,
+                    target_id=source_course_key,
+                    create_if_not_present=True,
+                    raise_on_failure=True,
+                )
+
+                with CodeBlockTimer("export_to_directory_then_tar"):
+                    export_course_to_xml(
+                        source_store,
+                        source_content,
+                        source_course_key,
+                        self.export_dir,
+                        'exported_source_course',
+                    )
+                    with TemporaryFile() as tarball:
+                        with tarfile.open(fileobj=tarball, mode='w:gz') as tar_file:
+                            tar_file.add(path(self.export_dir) / 'exported_source_course', arcname='course')
+
+                with CodeBlockTimer("export_to_tar"):
+                    with TemporaryFile() as tarball:
+                        export_course_to_tar(source_store, source_content, source_course_key, tarball, 'course')
+
+
 @ddt.ddt
 # Eventually, exclude this attribute from regular unittests while running *only* tests
 # with this attribute during regular performance tests.
@@ -0,0 +1,103 @@
+"""
+Performance test for the memory used by split modulestore structures.
+"""
+import datetime
+import gc
+import os
+import unittest
+
+import ddt
+#from nose.plugins.attrib import attr
+from nose.plugins.skip import SkipTest
+
+from xmodule.modulestore.split_mongo.mongo_connection import structure_from_mongo
+
+# The dependency below is only installed with the paver requirements, which don't
+# get installed during unit tests!
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Number of problems in each chapter of the generated structures.
+PROBLEMS_PER_CHAPTER = 200
+
+# Number of chapters in the generated structures.
+CHAPTER_AMOUNT_PER_TEST = (5, 50, 100)
+
+
+def make_structure_doc(num_chapters, num_problems):
+    """
+    Generate a mongo structure document for a course with num_chapters chapters
+    each containing num_problems problems.
+    """
+    blocks = [{
+        'block_type': u'course',
+        'block_id': u'course',
+        'definition': None,
+        'fields': {'children': [[u'chapter', u'chapter{}'.format(i)] for i in range(num_chapters)]},
+        'edit_info': {'edited_by': 1, 'edited_on': datetime.datetime.now()},
+    }]
+    for i in range(num_chapters):
+        blocks.append({
+            'block_type': u'chapter',
+            'block_id': u'chapter{}'.format(i),
+            'definition': None,
+            'fields': {'children': [[u'problem', u'problem{}_{}'.format(i, j)] for j in range(num_problems)]},
+            'edit_info': {'edited_by': 1, 'edited_on': datetime.datetime.now()},
+        })
+        blocks.extend({
+            'block_type': u'problem',
+            'block_id': u'problem{}_{}'.format(i, j),
+            'definition': None,
+            'fields': {'weight': 1},
+            'edit_info': {'edited_by': 1, 'edited_on': datetime.datetime.now()},
+        } for j in range(num_problems))
+    return {'_id': 'version', 'root': [u'course', u'course'], 'blocks': blocks}
+
+
+def resident_memory():
+    """
+    Returns the resident memory of this process, in bytes.
+    """
+    gc.collect()
+    return psutil.Process(os.getpid()).get_memory_info().rss
+
+
+@ddt.ddt
+# Eventually, exclude this attribute from regular unittests while running *only* tests
+# with this attribute during regular performance tests.
+# @attr("perf_test")
+@unittest.skip
+class TestSplitStructureMemory(unittest.TestCase):
+    """
+    This class exists to measure the memory used by the in-memory representation of
+    split modulestore structures of different sizes.
+    """
+
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    test_run_time = datetime.datetime.now()
+
+    @ddt.data(*CHAPTER_AMOUNT_PER_TEST)
+    def test_structure_memory(self, num_chapters):
+        """
+        Measure the resident memory added by converting a structure document to its
+        in-memory representation.
+        """
+        if psutil is None:
+            raise SkipTest("psutil not installed.")
+
+        structure_doc = make_structure_doc(num_chapters, PROBLEMS_PER_CHAPTER)
+        num_blocks = len(structure_doc['blocks'])
+        memory_before = resident_memory()
+        structure = structure_from_mongo(structure_doc)
+        memory_after = resident_memory()
+        self.assertEqual(len(structure['blocks']), num_blocks)
+
+        result_str = "{} - Num Blocks: {:>6} - Extra Resident Memory: {:.1f}MB\n".format(
+            self.test_run_time, num_blocks, (memory_after - memory_before) / (1024.0 * 1024.0)
+        )
+        with open("split_structure_memory.txt", "a") as f:
+            f.write(result_str)
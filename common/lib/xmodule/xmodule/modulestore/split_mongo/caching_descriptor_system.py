@@ -39,7 +39,8 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
     Computes the settings (nee 'metadata') inheritance upon creation.
     """
     @contract(course_entry=CourseEnvelope)
-    def __init__(self, modulestore, course_entry, default_class, module_data, lazy, **kwargs):
+    def __init__(self, modulestore, course_entry, default_class, module_data, lazy,
+                 inherited_settings_map=None, **kwargs):
         """
         Computes the settings inheritance and sets up the cache.
 
@@ -52,6 +53,10 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
 
         module_data: a dict mapping Location -> json that was cached from the
             underlying modulestore
+
+        inherited_settings_map: if given, a dict mapping BlockKey -> the settings that block inherits
+            from its ancestors, precomputed for the (unchanging) structure. Otherwise, inherited values
+            are found by walking up the loaded ancestors on each access.
         """
         # needed by capa_problem (as runtime.filestore via this.resources_fs)
         if course_entry.course_key.course:
@@ -77,6 +82,7 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
         self.course_id = course_entry.course_key
         self.lazy = lazy
         self.module_data = module_data
+        self.inherited_settings_map = inherited_settings_map
         self.default_class = default_class
         self.local_modules = {}
         self._services['library_tools'] = LibraryToolsService(modulestore)
@@ -203,7 +209,7 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
         )
 
         converted_fields = convert_fields(block_data.fields)
-        converted_defaults = convert_fields(block_data.defaults)
+        converted_defaults = convert_fields(block_data.defaults) if block_data.has_defaults else {}
         if block_key in self._parent_map:
             parent_key = self._parent_map[block_key]
             parent = course_key.make_usage_key(parent_key.type, parent_key.id)
@@ -218,7 +224,11 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
         )
 
         if InheritanceMixin in self.modulestore.xblock_mixins:
-            field_data = inheriting_field_data(kvs)
+            if self.inherited_settings_map is not None:
+                kvs.inherited_settings = self.inherited_settings_map.get(block_key, {})
+                field_data = KvsFieldData(kvs)
+            else:
+                field_data = inheriting_field_data(kvs)
         else:
             field_data = KvsFieldData(kvs)
 
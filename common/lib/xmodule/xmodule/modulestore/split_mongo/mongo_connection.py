@@ -1,11 +1,15 @@
 """
 Segregation of pymongo functions from the data modeling mechanisms for split modulestore.
 """
+import cPickle as pickle
 import datetime
+import logging
 import math
 import pymongo
 import pytz
 import re
+import zlib
+from collections import OrderedDict
 from contextlib import contextmanager
 from time import time
 
@@ -22,6 +26,8 @@ import dogstats_wrapper as dog_stats_api
 
 new_contract('BlockData', BlockData)
 
+log = logging.getLogger(__name__)
+
 
 def round_power_2(value):
     """
@@ -149,6 +155,9 @@ def structure_from_mongo(structure, course_context=None):
     Converts 'blocks.*.fields.children' from [[block_type, block_id]] to [BlockKey].
     N.B. Does not convert any other ReferenceFields (because we don't know which fields they are at this level).
 
+    Each distinct block type string and BlockKey is only created once per structure, so that
+    the block map keys and every 'children' list referring to a block share the same objects.
+
     Arguments:
         structure: The document structure to convert
         course_context (CourseKey): For metrics gathering, the CourseKey
@@ -163,17 +172,103 @@ def structure_from_mongo(structure, course_context=None):
             if 'children' in block['fields']:
                 check('list(list[2])', block['fields']['children'])
 
-        structure['root'] = BlockKey(*structure['root'])
+        block_types = {}
+        block_keys = {}
+
+        def shared_block_key(block_type, block_id):
+            """
+            Return the BlockKey for block_type and block_id shared by the whole structure.
+            """
+            block_key = block_keys.get((block_type, block_id))
+            if block_key is None:
+                block_type = block_types.setdefault(block_type, block_type)
+                block_key = block_keys[(block_type, block_id)] = BlockKey(block_type, block_id)
+            return block_key
+
+        structure['root'] = shared_block_key(*structure['root'])
         new_blocks = {}
         for block in structure['blocks']:
             if 'children' in block['fields']:
-                block['fields']['children'] = [BlockKey(*child) for child in block['fields']['children']]
-            new_blocks[BlockKey(block['block_type'], block.pop('block_id'))] = BlockData(**block)
+                block['fields']['children'] = [shared_block_key(*child) for child in block['fields']['children']]
+            block_key = shared_block_key(block['block_type'], block.pop('block_id'))
+            block['block_type'] = block_key.type
+            new_blocks[block_key] = BlockData(**block)
         structure['blocks'] = new_blocks
 
         return structure
 
 
+class CourseStructureCache(object):
+    """
+    A cache of deserialized structures, keyed by structure version id.
+
+    Structures are immutable once written, so a cached structure never needs to be
+    invalidated. Structures are stored pickled and compressed in an optional shared
+    ``cache`` (any object exposing Django's ``get``/``set`` cache interface, e.g. a
+    memcached backed Django cache), fronted by a small per-process LRU. Every read
+    unpickles a fresh copy, so callers are free to mutate what they get back.
+    """
+    def __init__(self, cache=None, local_size=0):
+        """
+        Arguments:
+            cache: The shared cache to store structures in, or None to only use the local LRU.
+            local_size (int): The number of structures to keep in the per-process LRU.
+        """
+        self.cache = cache
+        self.local_size = local_size
+        self._local = OrderedDict()
+
+    def get(self, key, course_context=None):
+        """
+        Return the structure stored for ``key``, or None if it isn't cached.
+        """
+        with TIMER.timer("CourseStructureCache.get", course_context) as tagger:
+            cache_key = unicode(key)
+            compressed_data = self._local.pop(cache_key, None)
+            if compressed_data is not None:
+                tagger.tag(from_cache='local')
+            elif self.cache is not None:
+                compressed_data = self.cache.get(cache_key)
+                tagger.tag(from_cache='shared' if compressed_data is not None else 'miss')
+            else:
+                tagger.tag(from_cache='miss')
+
+            if compressed_data is None:
+                return None
+
+            tagger.measure('compressed_size', len(compressed_data))
+            try:
+                structure = pickle.loads(zlib.decompress(compressed_data))
+            except Exception:  # pylint: disable=broad-except
+                # Most likely written by an incompatible version of the code; treat it as a miss.
+                log.warning("Unable to load cached structure %s", cache_key, exc_info=True)
+                return None
+            self._add_local(cache_key, compressed_data)
+            return structure
+
+    def set(self, key, structure, course_context=None):
+        """
+        Store ``structure`` under ``key``.
+        """
+        with TIMER.timer("CourseStructureCache.set", course_context) as tagger:
+            cache_key = unicode(key)
+            compressed_data = zlib.compress(pickle.dumps(structure, pickle.HIGHEST_PROTOCOL), 1)
+            tagger.measure('compressed_size', len(compressed_data))
+            self._add_local(cache_key, compressed_data)
+            if self.cache is not None:
+                self.cache.set(cache_key, compressed_data)
+
+    def _add_local(self, cache_key, compressed_data):
+        """
+        Record ``compressed_data`` as the most recently used entry of the local LRU.
+        """
+        if self.local_size <= 0:
+            return
+        self._local[cache_key] = compressed_data
+        while len(self._local) > self.local_size:
+            self._local.popitem(last=False)
+
+
 def structure_to_mongo(structure, course_context=None):
     """
     Converts the 'blocks' key from a map {BlockKey: block_data} to
@@ -209,11 +304,17 @@ class MongoConnection(object):
     """
     def __init__(
         self, db, collection, host, port=27017, tz_aware=True, user=None, password=None,
-        asset_collection=None, retry_wait_time=0.1, **kwargs
+        asset_collection=None, retry_wait_time=0.1, structure_cache=None, **kwargs
     ):
         """
         Create & open the connection, authenticate, and provide pointers to the collections
+
+        Arguments:
+            structure_cache (CourseStructureCache): If given, consulted by :meth:`get_structure`
+                before querying mongo.
         """
+        self.structure_cache = structure_cache
+
         if kwargs.get('replicaSet') is None:
             kwargs.pop('replicaSet', None)
             mongo_class = pymongo.MongoClient
@@ -259,12 +360,22 @@ class MongoConnection(object):
         Get the structure from the persistence mechanism whose id is the given key
         """
         with TIMER.timer("get_structure", course_context) as tagger_get_structure:
+            if self.structure_cache is not None:
+                structure = self.structure_cache.get(key, course_context)
+                tagger_get_structure.tag(from_cache=str(structure is not None).lower())
+                if structure is not None:
+                    tagger_get_structure.measure("blocks", len(structure['blocks']))
+                    return structure
+
             with TIMER.timer("get_structure.find_one", course_context) as tagger_find_one:
                 doc = self.structures.find_one({'_id': key})
                 tagger_find_one.measure("blocks", len(doc['blocks']))
             tagger_get_structure.measure("blocks", len(doc['blocks']))
 
-            return structure_from_mongo(doc, course_context)
+            structure = structure_from_mongo(doc, course_context)
+            if self.structure_cache is not None:
+                self.structure_cache.set(key, structure, course_context)
+            return structure
 
     @autoretry_read()
     def find_structures_by_id(self, ids, course_context=None):
@@ -276,10 +387,24 @@ class MongoConnection(object):
         """
         with TIMER.timer("find_structures_by_id", course_context) as tagger:
             tagger.measure("requested_ids", len(ids))
-            docs = [
-                structure_from_mongo(structure, course_context)
-                for structure in self.structures.find({'_id': {'$in': ids}})
-            ]
+            docs = []
+            if self.structure_cache is not None:
+                uncached_ids = []
+                for structure_id in ids:
+                    structure = self.structure_cache.get(structure_id, course_context)
+                    if structure is None:
+                        uncached_ids.append(structure_id)
+                    else:
+                        docs.append(structure)
+                tagger.measure("cached_structures", len(docs))
+                ids = uncached_ids
+
+            if ids:
+                for structure in self.structures.find({'_id': {'$in': ids}}):
+                    structure = structure_from_mongo(structure, course_context)
+                    if self.structure_cache is not None:
+                        self.structure_cache.set(structure['_id'], structure, course_context)
+                    docs.append(structure)
             tagger.measure("structures", len(docs))
             return docs
 
@@ -353,6 +478,31 @@ class MongoConnection(object):
                 }
             return self.course_index.find_one(query)
 
+    def get_course_indexes(self, course_keys):
+        """
+        Get the course_indexes for all of the given course keys in one query (the equivalent
+        of calling get_course_index for each of them).
+
+        Arguments:
+            course_keys (list): A list of CourseLocators
+        """
+        with TIMER.timer("get_course_indexes", None) as tagger:
+            tagger.measure("requested_keys", len(course_keys))
+            if not course_keys:
+                return []
+            query = {
+                '$or': [
+                    {
+                        key_attr: getattr(course_key, key_attr)
+                        for key_attr in ('org', 'course', 'run')
+                    }
+                    for course_key in course_keys
+                ]
+            }
+            indexes = list(self.course_index.find(query))
+            tagger.measure("indexes", len(indexes))
+            return indexes
+
     def find_matching_course_indexes(self, branch=None, search_targets=None, org_target=None, course_context=None):
         """
         Find the course_index matching particular conditions.
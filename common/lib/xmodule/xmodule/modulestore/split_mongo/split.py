@@ -82,7 +82,7 @@ from .caching_descriptor_system import CachingDescriptorSystem
 from xmodule.modulestore.split_mongo.mongo_connection import MongoConnection, DuplicateKeyError
 from xmodule.modulestore.split_mongo import BlockKey, CourseEnvelope
 from xmodule.error_module import ErrorDescriptor
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 from types import NoneType
 from xmodule.assetstore import AssetMetadata
 
@@ -636,18 +636,23 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
     # version) but those functions will have an optional arg for setting these.
     SEARCH_TARGET_DICT = ['wiki_slug']
 
+    # the number of structure versions whose inherited settings are kept in memory
+    INHERITED_SETTINGS_CACHE_SIZE = 32
+
     def __init__(self, contentstore, doc_store_config, fs_root, render_template,
                  default_class=None,
                  error_tracker=null_error_tracker,
                  i18n_service=None, fs_service=None, user_service=None,
-                 services=None, signal_handler=None, **kwargs):
+                 services=None, signal_handler=None, structure_cache=None, **kwargs):
         """
         :param doc_store_config: must have a host, db, and collection entries. Other common entries: port, tz_aware.
+        :param structure_cache: an optional CourseStructureCache shared by all requests (and, if it's
+            backed by a shared cache, by all processes) for looking up structures by version.
         """
 
         super(SplitMongoModuleStore, self).__init__(contentstore, **kwargs)
 
-        self.db_connection = MongoConnection(**doc_store_config)
+        self.db_connection = MongoConnection(structure_cache=structure_cache, **doc_store_config)
         self.db = self.db_connection.database
 
         if default_class is not None:
@@ -674,6 +679,9 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
 
         self.signal_handler = signal_handler
 
+        # structure version -> {BlockKey: inherited settings}; see _get_inherited_settings_map
+        self._inherited_settings_cache = OrderedDict()
+
     def close_connections(self):
         """
         Closes any open connections to the underlying databases
@@ -762,6 +770,84 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
 
         return [runtime.load_item(block_key, course_entry, **kwargs) for block_key in block_keys]
 
+    def _get_inherited_settings_map(self, course_entry):
+        """
+        Return the inheritable settings each block in course_entry's structure gets from its ancestors
+        (see compute_inherited_settings), or None if the structure may still change (i.e., it was
+        created in a bulk operation that hasn't been persisted yet).
+
+        Persisted structures never change, so the map is computed once per structure version and
+        shared by every runtime created for that version.
+        """
+        structure = course_entry.structure
+        bulk_write_record = self._get_bulk_ops_record(course_entry.course_key)
+        if bulk_write_record.active and structure['_id'] not in bulk_write_record.structures_in_db:
+            return None
+
+        inherited_settings_map = self._inherited_settings_cache.pop(structure['_id'], None)
+        if inherited_settings_map is None:
+            inherited_settings_map = self.compute_inherited_settings(structure['blocks'])
+        self._inherited_settings_cache[structure['_id']] = inherited_settings_map
+        while len(self._inherited_settings_cache) > self.INHERITED_SETTINGS_CACHE_SIZE:
+            self._inherited_settings_cache.popitem(last=False)
+        return inherited_settings_map
+
+    @staticmethod
+    def compute_inherited_settings(block_map):
+        """
+        Return a map of BlockKey to the inheritable settings (json values) which the nearest
+        ancestor setting each field passes down to that block. Parents are determined the same way as
+        the runtime does (see CachingDescriptorSystem._parent_map).
+
+        Blocks which don't set any inheritable field pass the very same dict on to their children,
+        so the map stays small even for very large courses.
+        """
+        inheritable_fields = inheritance.InheritanceMixin.fields
+        parent_map = {}
+        for block_key, block in block_map.iteritems():
+            for child in block.fields.get('children', []):
+                parent_map[child] = block_key
+
+        no_settings = {}
+        inherited = {}
+        passed_down = {}
+
+        def settings_passed_down(parent_key):
+            """
+            The settings which parent_key passes on to its children.
+            """
+            if parent_key not in passed_down:
+                own_settings = {
+                    field_name: value
+                    for field_name, value in block_map[parent_key].fields.iteritems()
+                    if field_name in inheritable_fields
+                }
+                if own_settings:
+                    settings = inherited[parent_key].copy()
+                    settings.update(own_settings)
+                else:
+                    settings = inherited[parent_key]
+                passed_down[parent_key] = settings
+            return passed_down[parent_key]
+
+        for block_key in block_map:
+            # walk up to the nearest ancestor whose settings are already known, then fill in back down
+            path = []
+            on_path = set()
+            current = block_key
+            while current is not None and current not in inherited and current not in on_path:
+                path.append(current)
+                on_path.add(current)
+                current = parent_map.get(current)
+            for current in reversed(path):
+                parent_key = parent_map.get(current)
+                if parent_key in inherited:
+                    inherited[current] = settings_passed_down(parent_key)
+                else:
+                    # the root of the tree (or of a cycle)
+                    inherited[current] = no_settings
+        return inherited
+
     def _get_cache(self, course_version_guid):
         """
         Find the descriptor cache for this course if it exists
@@ -966,6 +1052,54 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             raise ItemNotFoundError(course_id)
         return self._get_structure(course_id, depth, **kwargs)
 
+    def get_courses_by_keys(self, course_keys, depth=0, **kwargs):
+        """
+        Gets the course descriptors for all of the given course locators, fetching the course
+        indexes and then the structures of the courses with one query each.
+
+        Locators which pin a version or whose course is in an active bulk operation are looked
+        up individually via get_course. Courses which don't exist are left out of the result.
+        """
+        courses = {}
+        batched_keys = []
+        for course_key in course_keys:
+            if not isinstance(course_key, CourseLocator) or course_key.deprecated:
+                continue
+            if course_key.branch is None:
+                raise InsufficientSpecificationError(course_key)
+            if course_key.version_guid is not None or self._is_in_bulk_operation(course_key):
+                try:
+                    courses[course_key] = self.get_course(course_key, depth=depth, **kwargs)
+                except ItemNotFoundError:
+                    pass
+            else:
+                batched_keys.append(course_key)
+
+        if not batched_keys:
+            return courses
+
+        indexes = {
+            (index['org'], index['course'], index['run']): index
+            for index in self.db_connection.get_course_indexes(batched_keys)
+        }
+        version_guids = {}
+        for course_key in batched_keys:
+            index = indexes.get((course_key.org, course_key.course, course_key.run))
+            if index is not None and course_key.branch in index['versions']:
+                version_guids[course_key] = index['versions'][course_key.branch]
+
+        structures = {
+            structure['_id']: structure
+            for structure in self.find_structures_by_id(list(set(version_guids.itervalues())))
+        }
+        for course_key, version_guid in version_guids.iteritems():
+            structure = structures.get(version_guid)
+            if structure is None:
+                continue
+            envelope = CourseEnvelope(course_key.replace(version_guid=version_guid), structure)
+            courses[course_key] = self._load_items(envelope, [structure['root']], depth, **kwargs)[0]
+        return courses
+
     def get_library(self, library_id, depth=0, head_validation=True, **kwargs):
         """
         Gets the 'library' root block for the library identified by the locator
@@ -3086,6 +3220,7 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             course_entry=course_entry,
             module_data={},
             lazy=lazy,
+            inherited_settings_map=self._get_inherited_settings_map(course_entry),
             default_class=self.default_class,
             error_tracker=self.error_tracker,
             render_template=self.render_template,
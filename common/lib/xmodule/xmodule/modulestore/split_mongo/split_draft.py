@@ -57,6 +57,16 @@ class DraftVersioningModuleStore(SplitMongoModuleStore, ModuleStoreDraftAndPubli
         course_id = self._map_revision_to_branch(course_id)
         return super(DraftVersioningModuleStore, self).get_course(course_id, depth=depth, **kwargs)
 
+    def get_courses_by_keys(self, course_keys, depth=0, **kwargs):
+        """
+        See :py:meth: xmodule.modulestore.split_mongo.split.SplitMongoModuleStore.get_courses_by_keys
+        """
+        branched_keys = {self._map_revision_to_branch(course_key): course_key for course_key in course_keys}
+        courses = super(DraftVersioningModuleStore, self).get_courses_by_keys(
+            branched_keys.keys(), depth=depth, **kwargs
+        )
+        return {branched_keys[course_key]: course for course_key, course in courses.iteritems()}
+
     def get_library(self, library_id, depth=0, head_validation=True, **kwargs):
         if not head_validation and library_id.version_guid:
             return SplitMongoModuleStore.get_library(
@@ -117,12 +117,17 @@ class SplitMongoKVS(InheritanceKeyValueStore):
 
     def default(self, key):
         """
-        Check to see if the default should be from the template's defaults (if any)
-        rather than the global default or inheritance.
+        Check to see if the default should be inherited (if the inherited settings were
+        precomputed) or from the template's defaults (if any) rather than the global default.
         """
+        # Values set on an ancestor take precedence over the template's defaults, just as they
+        # do when InheritingFieldData walks up the ancestors itself.
+        if key.field_name in self.inherited_settings:
+            # the precomputed settings are shared by every block (and runtime) using the structure
+            return copy.deepcopy(self.inherited_settings[key.field_name])
         if self._defaults and key.field_name in self._defaults:
             return self._defaults[key.field_name]
-        # If not, try inheriting from a parent, then use the XBlock type's normal default value:
+        # If not, use the XBlock type's normal default value:
         return super(SplitMongoKVS, self).default(key)
 
     def _load_definition(self):
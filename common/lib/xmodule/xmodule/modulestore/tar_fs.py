@@ -0,0 +1,130 @@
+"""
+A write-only filesystem which adds the files written to it to a tar archive.
+
+It implements the part of the pyfilesystem API used to export courses (`open`, `makedir` and
+`makeopendir`), so that an export can be written straight to a (possibly compressed and
+non-seekable) tar stream, without first writing it to disk.
+"""
+import posixpath
+import tarfile
+import time
+from tempfile import SpooledTemporaryFile
+
+# Files larger than this many bytes are buffered on disk until they are added to the archive
+SPOOL_MAX_SIZE = 1024 * 1024
+
+
+def _tar_info(full_path):
+    """
+    A TarInfo for `full_path`, whose name is utf-8 encoded.
+    """
+    if isinstance(full_path, unicode):
+        full_path = full_path.encode('utf-8')
+    info = tarfile.TarInfo(full_path)
+    info.mtime = time.time()
+    return info
+
+
+class TarFS(object):
+    """
+    A write-only filesystem whose files are added to the archive `tar_file` under `root` once closed.
+    """
+    def __init__(self, tar_file, root='', directories=None):
+        self.tar_file = tar_file
+        self.root = root.strip('/')
+        # The directories added to the archive, shared by the filesystems opened on the same archive
+        self.directories = directories if directories is not None else set()
+        if self.root:
+            self._add_directory(self.root)
+
+    def _path(self, path):
+        """
+        The path of `path` in the archive.
+        """
+        return posixpath.normpath(posixpath.join(self.root, path.lstrip('/')))
+
+    def _add_directory(self, full_path):
+        """
+        Add `full_path` and its missing parents to the archive.
+        """
+        if not full_path or full_path == '.' or full_path in self.directories:
+            return
+        self._add_directory(posixpath.dirname(full_path))
+        info = _tar_info(full_path)
+        info.type = tarfile.DIRTYPE
+        info.mode = 0755
+        self.tar_file.addfile(info)
+        self.directories.add(full_path)
+
+    def _add_file(self, full_path, fileobj, size):
+        """
+        Add the `size` bytes of `fileobj` to the archive as `full_path`.
+        """
+        self._add_directory(posixpath.dirname(full_path))
+        info = _tar_info(full_path)
+        info.size = size
+        info.mode = 0644
+        self.tar_file.addfile(info, fileobj)
+
+    def makedir(self, path, recursive=False, allow_recreate=False):  # pylint: disable=unused-argument
+        """
+        Add the directory `path` to the archive.
+        """
+        self._add_directory(self._path(path))
+
+    def makeopendir(self, path, recursive=False):  # pylint: disable=unused-argument
+        """
+        Add the directory `path` to the archive, and return a TarFS writing into it.
+        """
+        return TarFS(self.tar_file, self._path(path), self.directories)
+
+    def open(self, path, mode='r', **kwargs):  # pylint: disable=unused-argument
+        """
+        Return a file which is added to the archive as `path` once closed.
+        """
+        if 'w' not in mode:
+            raise ValueError(u'Files of a TarFS can only be opened for writing, not {}'.format(mode))
+        return TarFSFile(self, self._path(path))
+
+
+class TarFSFile(object):
+    """
+    A file of a TarFS, which is added to its archive once closed.
+    """
+    def __init__(self, tar_fs, full_path):
+        self.tar_fs = tar_fs
+        self.full_path = full_path
+        self.buffer = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+        self.closed = False
+
+    def write(self, data):
+        if isinstance(data, unicode):
+            data = data.encode('utf-8')
+        self.buffer.write(data)
+
+    def writelines(self, lines):
+        for line in lines:
+            self.write(line)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        """
+        Add the file to the archive.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        size = self.buffer.tell()
+        self.buffer.seek(0)
+        try:
+            self.tar_fs._add_file(self.full_path, self.buffer, size)  # pylint: disable=protected-access
+        finally:
+            self.buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -858,6 +858,19 @@ class TestMixedModuleStore(CommonMixedModuleStoreSetup):
             published_courses = self.store.get_courses(remove_branch=True)
         self.assertEquals([c.id for c in draft_courses], [c.id for c in published_courses])
 
+    @ddt.data('draft', 'split')
+    def test_get_courses_by_keys(self, default_ms):
+        self.initdb(default_ms)
+        mongo_course_key = self.course_locations[self.MONGO_COURSEID].course_key
+        xml_course_key = self.course_locations[self.XML_COURSEID1].course_key
+        missing_course_key = self.store.make_course_key('no_such', 'course', 'run')
+
+        courses = self.store.get_courses_by_keys([mongo_course_key, xml_course_key, missing_course_key])
+        self.assertItemsEqual(courses.keys(), [mongo_course_key, xml_course_key])
+        self.assertEqual(courses[mongo_course_key].id, mongo_course_key)
+        self.assertEqual(courses[xml_course_key].id, xml_course_key)
+        self.assertEqual(self.store.get_courses_by_keys([]), {})
+
     @ddt.data('draft', 'split')
     def test_create_child_detached_tabs(self, default_ms):
         """
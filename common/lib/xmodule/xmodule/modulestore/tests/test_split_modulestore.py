@@ -16,7 +16,7 @@ from nose.plugins.attrib import attr
 from openedx.core.lib import tempdir
 from xblock.fields import Reference, ReferenceList, ReferenceValueDict
 from xmodule.course_module import CourseDescriptor
-from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore import ModuleStoreEnum, BlockData
 from xmodule.modulestore.exceptions import (
     ItemNotFoundError, VersionConflictError,
     DuplicateItemError, DuplicateCourseError,
@@ -27,6 +27,7 @@ from xmodule.modulestore.inheritance import InheritanceMixin
 from xmodule.x_module import XModuleMixin
 from xmodule.fields import Date, Timedelta
 from xmodule.modulestore.split_mongo.split import SplitMongoModuleStore
+from xmodule.modulestore.split_mongo.mongo_connection import CourseStructureCache, structure_from_mongo
 from xmodule.modulestore.tests.test_modulestore import check_has_course_method
 from xmodule.modulestore.split_mongo import BlockKey
 from xmodule.modulestore.tests.mongo_connection import MONGO_PORT_NUM, MONGO_HOST
@@ -1792,6 +1793,47 @@ class TestInheritance(SplitModuleTest):
         # FIXME LMS-11376
 #         self.assertTrue(parented_problem.visible_to_staff_only)
 
+    @patch('xmodule.tabs.CourseTab.from_json', side_effect=mock_tab_from_json)
+    def test_precomputed_inheritance(self, _from_json):
+        """
+        Inherited settings are computed once per structure version and shared by its runtimes
+        """
+        course_key = CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT)
+        problem = modulestore().get_item(BlockUsageLocator(course_key, 'problem', 'problem3_2'))
+        self.assertIsNotNone(problem.runtime.inherited_settings_map)
+        self.assertEqual(problem.graceperiod, datetime.timedelta(hours=2))
+
+        other_problem = modulestore().get_item(BlockUsageLocator(course_key, 'problem', 'problem1'))
+        self.assertIsNot(other_problem.runtime, problem.runtime)
+        self.assertIs(other_problem.runtime.inherited_settings_map, problem.runtime.inherited_settings_map)
+        self.assertEqual(other_problem.graceperiod, datetime.timedelta(hours=4))
+
+    def test_compute_inherited_settings(self):
+        """
+        Blocks get the settings of their nearest ancestor setting each field
+        """
+        block_map = {
+            BlockKey('course', 'course'): BlockData(fields={
+                'children': [BlockKey('chapter', 'chapter1'), BlockKey('chapter', 'chapter2')],
+                'graceperiod': '2 hours',
+                'display_name': 'Not inherited',
+            }),
+            BlockKey('chapter', 'chapter1'): BlockData(fields={
+                'children': [BlockKey('problem', 'problem1')],
+                'graceperiod': '4 hours',
+            }),
+            BlockKey('chapter', 'chapter2'): BlockData(fields={'children': [BlockKey('problem', 'problem2')]}),
+            BlockKey('problem', 'problem1'): BlockData(fields={}),
+            BlockKey('problem', 'problem2'): BlockData(fields={}),
+        }
+        inherited = SplitMongoModuleStore.compute_inherited_settings(block_map)
+        self.assertEqual(inherited[BlockKey('course', 'course')], {})
+        self.assertEqual(inherited[BlockKey('chapter', 'chapter1')], {'graceperiod': '2 hours'})
+        self.assertEqual(inherited[BlockKey('problem', 'problem1')], {'graceperiod': '4 hours'})
+        self.assertEqual(inherited[BlockKey('problem', 'problem2')], {'graceperiod': '2 hours'})
+        # chapter2 doesn't set anything, so its children share its settings
+        self.assertIs(inherited[BlockKey('problem', 'problem2')], inherited[BlockKey('chapter', 'chapter2')])
+
 
 class TestPublish(SplitModuleTest):
     """
@@ -1996,6 +2038,118 @@ class TestSchema(SplitModuleTest):
             )
 
 
+class DictCache(dict):
+    """
+    The subset of the django cache api used by CourseStructureCache, backed by a dict.
+    """
+    def set(self, key, value, timeout=None):  # pylint: disable=arguments-differ, unused-argument
+        self[key] = value
+
+
+class TestCourseStructureCache(SplitModuleTest):
+    """
+    Test that structures are served from the CourseStructureCache once they've been loaded.
+    """
+    def setUp(self):
+        super(TestCourseStructureCache, self).setUp()
+        self.shared_cache = DictCache()
+        self.db_connection = modulestore().db_connection
+        self.db_connection.structure_cache = CourseStructureCache(self.shared_cache, local_size=1)
+        self.addCleanup(setattr, self.db_connection, 'structure_cache', None)
+        index = self.db_connection.get_course_index(CourseLocator(org='testx', course='GreekHero', run="run"))
+        self.version = index['versions'][BRANCH_NAME_DRAFT]
+
+    def test_structure_cached(self):
+        structure = self.db_connection.get_structure(self.version)
+        self.assertIn(unicode(self.version), self.shared_cache)
+
+        with patch.object(self.db_connection.structures, 'find_one') as mock_find_one:
+            cached_structure = self.db_connection.get_structure(self.version)
+        self.assertFalse(mock_find_one.called)
+        self.assertEqual(cached_structure['_id'], structure['_id'])
+        self.assertEqual(cached_structure['root'], structure['root'])
+        self.assertItemsEqual(cached_structure['blocks'].keys(), structure['blocks'].keys())
+        # every read gets its own copy
+        self.assertIsNot(cached_structure, self.db_connection.get_structure(self.version))
+
+    def test_shared_cache_hit(self):
+        structure = self.db_connection.get_structure(self.version)
+        # a new process starts out with only the shared cache
+        other_process_cache = CourseStructureCache(self.shared_cache)
+        self.assertItemsEqual(other_process_cache.get(self.version)['blocks'].keys(), structure['blocks'].keys())
+
+    def test_local_lru(self):
+        local_cache = CourseStructureCache(local_size=2)
+        for key in ('a', 'b', 'c'):
+            local_cache.set(key, {'_id': key})
+        self.assertIsNone(local_cache.get('a'))
+        self.assertEqual(local_cache.get('b'), {'_id': 'b'})
+        local_cache.set('d', {'_id': 'd'})
+        # 'b' was used more recently than 'c'
+        self.assertIsNone(local_cache.get('c'))
+        self.assertEqual(local_cache.get('b'), {'_id': 'b'})
+
+
+class TestStructureFromMongo(unittest.TestCase):
+    """
+    Test the in-memory representation of structures built by structure_from_mongo.
+    """
+    def _structure_doc(self, num_chapters, num_problems):
+        """
+        Generate a mongo structure document for a course with num_chapters chapters
+        each containing num_problems problems.
+        """
+        blocks = [{
+            'block_type': 'course',
+            'block_id': 'course',
+            'definition': None,
+            'fields': {'children': [['chapter', 'chapter{}'.format(i)] for i in range(num_chapters)]},
+            'edit_info': {'edited_by': 1},
+        }]
+        for i in range(num_chapters):
+            blocks.append({
+                'block_type': 'chapter',
+                'block_id': 'chapter{}'.format(i),
+                'definition': None,
+                'fields': {'children': [['problem', 'problem{}_{}'.format(i, j)] for j in range(num_problems)]},
+                'edit_info': {'edited_by': 1},
+            })
+            blocks.extend({
+                'block_type': u'problem',
+                'block_id': u'problem{}_{}'.format(i, j),
+                'definition': None,
+                'fields': {'weight': 1},
+                'edit_info': {'edited_by': 1},
+            } for j in range(num_problems))
+        return {'_id': 'version', 'root': ['course', 'course'], 'blocks': blocks}
+
+    def test_large_structure(self):
+        structure = structure_from_mongo(self._structure_doc(50, 200))
+        self.assertEqual(len(structure['blocks']), 1 + 50 + 50 * 200)
+
+        block_keys = {key: key for key in structure['blocks']}
+        problem_types = set()
+        for block_key, block in structure['blocks'].iteritems():
+            self.assertFalse(hasattr(block, '__dict__'))
+            self.assertFalse(hasattr(block.edit_info, '__dict__'))
+            # children refer to the very same BlockKeys as the block map
+            for child in block.fields.get('children', []):
+                self.assertIs(child, block_keys[child])
+            if block_key.type == 'problem':
+                problem_types.add(id(block.block_type))
+        self.assertIs(structure['root'], block_keys[structure['root']])
+        self.assertEqual(len(problem_types), 1)
+
+    def test_lazy_defaults(self):
+        structure = structure_from_mongo(self._structure_doc(1, 1))
+        block = structure['blocks'][BlockKey('problem', 'problem0_0')]
+        self.assertFalse(block.has_defaults)
+        self.assertEqual(block.to_storable()['defaults'], {})
+        block.defaults['weight'] = 2
+        self.assertTrue(block.has_defaults)
+        self.assertEqual(block.to_storable()['defaults'], {'weight': 2})
+
+
 # ===========================================
 def modulestore():
     """
@@ -0,0 +1,66 @@
+"""
+Tests for the filesystem writing course exports to tar archives.
+"""
+import tarfile
+import unittest
+from StringIO import StringIO
+
+from xmodule.modulestore import tar_fs
+from xmodule.modulestore.tar_fs import TarFS
+
+
+class TestTarFS(unittest.TestCase):
+    """
+    Tests for TarFS
+    """
+    def setUp(self):
+        super(TestTarFS, self).setUp()
+        self.output = StringIO()
+        self.tar_file = tarfile.open(fileobj=self.output, mode='w|gz')
+        self.export_fs = TarFS(self.tar_file, 'course')
+
+    def read_archive(self):
+        """
+        Close the archive, and return its members by name.
+        """
+        self.tar_file.close()
+        archive = tarfile.open(fileobj=StringIO(self.output.getvalue()), mode='r:gz')
+        return {member.name: member for member in archive.getmembers()}, archive
+
+    def test_files_and_directories(self):
+        with self.export_fs.open('course.xml', 'w') as course_xml:
+            course_xml.write('<course/>')
+        self.export_fs.makedir('html/nested', recursive=True, allow_recreate=True)
+        policies = self.export_fs.makeopendir('policies')
+        with policies.makeopendir('2014').open('policy.json', 'w') as policy:
+            policy.write(u'{"name": "caf\u00e9"}')
+
+        members, archive = self.read_archive()
+
+        self.assertEqual(
+            sorted(members),
+            [
+                'course', 'course/course.xml', 'course/html', 'course/html/nested',
+                'course/policies', 'course/policies/2014', 'course/policies/2014/policy.json',
+            ]
+        )
+        self.assertTrue(members['course/html/nested'].isdir())
+        self.assertEqual(archive.extractfile('course/course.xml').read(), '<course/>')
+        self.assertEqual(
+            archive.extractfile('course/policies/2014/policy.json').read().decode('utf-8'),
+            u'{"name": "caf\u00e9"}'
+        )
+
+    def test_large_file(self):
+        data = 'x' * (tar_fs.SPOOL_MAX_SIZE + 1)
+        with self.export_fs.makeopendir('static').open('video.mp4', 'wb') as video:
+            video.write(data)
+
+        members, archive = self.read_archive()
+
+        self.assertEqual(members['course/static/video.mp4'].size, len(data))
+        self.assertEqual(archive.extractfile('course/static/video.mp4').read(), data)
+
+    def test_read_only(self):
+        with self.assertRaises(ValueError):
+            self.export_fs.open('course.xml', 'r')
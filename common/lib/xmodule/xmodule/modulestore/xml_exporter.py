@@ -13,12 +13,14 @@ from xmodule.modulestore import EdxJSONEncoder, ModuleStoreEnum
 from xmodule.modulestore.inheritance import own_metadata
 from xmodule.modulestore.store_utilities import draft_node_constructor, get_draft_subtree_roots
 from xmodule.modulestore import LIBRARY_ROOT
+from xmodule.modulestore.tar_fs import TarFS
 from fs.osfs import OSFS
 from json import dumps
 import json
 import os
 from path import path
 import shutil
+import tarfile
 from xmodule.modulestore.draft_and_published import DIRECT_ONLY_CATEGORIES
 from opaque_keys.edx.locator import CourseLocator, LibraryLocator
 
@@ -114,8 +116,8 @@ class ExportManager(object):
         `modulestore`: A `ModuleStore` object that is the source of the modules to export
         `contentstore`: A `ContentStore` object that is the source of the content to export, can be None
         `courselike_key`: The Locator of the Descriptor to export
-        `root_dir`: The directory to write the exported xml to
-        `target_dir`: The name of the directory inside `root_dir` to write the content to
+        `root_dir`: The directory to write the exported xml to (None when exporting to a tar archive)
+        `target_dir`: The name of the directory inside `root_dir` (or the archive) to write the content to
         """
         self.modulestore = modulestore
         self.contentstore = contentstore
@@ -135,7 +137,7 @@ class ExportManager(object):
         Perform any additional tasks to the root XML node.
         """
 
-    def process_extra(self, root, courselike, root_courselike_dir, xml_centric_courselike_key, export_fs):
+    def process_extra(self, root, courselike, xml_centric_courselike_key, export_fs):
         """
         Process additional content, like static assets.
         """
@@ -151,19 +153,22 @@ class ExportManager(object):
         Get the target courselike object for this export.
         """
 
-    def export(self):
+    def export(self, export_fs=None):
         """
         Perform the export given the parameters handed to this class at init.
+
+        The files are written to `export_fs` if given, else to the `target_dir` directory of `root_dir`.
         """
         with self.modulestore.bulk_operations(self.courselike_key):
 
-            fsm = OSFS(self.root_dir)
+            if export_fs is None:
+                export_fs = OSFS(self.root_dir).makeopendir(self.target_dir)
             root = lxml.etree.Element('unknown')  # pylint: disable=no-member
 
             # export only the published content
             with self.modulestore.branch_setting(ModuleStoreEnum.Branch.published_only, self.courselike_key):
                 courselike = self.get_courselike()
-                export_fs = courselike.runtime.export_fs = fsm.makeopendir(self.target_dir)
+                courselike.runtime.export_fs = export_fs
 
                 # change all of the references inside the course to use the xml expected key type w/o version & branch
                 xml_centric_courselike_key = self.get_key()
@@ -174,12 +179,21 @@ class ExportManager(object):
             self.process_root(root, export_fs)
 
             # Process extra items-- drafts, assets, etc
-            root_courselike_dir = self.root_dir + '/' + self.target_dir
-            self.process_extra(root, courselike, root_courselike_dir, xml_centric_courselike_key, export_fs)
+            self.process_extra(root, courselike, xml_centric_courselike_key, export_fs)
 
             # Any last pass adjustments
             self.post_process(root, export_fs)
 
+    def export_to_tar(self, fileobj, mode='w|gz'):
+        """
+        Perform the export into a tar archive written to `fileobj`, under `target_dir`.
+
+        Each file is added to the archive as soon as it is exported, so `fileobj` doesn't need to be
+        seekable (with the default `mode`) and the export never needs to be written to disk.
+        """
+        with tarfile.open(fileobj=fileobj, mode=mode) as tar_file:
+            self.export(TarFS(tar_file, self.target_dir))
+
 
 class CourseExportManager(ExportManager):
     """
@@ -202,28 +216,22 @@ class CourseExportManager(ExportManager):
         with export_fs.open('course.xml', 'w') as course_xml:
             lxml.etree.ElementTree(root).write(course_xml)  # pylint: disable=no-member
 
-    def process_extra(self, root, courselike, root_courselike_dir, xml_centric_courselike_key, export_fs):
+    def process_extra(self, root, courselike, xml_centric_courselike_key, export_fs):
         # Export the modulestore's asset metadata.
-        asset_dir = root_courselike_dir + '/' + AssetMetadata.EXPORTED_ASSET_DIR + '/'
-        if not os.path.isdir(asset_dir):
-            os.makedirs(asset_dir)
+        asset_dir = export_fs.makeopendir(AssetMetadata.EXPORTED_ASSET_DIR)
         asset_root = lxml.etree.Element(AssetMetadata.ALL_ASSETS_XML_TAG)
         course_assets = self.modulestore.get_all_asset_metadata(self.courselike_key, None)
         for asset_md in course_assets:
             # All asset types are exported using the "asset" tag - but their asset type is specified in each asset key.
             asset = lxml.etree.SubElement(asset_root, AssetMetadata.ASSET_XML_TAG)  # pylint: disable=no-member
             asset_md.to_xml(asset)
-        with OSFS(asset_dir).open(AssetMetadata.EXPORTED_ASSET_FILENAME, 'w') as asset_xml_file:
+        with asset_dir.open(AssetMetadata.EXPORTED_ASSET_FILENAME, 'w') as asset_xml_file:
             lxml.etree.ElementTree(asset_root).write(asset_xml_file)  # pylint: disable=no-member
 
         # export the static assets
         policies_dir = export_fs.makeopendir('policies')
         if self.contentstore:
-            self.contentstore.export_all_for_course(
-                self.courselike_key,
-                root_courselike_dir + '/static/',
-                root_courselike_dir + '/policies/assets.json',
-            )
+            _export_static_assets(self.contentstore, self.courselike_key, export_fs, policies_dir)
 
             # If we are using the default course image, export it to the
             # legacy location to support backwards compatibility.
@@ -238,10 +246,8 @@ class CourseExportManager(ExportManager):
                 except NotFoundError:
                     pass
                 else:
-                    output_dir = root_courselike_dir + '/static/images/'
-                    if not os.path.isdir(output_dir):
-                        os.makedirs(output_dir)
-                    with OSFS(output_dir).open('course_image.jpg', 'wb') as course_image_file:
+                    output_dir = export_fs.makeopendir('static').makeopendir('images')
+                    with output_dir.open('course_image.jpg', 'wb') as course_image_file:
                         course_image_file.write(course_image.data)
 
         # export the static tabs
@@ -314,20 +320,16 @@ class LibraryExportManager(ExportManager):
         root.set('org', self.courselike_key.org)
         root.set('library', self.courselike_key.library)
 
-    def process_extra(self, root, courselike, root_courselike_dir, xml_centric_courselike_key, export_fs):
+    def process_extra(self, root, courselike, xml_centric_courselike_key, export_fs):
         """
         Notionally, libraries may have assets. This is currently unsupported, but the structure is here
         to ease in duck typing during import. This may be expanded as a useful feature eventually.
         """
         # export the static assets
-        export_fs.makeopendir('policies')
+        policies_dir = export_fs.makeopendir('policies')
 
         if self.contentstore:
-            self.contentstore.export_all_for_course(
-                self.courselike_key,
-                self.root_dir + '/' + self.target_dir + '/static/',
-                self.root_dir + '/' + self.target_dir + '/policies/assets.json',
-            )
+            _export_static_assets(self.contentstore, self.courselike_key, export_fs, policies_dir)
 
     def post_process(self, root, export_fs):
         """
@@ -357,6 +359,30 @@ def export_library_to_xml(modulestore, contentstore, library_key, root_dir, libr
     LibraryExportManager(modulestore, contentstore, library_key, root_dir, library_dir).export()
 
 
+def export_course_to_tar(modulestore, contentstore, course_key, fileobj, course_dir, mode='w|gz'):
+    """
+    Thin wrapper for the Course Export Manager. See ExportManager.export_to_tar for details.
+    """
+    CourseExportManager(modulestore, contentstore, course_key, None, course_dir).export_to_tar(fileobj, mode)
+
+
+def export_library_to_tar(modulestore, contentstore, library_key, fileobj, library_dir, mode='w|gz'):
+    """
+    Thin wrapper for the Library Export Manager. See ExportManager.export_to_tar for details.
+    """
+    LibraryExportManager(modulestore, contentstore, library_key, None, library_dir).export_to_tar(fileobj, mode)
+
+
+def _export_static_assets(contentstore, courselike_key, export_fs, policies_dir):
+    """
+    Export the assets of `courselike_key` to the static directory of `export_fs`, and their attributes to
+    assets.json in `policies_dir`.
+    """
+    policy = contentstore.export_all_for_course_to_fs(courselike_key, export_fs.makeopendir('static'))
+    with policies_dir.open('assets.json', 'w') as policy_file:
+        json.dump(policy, policy_file, sort_keys=True, indent=4)
+
+
 def adapt_references(subtree, destination_course_key, export_fs):
     """
     Map every reference in the subtree into destination_course_key and set it back into the xblock fields
@@ -22,14 +22,19 @@ Modulestore virtual   |          XML physical (draft, published)
 """
 import logging
 from abc import abstractmethod
+from contextlib import contextmanager
+from multiprocessing.pool import ThreadPool
 from opaque_keys.edx.locator import LibraryLocator
 import os
 import mimetypes
 from path import path
 import json
 import re
+from time import time
 from lxml import etree
 
+import dogstats_wrapper as dog_stats_api
+
 from xmodule.modulestore.xml import XMLModuleStore, LibraryXMLModuleStore, ImportSystem
 from xblock.runtime import KvsFieldData, DictKeyValueStore
 from xmodule.x_module import XModuleDescriptor, XModuleMixin
@@ -52,11 +57,17 @@ from xmodule.modulestore.tests.utils import LocationMixin
 
 log = logging.getLogger(__name__)
 
+# How many static files are saved to the content store at once by import_static_content
+STATIC_IMPORT_WORKERS = 4
+
 
 def import_static_content(
         course_data_path, static_content_store,
-        target_id, subpath='static', verbose=False):
-
+        target_id, subpath='static', verbose=False, workers=STATIC_IMPORT_WORKERS):
+    """
+    Import the files of course_data_path/subpath into static_content_store, saving up to `workers`
+    of them at once.
+    """
     remap_dict = {}
 
     # now import all static assets
@@ -75,70 +86,111 @@ def import_static_content(
     mimetypes.add_type('application/octet-stream', '.srt')
     mimetypes_list = mimetypes.types_map.values()
 
-    for dirname, _, filenames in os.walk(static_dir):
-        for filename in filenames:
-
-            content_path = os.path.join(dirname, filename)
-
-            if re.match(ASSET_IGNORE_REGEX, filename):
-                if verbose:
-                    log.debug('skipping static content %s...', content_path)
-                continue
+    def import_file(dirname, filename):
+        """
+        Save the file `filename` of `dirname`, and return its name relative to static_dir and its asset key
+        (or None if it isn't imported).
+        """
+        content_path = os.path.join(dirname, filename)
 
+        if re.match(ASSET_IGNORE_REGEX, filename):
             if verbose:
-                log.debug('importing static content %s...', content_path)
+                log.debug('skipping static content %s...', content_path)
+            return None
 
-            try:
-                with open(content_path, 'rb') as f:
-                    data = f.read()
-            except IOError:
-                if filename.startswith('._'):
-                    # OS X "companion files". See
-                    # http://www.diigo.com/annotated/0c936fda5da4aa1159c189cea227e174
-                    continue
-                # Not a 'hidden file', then re-raise exception
-                raise
+        if verbose:
+            log.debug('importing static content %s...', content_path)
 
-            # strip away leading path from the name
-            fullname_with_subpath = content_path.replace(static_dir, '')
-            if fullname_with_subpath.startswith('/'):
-                fullname_with_subpath = fullname_with_subpath[1:]
-            asset_key = StaticContent.compute_location(target_id, fullname_with_subpath)
-
-            policy_ele = policy.get(asset_key.path, {})
-            displayname = policy_ele.get('displayname', filename)
-            locked = policy_ele.get('locked', False)
-            mime_type = policy_ele.get('contentType')
-
-            # Check extracted contentType in list of all valid mimetypes
-            if not mime_type or mime_type not in mimetypes_list:
-                mime_type = mimetypes.guess_type(filename)[0]   # Assign guessed mimetype
-            content = StaticContent(
-                asset_key, displayname, mime_type, data,
-                import_path=fullname_with_subpath, locked=locked
-            )
+        try:
+            with open(content_path, 'rb') as f:
+                data = f.read()
+        except IOError:
+            if filename.startswith('._'):
+                # OS X "companion files". See
+                # http://www.diigo.com/annotated/0c936fda5da4aa1159c189cea227e174
+                return None
+            # Not a 'hidden file', then re-raise exception
+            raise
+
+        # strip away leading path from the name
+        fullname_with_subpath = content_path.replace(static_dir, '')
+        if fullname_with_subpath.startswith('/'):
+            fullname_with_subpath = fullname_with_subpath[1:]
+        asset_key = StaticContent.compute_location(target_id, fullname_with_subpath)
+
+        policy_ele = policy.get(asset_key.path, {})
+        displayname = policy_ele.get('displayname', filename)
+        locked = policy_ele.get('locked', False)
+        mime_type = policy_ele.get('contentType')
+
+        # Check extracted contentType in list of all valid mimetypes
+        if not mime_type or mime_type not in mimetypes_list:
+            mime_type = mimetypes.guess_type(filename)[0]   # Assign guessed mimetype
+        content = StaticContent(
+            asset_key, displayname, mime_type, data,
+            import_path=fullname_with_subpath, locked=locked
+        )
 
-            # first let's save a thumbnail so we can get back a thumbnail location
-            thumbnail_content, thumbnail_location = static_content_store.generate_thumbnail(content)
+        # first let's save a thumbnail so we can get back a thumbnail location
+        thumbnail_content, thumbnail_location = static_content_store.generate_thumbnail(content)
 
-            if thumbnail_content is not None:
-                content.thumbnail_location = thumbnail_location
+        if thumbnail_content is not None:
+            content.thumbnail_location = thumbnail_location
 
-            # then commit the content
-            try:
-                static_content_store.save(content)
-            except Exception as err:
-                log.exception(u'Error importing {0}, error={1}'.format(
-                    fullname_with_subpath, err
-                ))
+        # then commit the content
+        try:
+            static_content_store.save(content)
+        except Exception as err:
+            log.exception(u'Error importing {0}, error={1}'.format(
+                fullname_with_subpath, err
+            ))
+
+        return fullname_with_subpath, asset_key
+
+    files = [
+        (dirname, filename)
+        for dirname, _, filenames in os.walk(static_dir)
+        for filename in filenames
+    ]
+    if workers > 1 and len(files) > 1:
+        # Saving an asset mostly waits on the content store, so the files are saved by a pool of threads.
+        # imap_unordered re-raises the errors of the threads here.
+        pool = ThreadPool(min(workers, len(files)))
+        try:
+            imported = list(pool.imap_unordered(lambda args: import_file(*args), files))
+        finally:
+            pool.terminate()
+    else:
+        imported = [import_file(dirname, filename) for dirname, filename in files]
 
+    for result in imported:
+        if result is not None:
             # store the remapping information which will be needed
             # to subsitute in the module data
+            fullname_with_subpath, asset_key = result
             remap_dict[fullname_with_subpath] = asset_key
 
     return remap_dict
 
 
+@contextmanager
+def import_phase_timer(phase, courselike_key):
+    """
+    Log and record the time taken by the `phase` of the import of `courselike_key`.
+    """
+    start = time()
+    try:
+        yield
+    finally:
+        duration = time() - start
+        log.info(u'Import of %s: %s took %.3fs', courselike_key, phase, duration)
+        dog_stats_api.histogram(
+            'xmodule.modulestore.xml_importer.{}.duration'.format(phase),
+            duration,
+            tags=[u'course:{}'.format(courselike_key)],
+        )
+
+
 class ImportManager(object):
     """
     Import xml-based courselikes from data_dir into modulestore.
@@ -193,15 +245,16 @@ class ImportManager(object):
         self.do_import_static = do_import_static
         self.create_if_not_present = create_if_not_present
         self.raise_on_failure = raise_on_failure
-        self.xml_module_store = self.store_class(
-            data_dir,
-            default_class=default_class,
-            source_dirs=source_dirs,
-            load_error_modules=load_error_modules,
-            xblock_mixins=store.xblock_mixins,
-            xblock_select=store.xblock_select,
-            target_course_id=target_id,
-        )
+        with import_phase_timer('parse', target_id or data_dir):
+            self.xml_module_store = self.store_class(
+                data_dir,
+                default_class=default_class,
+                source_dirs=source_dirs,
+                load_error_modules=load_error_modules,
+                xblock_mixins=store.xblock_mixins,
+                xblock_select=store.xblock_select,
+                target_course_id=target_id,
+            )
         self.logger, self.errors = make_error_tracker()
 
     def preflight(self):
@@ -430,16 +483,20 @@ class ImportManager(object):
             # This bulk operation wraps all the operations to populate the published branch.
             with self.store.bulk_operations(dest_id):
                 # Retrieve the course itself.
-                source_courselike, courselike, data_path = self.get_courselike(courselike_key, runtime, dest_id)
+                with import_phase_timer('courselike', dest_id):
+                    source_courselike, courselike, data_path = self.get_courselike(courselike_key, runtime, dest_id)
 
                 # Import all static pieces.
-                self.import_static(data_path, dest_id)
+                with import_phase_timer('static', dest_id):
+                    self.import_static(data_path, dest_id)
 
                 # Import asset metadata stored in XML.
-                self.import_asset_metadata(data_path, dest_id)
+                with import_phase_timer('asset_metadata', dest_id):
+                    self.import_asset_metadata(data_path, dest_id)
 
                 # Import all children
-                self.import_children(source_courselike, courselike, courselike_key, dest_id)
+                with import_phase_timer('children', dest_id):
+                    self.import_children(source_courselike, courselike, courselike_key, dest_id)
 
             # This bulk operation wraps all the operations to populate the draft branch with any items
             # from the /drafts subdirectory.
@@ -448,7 +505,8 @@ class ImportManager(object):
             # and then publishing it.
             with self.store.bulk_operations(dest_id):
                 # Import all draft items into the courselike.
-                courselike = self.import_drafts(courselike, courselike_key, data_path, dest_id)
+                with import_phase_timer('drafts', dest_id):
+                    courselike = self.import_drafts(courselike, courselike_key, data_path, dest_id)
 
             yield courselike
 
@@ -39,3 +39,20 @@ class IgnoredFilesTestCase(unittest.TestCase):
         self.assertNotIn(".DS_Store", name_val)
         self.assertIn("GREEN", name_val["example.txt"])
         self.assertIn("BLUE", name_val[".example.txt"])
+
+    def test_serial_and_concurrent_imports_match(self):
+        """
+        Test that saving the files with several threads imports the same files as saving them one by one
+        """
+        course_dir = DATA_DIR / "dot-underscore"
+        course_id = SlashSeparatedCourseKey("edX", "dot-underscore", "2014_Fall")
+        remap_dicts = []
+        saved_names = []
+        for workers in (1, 4):
+            content_store = Mock()
+            content_store.generate_thumbnail.return_value = (None, None)
+            remap_dicts.append(import_static_content(course_dir, content_store, course_id, workers=workers))
+            saved_names.append(sorted(call[0][0].name for call in content_store.save.call_args_list))
+        self.assertEqual(remap_dicts[0], remap_dicts[1])
+        self.assertEqual(saved_names[0], saved_names[1])
+        self.assertIn("example.txt", remap_dicts[1])
@@ -12,6 +12,9 @@ file and check it in at the same time as your model changes. To do that,
 
 """
 import logging
+import re
+from string import Formatter
+
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.db import models, transaction
@@ -150,6 +153,9 @@ class Optout(models.Model):
 # the location where the email message body is to be inserted.
 COURSE_EMAIL_MESSAGE_BODY_TAG = '{{message_body}}'
 
+# The fields of an email's context which differ for each of its recipients
+RECIPIENT_CONTEXT_FIELDS = ('name', 'email', 'user_id')
+
 
 class CourseEmailTemplate(models.Model):
     """
@@ -228,6 +234,96 @@ class CourseEmailTemplate(models.Model):
         """
         return CourseEmailTemplate._render(self.html_template, htmltext, context)
 
+    def compile_plaintext(self, plaintext, context):
+        """
+        Create a CompiledEmailMessage rendering plain text messages for the recipients of an email.
+
+        `context` holds the values which are the same for all the recipients.
+        """
+        return CompiledEmailMessage(self.plain_template, plaintext, context)
+
+    def compile_htmltext(self, htmltext, context):
+        """
+        Create a CompiledEmailMessage rendering HTML text messages for the recipients of an email.
+
+        `context` holds the values which are the same for all the recipients.
+        """
+        return CompiledEmailMessage(self.html_template, htmltext, context)
+
+
+class CompiledEmailMessage(object):
+    """
+    An email message rendered once for all of its recipients, but for their RECIPIENT_CONTEXT_FIELDS
+    and the %%-encoded keywords of its body.
+
+    `render` returns the message CourseEmailTemplate._render would for the same context. Only the
+    lines of the message which hold recipient values are formatted and wrapped for each recipient.
+    """
+    def __init__(self, format_string, message_body, context):
+        self.format_string = format_string
+        self.message_body = message_body
+        self.message_body_tag = COURSE_EMAIL_MESSAGE_BODY_TAG.format()
+        # The placeholder of each recipient field used by the template
+        self.placeholders = {}
+        # (text, whether it holds recipient values, whether it holds the message body) for each line,
+        # or None if the template has to be formatted for each recipient.
+        self.lines = None
+
+        for field_name, format_spec, conversion in self._template_fields(format_string):
+            field = re.split(r'[.\[]', field_name, 1)[0]
+            if field not in RECIPIENT_CONTEXT_FIELDS:
+                continue
+            if field_name != field or format_spec or conversion:
+                # The recipient's value isn't inserted as is
+                return
+            self.placeholders[field] = u'\x00{}\x00'.format(field)
+
+        result = format_string.format(**dict(context, **self.placeholders))
+        body_has_keywords = '%%' in message_body
+        if not body_has_keywords:
+            result = result.replace(self.message_body_tag, message_body, 1)
+
+        self.lines = []
+        body_pending = body_has_keywords
+        for line in result.split('\n'):
+            has_body = body_pending and self.message_body_tag in line
+            body_pending = body_pending and not has_body
+            if has_body or u'\x00' in line:
+                self.lines.append((line, True, has_body))
+            else:
+                self.lines.append((wrap_message(line), False, False))
+
+    @staticmethod
+    def _template_fields(format_string):
+        """
+        The (field name, format spec, conversion) of the replacement fields of `format_string`.
+        """
+        for __, field_name, format_spec, conversion in Formatter().parse(format_string):
+            if field_name is not None:
+                yield field_name, format_spec, conversion
+
+    def render(self, context):
+        """
+        Render the message for the recipient whose values are in `context`.
+        """
+        if self.lines is None:
+            return CourseEmailTemplate._render(self.format_string, self.message_body, context)
+
+        values = [(placeholder, u'{}'.format(context[field])) for field, placeholder in self.placeholders.iteritems()]
+        rendered = []
+        for line, has_recipient_values, has_body in self.lines:
+            if has_recipient_values:
+                for placeholder, value in values:
+                    line = line.replace(placeholder, value)
+                if has_body:
+                    message_body = self.message_body
+                    if 'user_id' in context and 'course_id' in context:
+                        message_body = substitute_keywords_with_data(message_body, context)
+                    line = line.replace(self.message_body_tag, message_body, 1)
+                line = wrap_message(line)
+            rendered.append(line)
+        return u'\n'.join(rendered)
+
 
 class CourseAuthorization(models.Model):
     """
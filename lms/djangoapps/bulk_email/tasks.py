@@ -373,16 +373,17 @@ def _filter_optouts_from_recipients(to_list, course_id):
     Returns the filtered recipient list, as well as the number of optouts
     removed from the list.
     """
+    # Look up the ids of the users rather than their emails, which saves joining auth_user
     optouts = Optout.objects.filter(
         course_id=course_id,
         user__in=[i['pk'] for i in to_list]
-    ).values_list('user__email', flat=True)
+    ).values_list('user_id', flat=True)
     optouts = set(optouts)
     # Only count the num_optout for the first time the optouts are calculated.
     # We assume that the number will not change on retries, and so we don't need
     # to calculate it each time.
     num_optout = len(optouts)
-    to_list = [recipient for recipient in to_list if recipient['email'] not in optouts]
+    to_list = [recipient for recipient in to_list if recipient['pk'] not in optouts]
     return to_list, num_optout
 
 
@@ -489,6 +490,12 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
         # Define context values to use in all course emails:
         email_context = {'name': '', 'email': ''}
         email_context.update(global_email_context)
+        email_context['course_id'] = course_email.course_id
+
+        # Render the templates once, so that only the values of each recipient
+        # have to be substituted into them:
+        plaintext_message = course_email_template.compile_plaintext(course_email.text_message, email_context)
+        html_message = course_email_template.compile_htmltext(course_email.html_message, email_context)
 
         while to_list:
             # Update context with user-specific values from the user at the end of the list.
@@ -502,11 +509,10 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
             email_context['email'] = email
             email_context['name'] = current_recipient['profile__name']
             email_context['user_id'] = current_recipient['pk']
-            email_context['course_id'] = course_email.course_id
 
             # Construct message content using templates and context:
-            plaintext_msg = course_email_template.render_plaintext(course_email.text_message, email_context)
-            html_msg = course_email_template.render_htmltext(course_email.html_message, email_context)
+            plaintext_msg = plaintext_message.render(email_context)
+            html_msg = html_message.render(email_context)
 
             # Create email:
             email_msg = EmailMultiAlternatives(
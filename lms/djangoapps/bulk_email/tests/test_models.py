@@ -137,6 +137,39 @@ class CourseEmailTemplateTest(TestCase):
         context = self._get_sample_plain_context()
         template.render_plaintext("My new plain text.", context)
 
+    def test_compiled_messages_match_rendered_messages(self):
+        template = CourseEmailTemplate.get_template()
+        context = self._get_sample_html_context()
+        compiled_plaintext = template.compile_plaintext("My new plain text.", context)
+        compiled_htmltext = template.compile_htmltext("<p>My new html text.</p>", context)
+
+        for email in ('first@test.com', 'second@test.com'):
+            context['email'] = email
+            self.assertEqual(
+                compiled_plaintext.render(context), template.render_plaintext("My new plain text.", context)
+            )
+            self.assertEqual(
+                compiled_htmltext.render(context), template.render_htmltext("<p>My new html text.</p>", context)
+            )
+            self.assertIn(email, compiled_htmltext.render(context))
+
+    def test_compiled_message_substitutes_recipient_fields(self):
+        template = CourseEmailTemplate(
+            plain_template=u"Dear {name} ({email!r}),\n{{message_body}}\n" + u"word " * 300,
+            html_template=u"<p>Dear {name}</p>\n{{message_body}}\n<p>{platform_name}</p>",
+        )
+        context = self._get_sample_plain_context()
+        context.update({'name': 'Robot', 'user_id': 1, 'course_id': 'edX/Test/2014'})
+        message_body = "Welcome to %%COURSE_DISPLAY_NAME%%, %%USER_FULLNAME%%!"
+        compiled_plaintext = template.compile_plaintext(message_body, context)
+        compiled_htmltext = template.compile_htmltext(message_body, context)
+
+        for name in ('Robot', 'Other Robot'):
+            context['name'] = name
+            self.assertEqual(compiled_plaintext.render(context), template.render_plaintext(message_body, context))
+            self.assertEqual(compiled_htmltext.render(context), template.render_htmltext(message_body, context))
+            self.assertIn(u"Welcome to Bogus Course Title, {}!".format(name), compiled_htmltext.render(context))
+
 
 @attr('shard_1')
 class CourseAuthorizationTest(TestCase):
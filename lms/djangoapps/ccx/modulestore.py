@@ -146,6 +146,22 @@ class CCXModulestoreWrapper(object):
                 course_key, depth=depth, **kwargs
             ))
 
+    def get_courses_by_keys(self, course_keys, depth=0, **kwargs):
+        """See the docs for xmodule.modulestore.mixed.MixedModuleStore"""
+        course_keys = list(course_keys)
+        # ccx courses are looked up one by one so that each gets its own ccx keys restored
+        courses = self._modulestore.get_courses_by_keys(
+            [course_key for course_key in course_keys if not isinstance(course_key, CCXLocator)],
+            depth=depth,
+            **kwargs
+        )
+        for course_key in course_keys:
+            if isinstance(course_key, CCXLocator):
+                course = self.get_course(course_key, depth=depth, **kwargs)
+                if course is not None:
+                    courses[course_key] = course
+        return courses
+
     def has_course(self, course_id, ignore_case=False, **kwargs):
         """See the docs for xmodule.modulestore.mixed.MixedModuleStore"""
         with remove_ccx(course_id) as (course_id, restore):
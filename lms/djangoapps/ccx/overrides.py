@@ -10,12 +10,16 @@ from django.db import transaction, IntegrityError
 from courseware.field_overrides import FieldOverrideProvider  # pylint: disable=import-error
 from opaque_keys.edx.keys import CourseKey, UsageKey
 from ccx_keys.locator import CCXLocator, CCXBlockUsageLocator
+from request_cache.middleware import RequestCache
 
 from .models import CcxFieldOverride, CustomCourseForEdX
 
 
 log = logging.getLogger(__name__)
 
+CURRENT_CCX_KEY = "ccx.overrides.current_ccx"
+CCX_OVERRIDES_KEY = "ccx.overrides.ccx_overrides"
+
 
 class CustomCoursesForEdxOverrideProvider(FieldOverrideProvider):
     """
@@ -42,11 +46,16 @@ class CustomCoursesForEdxOverrideProvider(FieldOverrideProvider):
             msg = "Unable to get course id when calculating ccx overide for block type %r"
             log.error(msg, type(block))
         if course_key is not None:
-            ccx = get_current_ccx(course_key)
+            ccx = _get_current_ccx_for_request(course_key)
         if ccx:
             return get_override_for_ccx(ccx, block, name, default)
         return default
 
+    def prefetch(self, course_key):
+        ccx = _get_current_ccx_for_request(course_key)
+        if ccx:
+            _get_course_overrides_for_ccx(ccx)
+
     @classmethod
     def enabled_for(cls, course):
         """CCX field overrides are enabled per-course
@@ -72,6 +81,20 @@ def get_current_ccx(course_key):
     return CustomCourseForEdX.objects.get(pk=course_key.ccx)
 
 
+def _get_current_ccx_for_request(course_key):
+    """
+    Like `get_current_ccx`, but only queries the ccx once per request, rather
+    than on every field lookup.
+    """
+    cache = RequestCache.get_current_request_cache()
+    if cache is None:
+        return get_current_ccx(course_key)
+    key = (CURRENT_CCX_KEY, course_key)
+    if key not in cache:
+        cache[key] = get_current_ccx(course_key)
+    return cache[key]
+
+
 def get_override_for_ccx(ccx, block, name, default=None):
     """
     Gets the value of the overridden field for the `ccx`.  `block` and `name`
@@ -92,23 +115,65 @@ def _get_overrides_for_ccx(ccx, block):
     Returns a dictionary mapping field name to overriden value for any
     overrides set on this block for this CCX.
     """
-    overrides = {}
     # block as passed in may have a location specific to a CCX, we must strip
     # that for this query
     location = block.location
     if isinstance(block.location, CCXBlockUsageLocator):
         location = block.location.to_block_locator()
-    query = CcxFieldOverride.objects.filter(
-        ccx=ccx,
-        location=location
-    )
-    for override in query:
-        field = block.fields[override.field]
-        value = field.from_json(json.loads(override.value))
-        overrides[override.field] = value
+    course_overrides = _get_course_overrides_for_ccx(ccx)
+    if course_overrides is not None:
+        values = course_overrides.get(_block_key(location), {})
+    else:
+        query = CcxFieldOverride.objects.filter(
+            ccx=ccx,
+            location=location
+        )
+        values = dict((override.field, override.value) for override in query)
+    overrides = {}
+    for name, value in values.iteritems():
+        field = block.fields[name]
+        overrides[name] = field.from_json(json.loads(value))
     return overrides
 
 
+def _get_course_overrides_for_ccx(ccx):
+    """
+    Loads all of the overrides set for this CCX with one query, and keeps them
+    for the rest of the request.  Returns a dictionary mapping block keys (see
+    `_block_key`) to dictionaries of serialized override values keyed by field
+    name, or None if no request is being served.
+    """
+    cache = RequestCache.get_current_request_cache()
+    if cache is None:
+        return None
+    key = (CCX_OVERRIDES_KEY, ccx.id)
+    course_overrides = cache.get(key)
+    if course_overrides is None:
+        course_overrides = {}
+        for override in CcxFieldOverride.objects.filter(ccx=ccx):
+            block_overrides = course_overrides.setdefault(_block_key(override.location), {})
+            block_overrides[override.field] = override.value
+        cache[key] = course_overrides
+    return course_overrides
+
+
+def _clear_course_overrides_for_ccx(ccx):
+    """
+    Drops the overrides loaded by `_get_course_overrides_for_ccx`, after they
+    have been changed.
+    """
+    cache = RequestCache.get_current_request_cache()
+    if cache is not None:
+        cache.pop((CCX_OVERRIDES_KEY, ccx.id), None)
+
+
+def _block_key(location):
+    """
+    Identifies a block within its course, whichever flavour of location it has.
+    """
+    return location.block_type, location.block_id
+
+
 @transaction.commit_on_success
 def override_field_for_ccx(ccx, block, name, value):
     """
@@ -132,6 +197,7 @@ def override_field_for_ccx(ccx, block, name, value):
             field=name)
         override.value = value
     override.save()
+    _clear_course_overrides_for_ccx(ccx)
     if hasattr(block, '_ccx_overrides'):
         del block._ccx_overrides[ccx.id]  # pylint: disable=protected-access
 
@@ -149,6 +215,7 @@ def clear_override_for_ccx(ccx, block, name):
             location=block.location,
             field=name).delete()
 
+        _clear_course_overrides_for_ccx(ccx)
         if hasattr(block, '_ccx_overrides'):
             del block._ccx_overrides[ccx.id]  # pylint: disable=protected-access
 
@@ -10,6 +10,7 @@ from nose.plugins.attrib import attr
 from courseware.field_overrides import OverrideFieldData  # pylint: disable=import-error
 from django.test.utils import override_settings
 from student.tests.factories import AdminFactory  # pylint: disable=import-error
+from util.testing import RequestCacheTestMixin  # pylint: disable=import-error
 from xmodule.modulestore.tests.django_utils import (
     ModuleStoreTestCase,
     TEST_DATA_SPLIT_MODULESTORE)
@@ -24,7 +25,7 @@ from .test_views import flatten, iter_blocks
 @attr('shard_1')
 @override_settings(FIELD_OVERRIDE_PROVIDERS=(
     'ccx.overrides.CustomCoursesForEdxOverrideProvider',))
-class TestFieldOverrides(ModuleStoreTestCase):
+class TestFieldOverrides(RequestCacheTestMixin, ModuleStoreTestCase):
     """
     Make sure field overrides behave in the expected manner.
     """
@@ -113,6 +114,34 @@ class TestFieldOverrides(ModuleStoreTestCase):
             dummy2 = chapter.start
             dummy3 = chapter.start
 
+    def test_overrides_loaded_once_per_request(self):
+        """
+        Test that while serving a request, the overrides of all blocks are
+        loaded with a single query.
+        """
+        ccx_start = datetime.datetime(2014, 12, 25, 00, 00, tzinfo=pytz.UTC)
+        chapters = self.ccx.course.get_children()
+        for chapter in chapters:
+            override_field_for_ccx(self.ccx, chapter, 'start', ccx_start)
+
+        self.start_request()
+        with self.assertNumQueries(1):
+            for chapter in chapters:
+                self.assertEquals(chapter.start, ccx_start)
+
+    def test_request_overrides_updated(self):
+        """
+        Test that overrides loaded for the request are reloaded after one is
+        changed.
+        """
+        self.start_request()
+        chapters = self.ccx.course.get_children()
+        self.assertEquals(chapters[0].start, self.mooc_start)
+
+        ccx_start = datetime.datetime(2014, 12, 25, 00, 00, tzinfo=pytz.UTC)
+        override_field_for_ccx(self.ccx, chapters[1], 'start', ccx_start)
+        self.assertEquals(chapters[1].start, ccx_start)
+
     def test_override_is_inherited(self):
         """
         Test that sequentials inherit overridden start date from chapter.
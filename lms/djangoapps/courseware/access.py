@@ -32,12 +32,14 @@ from xmodule.partitions.partitions import NoSuchUserPartitionError, NoSuchUserPa
 from xmodule.util.django import get_current_request_hostname
 
 from external_auth.models import ExternalAuthMap
-from courseware.masquerade import get_masquerade_role, is_masquerading_as_student
+from courseware.field_overrides import overrides_disabled
+from courseware.masquerade import get_course_masquerade, get_masquerade_role, is_masquerading_as_student
+from request_cache.middleware import RequestCache
 from student import auth
 from student.models import CourseEnrollmentAllowed
 from student.roles import (
     GlobalStaff, CourseStaffRole, CourseInstructorRole,
-    OrgStaffRole, OrgInstructorRole, CourseBetaTesterRole
+    OrgStaffRole, OrgInstructorRole, CourseBetaTesterRole, get_role_cache
 )
 from util.milestones_helpers import (
     get_pre_requisite_courses_not_completed,
@@ -49,6 +51,8 @@ import dogstats_wrapper as dog_stats_api
 
 DEBUG_ACCESS = False
 
+HAS_ACCESS_CACHE_KEY = "courseware.access.has_access"
+
 log = logging.getLogger(__name__)
 
 
@@ -108,7 +112,7 @@ def has_access(user, action, obj, course_key=None):
 
     # NOTE: any descriptor access checkers need to go above this
     if isinstance(obj, XBlock):
-        return _has_access_descriptor(user, action, obj, course_key)
+        return _has_access_descriptor_cached(user, action, obj, course_key)
 
     if isinstance(obj, CCXLocator):
         return _has_access_ccx_key(user, action, obj)
@@ -450,6 +454,28 @@ def _has_access_descriptor(user, action, descriptor, course_key=None):
     return _dispatch(checkers, action, user, descriptor)
 
 
+def _has_access_descriptor_cached(user, action, descriptor, course_key):
+    """
+    Returns the result of _has_access_descriptor, remembering it for the rest of
+    the request so that blocks whose access is checked several times (by the
+    course navigation, module rendering, etc) are only checked once.
+
+    Results are keyed by the user's RoleCache, so they are computed again once
+    the user's roles have changed.
+    """
+    request_cache = RequestCache.get_current_request_cache()
+    if request_cache is None or not (user.is_authenticated() and user.is_active):
+        return _has_access_descriptor(user, action, descriptor, course_key)
+
+    key = (
+        HAS_ACCESS_CACHE_KEY, get_role_cache(user), action, descriptor.location, course_key,
+        get_course_masquerade(user, course_key), overrides_disabled(),
+    )
+    if key not in request_cache:
+        request_cache[key] = _has_access_descriptor(user, action, descriptor, course_key)
+    return request_cache[key]
+
+
 def _has_access_xmodule(user, action, xmodule, course_key):
     """
     Check if user has access to this xmodule.
@@ -25,6 +25,7 @@ from xmodule.modulestore.inheritance import InheritanceMixin
 
 NOTSET = object()
 ENABLED_OVERRIDE_PROVIDERS_KEY = "courseware.field_overrides.enabled_providers"
+PREFETCHED_OVERRIDES_KEY = "courseware.field_overrides.prefetched"
 
 
 def resolve_dotted(name):
@@ -83,7 +84,9 @@ class OverrideFieldData(FieldData):
             # to check for instance.providers after the instance is built. This
             # would allow for the case where we have registered providers but
             # none are enabled for the provided course
-            return cls(user, wrapped, enabled_providers)
+            field_data = cls(user, wrapped, enabled_providers)
+            field_data.prefetch(user, course.id)
+            return field_data
 
         return wrapped
 
@@ -113,6 +116,21 @@ class OverrideFieldData(FieldData):
         self.fallback = fallback
         self.providers = tuple(provider(user) for provider in providers)
 
+    def prefetch(self, user, course_key):
+        """
+        Gives each provider a chance to load all of its overrides for the
+        course identified by `course_key` at once, rather than block by block.
+        This is done at most once per user and course for each request.
+        """
+        cache = RequestCache.get_current_request_cache()
+        if cache is None:
+            return
+        key = (PREFETCHED_OVERRIDES_KEY, getattr(user, 'id', None), course_key)
+        if key not in cache:
+            for provider in self.providers:
+                provider.prefetch(course_key)
+            cache[key] = True
+
     def get_override(self, block, name):
         """
         Checks for an override for the field identified by `name` in `block`.
@@ -235,6 +253,16 @@ class FieldOverrideProvider(object):
         """
         return False
 
+    def prefetch(self, course_key):
+        """
+        Load all of the overrides this provider has for the course identified
+        by `course_key`, ideally in a single query, so that lookups for the
+        individual blocks of the course don't each need to go to the database.
+        Only called while a request is being served, so the overrides may be
+        kept in the request cache.  Does nothing by default.
+        """
+        pass
+
 
 def _lineage(block):
     """
@@ -1,14 +1,17 @@
 # Compute grades using real division, with no integer truncation
 from __future__ import division
 from collections import defaultdict
+import hashlib
+import itertools
 import json
 import random
 import logging
 
 from contextlib import contextmanager
 from django.conf import settings
-from django.db import transaction
+from django.db import transaction, DatabaseError
 from django.test.client import RequestFactory
+from django.utils import timezone
 
 import dogstats_wrapper as dog_stats_api
 
@@ -20,15 +23,19 @@ from xmodule import graders
 from xmodule.graders import Score
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.exceptions import ItemNotFoundError
-from .models import StudentModule
+from .models import StudentModule, PersistentCourseGrade
 from .module_render import get_module_for_descriptor
 from submissions import api as sub_api  # installed from the edx-submissions repository
 from opaque_keys import InvalidKeyError
-from opaque_keys.edx.keys import CourseKey
+from opaque_keys.edx.keys import CourseKey, UsageKey
 
 
 log = logging.getLogger("edx.courseware")
 
+# Number of students whose StudentModule scores are loaded with a single
+# query by iterate_grades_for.
+GRADES_STUDENT_CHUNK_SIZE = 100
+
 
 def answer_distributions(course_key):
     """
@@ -122,16 +129,16 @@ def answer_distributions(course_key):
 
 
 @transaction.commit_manually
-def grade(student, request, course, keep_raw_scores=False):
+def grade(student, request, course, keep_raw_scores=False, student_module_scores=None, scores_read_at=None):
     """
     Wraps "_grade" with the manual_transaction context manager just in case
     there are unanticipated errors.
     """
     with manual_transaction():
-        return _grade(student, request, course, keep_raw_scores)
+        return _grade(student, request, course, keep_raw_scores, student_module_scores, scores_read_at)
 
 
-def _grade(student, request, course, keep_raw_scores):
+def _grade(student, request, course, keep_raw_scores, student_module_scores=None, scores_read_at=None):
     """
     Unwrapped version of "grade"
 
@@ -149,11 +156,29 @@ def _grade(student, request, course, keep_raw_scores):
       make up the final grade. (For display)
     - keep_raw_scores : if True, then value for key 'raw_scores' contains scores
       for every graded module
+    - student_module_scores : optional dict of usage keys -> (grade, max_grade)
+      tuples for every StudentModule the student has in this course, as
+      returned by `student_module_scores_for`. If given, it is used instead
+      of querying StudentModule for each section and problem.
+    - scores_read_at : when `student_module_scores` were read. Persisted
+      section scores are only updated if they didn't change since then.
 
     More information on the format is in the docstring for CourseGrader.
     """
     grading_context = course.grading_context
     raw_scores = []
+    if scores_read_at is None:
+        scores_read_at = timezone.now()
+
+    # Section scores persisted by previous grading runs, and the ones computed
+    # by this run that should be persisted for the next one.
+    course_version = _persistent_grade_version(course, student)
+    if course_version is not None:
+        with manual_transaction():
+            persisted_sections = PersistentCourseGrade.get_sections(student, course.id, course_version)
+    else:
+        persisted_sections = {}
+    sections_to_persist = {}
 
     # Dict of item_ids -> (earned, possible) point tuples. This *only* grabs
     # scores that were registered with the submissions API, which for the moment
@@ -170,13 +195,25 @@ def _grade(student, request, course, keep_raw_scores):
         for section in sections:
             section_descriptor = section['section_descriptor']
             section_name = section_descriptor.display_name_with_default
+            section_key = unicode(section_descriptor.location)
 
             # some problems have state that is updated independently of interaction
             # with the LMS, so they need to always be scored. (E.g. foldit.,
             # combinedopenended)
-            should_grade_section = any(
+            always_recalculate = any(
                 descriptor.always_recalculate_grades for descriptor in section['xmoduledescriptors']
             )
+            should_grade_section = always_recalculate
+
+            # If none of the scores in this section changed since it was last
+            # graded, reuse the persisted result instead of grading it again.
+            if not always_recalculate and section_key in persisted_sections:
+                scores, graded_total = _section_scores_from_json(persisted_sections[section_key])
+                if keep_raw_scores:
+                    raw_scores += scores
+                if graded_total.possible > 0:
+                    format_scores.append(graded_total)
+                continue
 
             # If there are no problems that always have to be regraded, check to
             # see if any of our locations are in the scores from the submissions
@@ -187,7 +224,12 @@ def _grade(student, request, course, keep_raw_scores):
                     for descriptor in section['xmoduledescriptors']
                 )
 
-            if not should_grade_section:
+            if not should_grade_section and student_module_scores is not None:
+                should_grade_section = any(
+                    descriptor.location in student_module_scores
+                    for descriptor in section['xmoduledescriptors']
+                )
+            elif not should_grade_section:
                 with manual_transaction():
                     should_grade_section = StudentModule.objects.filter(
                         student=student,
@@ -216,7 +258,12 @@ def _grade(student, request, course, keep_raw_scores):
                 ):
 
                     (correct, total) = get_score(
-                        course.id, student, module_descriptor, create_module, scores_cache=submissions_scores
+                        course.id,
+                        student,
+                        module_descriptor,
+                        create_module,
+                        scores_cache=submissions_scores,
+                        student_module_scores=student_module_scores,
                     )
                     if correct is None and total is None:
                         continue
@@ -246,8 +293,12 @@ def _grade(student, request, course, keep_raw_scores):
                 if keep_raw_scores:
                     raw_scores += scores
             else:
+                scores = []
                 graded_total = Score(0.0, 1.0, True, section_name, None)
 
+            if course_version is not None and not always_recalculate:
+                sections_to_persist[section_key] = _section_scores_to_json(section, scores, graded_total)
+
             #Add the graded total to totaled_scores
             if graded_total.possible > 0:
                 format_scores.append(graded_total)
@@ -259,6 +310,17 @@ def _grade(student, request, course, keep_raw_scores):
 
         totaled_scores[section_format] = format_scores
 
+    if sections_to_persist:
+        try:
+            with manual_transaction():
+                PersistentCourseGrade.update_sections(
+                    student, course.id, course_version, sections_to_persist, scores_read_at
+                )
+        except DatabaseError:
+            # Persisting is only an optimization, which shouldn't fail grading
+            # (e.g. when waiting for the record's lock times out).
+            log.warning(u"Unable to persist section grades for user %s in course %s", student.id, course.id)
+
     # Grading policy might be overriden by a CCX, need to reset it
     course.set_grading_policy(course.grading_policy)
     grade_summary = course.grader.grade(totaled_scores, generate_random_scores=settings.GENERATE_PROFILE_SCORES)
@@ -277,6 +339,67 @@ def _grade(student, request, course, keep_raw_scores):
     return grade_summary
 
 
+def _persistent_grade_version(course, student):
+    """
+    Returns a string identifying the version of `course` that persisted section
+    grades are valid for, or None if grades for this course shouldn't be
+    persisted.
+
+    Which problems `student` is graded on also depends on their group in each
+    of the course's user partitions (e.g. their cohort's content group), so
+    these groups are part of the version too.
+    """
+    if not settings.FEATURES.get('ENABLE_PERSISTENT_GRADES', False) or settings.GENERATE_PROFILE_SCORES:
+        return None
+    try:
+        edited_on = course.subtree_edited_on
+    except AttributeError:
+        # Not all modulestores track edit info (e.g. XML courses)
+        return None
+    if edited_on is None:
+        return None
+    if not course.user_partitions:
+        return unicode(edited_on)
+    groups = []
+    for partition in course.user_partitions:
+        group = partition.scheme.get_group_for_user(course.id, student, partition)
+        groups.append([partition.id, group.id if group is not None else None])
+    return u'{} {}'.format(edited_on, hashlib.sha1(json.dumps(groups)).hexdigest())
+
+
+def _section_scores_to_json(section, scores, graded_total):
+    """
+    Serializes the grading results of a section so that they can be persisted
+    by PersistentCourseGrade.
+    """
+    def _score_to_json(score):
+        """Converts a Score into a JSON-serializable list"""
+        module_id = unicode(score.module_id) if score.module_id is not None else None
+        return [score.earned, score.possible, score.graded, score.section, module_id]
+
+    locations = set(unicode(descriptor.location) for descriptor in section['xmoduledescriptors'])
+    locations.update(unicode(score.module_id) for score in scores if score.module_id is not None)
+    return {
+        'locations': sorted(locations),
+        'scores': [_score_to_json(score) for score in scores],
+        'graded_total': _score_to_json(graded_total),
+    }
+
+
+def _section_scores_from_json(section_json):
+    """
+    Inverse of _section_scores_to_json. Returns a tuple of (scores, graded_total).
+    """
+    def _score_from_json(score_json):
+        """Converts a list created by _section_scores_to_json back into a Score"""
+        earned, possible, graded, section_name, module_id = score_json
+        module_id = UsageKey.from_string(module_id) if module_id is not None else None
+        return Score(earned, possible, graded, section_name, module_id)
+
+    scores = [_score_from_json(score_json) for score_json in section_json['scores']]
+    return scores, _score_from_json(section_json['graded_total'])
+
+
 def grade_for_percentage(grade_cutoffs, percentage):
     """
     Returns a letter grade as defined in grading_policy (e.g. 'A' 'B' 'C' for 6.002x) or None.
@@ -415,7 +538,7 @@ def _progress_summary(student, request, course):
     return chapters
 
 
-def get_score(course_id, user, problem_descriptor, module_creator, scores_cache=None):
+def get_score(course_id, user, problem_descriptor, module_creator, scores_cache=None, student_module_scores=None):
     """
     Return the score for a user on a problem, as a tuple (correct, total).
     e.g. (5,7) if you got 5 out of 7 points.
@@ -429,6 +552,9 @@ def get_score(course_id, user, problem_descriptor, module_creator, scores_cache=
            Can return None if user doesn't have access, or if something else went wrong.
     scores_cache: A dict of location names to (earned, possible) point tuples.
            If an entry is found in this cache, it takes precedence.
+    student_module_scores: A dict of usage keys to (grade, max_grade) tuples
+           for every StudentModule of the user in this course. If given, it is
+           used instead of querying StudentModule.
     """
     scores_cache = scores_cache or {}
 
@@ -455,18 +581,22 @@ def get_score(course_id, user, problem_descriptor, module_creator, scores_cache=
         # These are not problems, and do not have a score
         return (None, None)
 
-    try:
-        student_module = StudentModule.objects.get(
-            student=user,
-            course_id=course_id,
-            module_state_key=problem_descriptor.location
-        )
-    except StudentModule.DoesNotExist:
-        student_module = None
+    if student_module_scores is not None:
+        stored_grade, stored_max_grade = student_module_scores.get(problem_descriptor.location, (None, None))
+    else:
+        try:
+            student_module = StudentModule.objects.get(
+                student=user,
+                course_id=course_id,
+                module_state_key=problem_descriptor.location
+            )
+            stored_grade, stored_max_grade = student_module.grade, student_module.max_grade
+        except StudentModule.DoesNotExist:
+            stored_grade, stored_max_grade = None, None
 
-    if student_module is not None and student_module.max_grade is not None:
-        correct = student_module.grade if student_module.grade is not None else 0
-        total = student_module.max_grade
+    if stored_max_grade is not None:
+        correct = stored_grade if stored_grade is not None else 0
+        total = stored_max_grade
     else:
         # If the problem was not in the cache, or hasn't been graded yet,
         # we need to instantiate the problem.
@@ -487,7 +617,7 @@ def get_score(course_id, user, problem_descriptor, module_creator, scores_cache=
     weight = problem_descriptor.weight
     if weight is not None:
         if total == 0:
-            log.exception("Cannot reweight a problem with zero total points. Problem: " + str(student_module))
+            log.exception(u"Cannot reweight a problem with zero total points. Problem: %s", problem_descriptor.location)
             return (correct, total)
         correct = correct * weight / total
         total = weight
@@ -508,6 +638,36 @@ def manual_transaction():
         transaction.commit()
 
 
+def student_module_scores_for(course_key, student_ids):
+    """
+    Returns a dict mapping each of `student_ids` to a dict of usage keys ->
+    (grade, max_grade) tuples for all of that student's StudentModules in
+    the course, loaded with a single query.
+    """
+    scores = dict((student_id, {}) for student_id in student_ids)
+    student_modules = StudentModule.objects.filter(
+        course_id=course_key,
+        student_id__in=student_ids,
+    ).defer('state')
+    for student_module in student_modules:
+        usage_key = student_module.module_state_key.map_into_course(course_key)
+        scores[student_module.student_id][usage_key] = (student_module.grade, student_module.max_grade)
+    return scores
+
+
+def _chunked(iterable, chunk_size):
+    """
+    Yields lists of up to `chunk_size` items from `iterable` without
+    materializing the whole iterable.
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
 def iterate_grades_for(course_or_id, students, keep_raw_scores=False):
     """Given a course_id and an iterable of students (User), yield a tuple of:
 
@@ -536,25 +696,35 @@ def iterate_grades_for(course_or_id, students, keep_raw_scores=False):
     # grading that student.
     request = RequestFactory().get('/')
 
-    for student in students:
-        with dog_stats_api.timer('lms.grades.iterate_grades_for', tags=[u'action:{}'.format(course.id)]):
-            try:
-                request.user = student
-                # Grading calls problem rendering, which calls masquerading,
-                # which checks session vars -- thus the empty session dict below.
-                # It's not pretty, but untangling that is currently beyond the
-                # scope of this feature.
-                request.session = {}
-                gradeset = grade(student, request, course, keep_raw_scores)
-                yield student, gradeset, ""
-            except Exception as exc:  # pylint: disable=broad-except
-                # Keep marching on even if this student couldn't be graded for
-                # some reason, but log it for future reference.
-                log.exception(
-                    'Cannot grade student %s (%s) in course %s because of exception: %s',
-                    student.username,
-                    student.id,
-                    course.id,
-                    exc.message
-                )
-                yield student, {}, exc.message
+    # Load the StudentModule scores for a whole chunk of students at once,
+    # rather than querying per student, section and problem.
+    for student_chunk in _chunked(students, GRADES_STUDENT_CHUNK_SIZE):
+        scores_read_at = timezone.now()
+        with manual_transaction():
+            chunk_scores = student_module_scores_for(course.id, [student.id for student in student_chunk])
+
+        for student in student_chunk:
+            with dog_stats_api.timer('lms.grades.iterate_grades_for', tags=[u'action:{}'.format(course.id)]):
+                try:
+                    request.user = student
+                    # Grading calls problem rendering, which calls masquerading,
+                    # which checks session vars -- thus the empty session dict below.
+                    # It's not pretty, but untangling that is currently beyond the
+                    # scope of this feature.
+                    request.session = {}
+                    gradeset = grade(
+                        student, request, course, keep_raw_scores,
+                        student_module_scores=chunk_scores[student.id], scores_read_at=scores_read_at
+                    )
+                    yield student, gradeset, ""
+                except Exception as exc:  # pylint: disable=broad-except
+                    # Keep marching on even if this student couldn't be graded for
+                    # some reason, but log it for future reference.
+                    log.exception(
+                        'Cannot grade student %s (%s) in course %s because of exception: %s',
+                        student.username,
+                        student.id,
+                        course.id,
+                        exc.message
+                    )
+                    yield student, {}, exc.message
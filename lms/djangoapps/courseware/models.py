@@ -12,16 +12,19 @@ file and check it in at the same time as your model changes. To do that,
 ASSUMPTIONS: modules have unique IDs, even across different module_types
 
 """
+import json
 import logging
 import itertools
 
 from django.contrib.auth.models import User
 from django.conf import settings
-from django.db import models
-from django.db.models.signals import post_save
+from django.db import models, IntegrityError
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver, Signal
 
 from model_utils.models import TimeStampedModel
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
 from student.models import user_by_anonymous_id
 from submissions.models import score_set, score_reset
 
@@ -293,6 +296,127 @@ class StudentFieldOverride(TimeStampedModel):
     value = models.TextField(default='null')
 
 
+
+class PersistentCourseGrade(TimeStampedModel):
+    """
+    Persisted per-section grading results for a given user and course.
+
+    `courseware.grades` stores the scores it computes for each graded section
+    here, keyed by the section's location, so that the next grading run only
+    recomputes sections whose scores have changed. Sections are discarded
+    whenever a score for one of the locations they contain changes, and the
+    whole record is ignored once the course content has been edited, or once
+    the user has moved to another group of one of the course's user
+    partitions (both tracked by `course_version`).
+    """
+    user = models.ForeignKey(User, db_index=True)
+    course_id = CourseKeyField(max_length=255, db_index=True)
+
+    # Identifies the version of the course content these sections were
+    # graded against.
+    course_version = models.CharField(max_length=255, blank=True)
+
+    # JSON dict of section location -> {'locations': [...], 'scores': [...], 'graded_total': [...]}
+    section_scores = models.TextField(default='{}')
+
+    class Meta(object):  # pylint: disable=missing-docstring
+        unique_together = (('user', 'course_id'),)
+
+    @property
+    def sections(self):
+        """
+        Returns the deserialized dict of section scores.
+        """
+        return json.loads(self.section_scores) if self.section_scores else {}
+
+    @sections.setter
+    def sections(self, value):  # pylint: disable=missing-docstring
+        self.section_scores = json.dumps(value)
+
+    @classmethod
+    def get_sections(cls, user, course_id, course_version):
+        """
+        Returns the persisted section scores for `user` in `course_id`, or an
+        empty dict if there are none or if they were computed against a
+        different version of the course.
+        """
+        try:
+            record = cls.objects.get(user=user, course_id=course_id)
+        except cls.DoesNotExist:
+            return {}
+        if record.course_version != course_version:
+            return {}
+        return record.sections
+
+    @classmethod
+    def _locked_record(cls, user_id, course_id):
+        """
+        Returns a tuple of (record, created) for `user_id` in `course_id`,
+        creating the record if there is none. The record is locked until the
+        end of the current transaction.
+        """
+        records = cls.objects.select_for_update()
+        try:
+            return records.get_or_create(user_id=user_id, course_id=course_id)
+        except IntegrityError:
+            # Another transaction created the record at the same time; the
+            # locking read waits for it to commit, and then sees it.
+            return records.get(user_id=user_id, course_id=course_id), False
+
+    @classmethod
+    def update_sections(cls, user, course_id, course_version, sections, scores_read_at):
+        """
+        Merges `sections` into the persisted section scores for `user` in
+        `course_id`, discarding any sections graded against an older version
+        of the course.
+
+        `sections` were graded from scores read at `scores_read_at`. If the
+        record changed since then (e.g. a score changed and invalidated it),
+        they may be stale, so nothing is persisted and False is returned.
+        """
+        record, created = cls._locked_record(user.id, course_id)
+        # Some databases (e.g. MySQL) store `modified` without its microseconds
+        if not created and record.modified >= scores_read_at.replace(microsecond=0):
+            return False
+        if record.course_version != course_version:
+            merged = {}
+        else:
+            merged = record.sections
+        merged.update(sections)
+        record.course_version = course_version
+        record.sections = merged
+        record.save()
+        return True
+
+    @classmethod
+    def invalidate(cls, user_id, course_id, usage_id=None):
+        """
+        Discards the persisted sections for `user_id` in `course_id` that
+        contain `usage_id`. If `usage_id` is None or isn't part of any
+        persisted section, all of the user's sections for the course are
+        discarded.
+
+        The record is saved (and created if there is none) even if there is
+        nothing to discard, so that grading runs which read the scores before
+        this invalidation don't persist their results (see `update_sections`).
+        """
+        record, __ = cls._locked_record(user_id, course_id)
+
+        sections = record.sections
+        remaining = {
+            section_key: section for section_key, section in sections.iteritems()
+            if usage_id is not None and usage_id not in section['locations']
+        }
+        if usage_id is not None and len(remaining) == len(sections):
+            remaining = {}
+
+        record.sections = remaining
+        record.save()
+
+    def __unicode__(self):
+        return u"[PersistentCourseGrade] {}: {} ({})".format(self.user, self.course_id, self.course_version)
+
+
 # Signal that indicates that a user's score for a problem has been updated.
 # This signal is generated when a scoring event occurs either within the core
 # platform or in the Submissions module. Note that this signal will be triggered
@@ -389,3 +513,35 @@ def submissions_score_reset_handler(sender, **kwargs):  # pylint: disable=unused
             u"Failed to process score_reset signal from Submissions API. "
             "user: %s, course_id: %s, usage_id: %s", user, course_id, usage_id
         )
+
+
+@receiver(SCORE_CHANGED)
+def invalidate_persistent_grade_handler(sender, **kwargs):  # pylint: disable=unused-argument
+    """
+    Consume the SCORE_CHANGED signal and discard any persisted section grades
+    that depend on the changed score, so that they are recomputed the next
+    time the user is graded.
+    """
+    if not settings.FEATURES.get('ENABLE_PERSISTENT_GRADES', False):
+        return
+    try:
+        course_key = CourseKey.from_string(kwargs['course_id'])
+    except (KeyError, InvalidKeyError):
+        log.exception(u"Failed to invalidate persistent grades for course_id: %s", kwargs.get('course_id'))
+        return
+    PersistentCourseGrade.invalidate(kwargs.get('user_id'), course_key, kwargs.get('usage_id'))
+
+
+@receiver(post_delete, sender=StudentModule)
+def invalidate_persistent_grade_on_delete(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Discard persisted section grades when a StudentModule is deleted, e.g.
+    when an instructor resets a student's state for a problem.
+    """
+    if not settings.FEATURES.get('ENABLE_PERSISTENT_GRADES', False):
+        return
+    PersistentCourseGrade.invalidate(
+        instance.student_id,
+        instance.course_id,
+        unicode(instance.module_state_key.map_into_course(instance.course_id))
+    )
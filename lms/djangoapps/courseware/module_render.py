@@ -26,9 +26,10 @@ from django.views.decorators.csrf import csrf_exempt
 
 import newrelic.agent
 
+from capa.safe_exec import LocalCache
 from capa.xqueue_interface import XQueueInterface
 from courseware.access import has_access, get_user_role
-from courseware.masquerade import setup_masquerade
+from courseware.masquerade import get_course_masquerade, setup_masquerade
 from courseware.model_data import FieldDataCache, DjangoKeyValueStore
 from courseware.models import SCORE_CHANGED
 from courseware.entrance_exams import (
@@ -53,7 +54,7 @@ from openedx.core.lib.xblock_utils import (
 )
 from psychometrics.psychoanalyze import make_psychometrics_data_update_handler
 from student.models import anonymous_id_for_user, user_by_anonymous_id
-from student.roles import CourseBetaTesterRole
+from student.roles import CourseBetaTesterRole, get_role_cache
 from xblock.core import XBlock
 from xblock.django.request import django_to_webob_request, webob_to_django_response
 from xblock_django.user_service import DjangoXBlockUserService
@@ -68,6 +69,7 @@ from xmodule.lti_module import LTIModule
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.x_module import XModuleDescriptor
 from xmodule.mixin import wrap_with_license
+from xmodule.split_test_module import get_split_user_partitions
 from util.json_request import JsonResponse
 from util.sandboxing import can_execute_unsafe_code, get_python_lib_zip
 from util import milestones_helpers
@@ -89,6 +91,12 @@ XQUEUE_INTERFACE = XQueueInterface(
     REQUESTS_AUTH,
 )
 
+# Results of capa's safe_exec can be kept in process, in front of the django cache
+if settings.SAFE_EXEC_LOCAL_CACHE_SIZE:
+    SAFE_EXEC_CACHE = LocalCache(cache, settings.SAFE_EXEC_LOCAL_CACHE_SIZE)
+else:
+    SAFE_EXEC_CACHE = cache
+
 # TODO: course_id and course_key are used interchangeably in this file, which is wrong.
 # Some brave person should make the variable names consistently someday, but the code's
 # coupled enough that it's kind of tricky--you've been warned!
@@ -135,58 +143,117 @@ def toc_for_course(request, course, active_chapter, active_section, field_data_c
     None if this is not the case.
 
     field_data_cache must include data from the course module and 2 levels of its descendents
+
+    If the COURSEWARE_TOC_CACHE_TIMEOUT setting is set, the table of contents of
+    each user is cached for that many seconds (and until the course is published
+    again, for modulestores which track course versions, or the user's roles or
+    groups change).
     '''
 
-    with modulestore().bulk_operations(course.id):
-        course_module = get_module_for_descriptor(
-            request.user, request, course, field_data_cache, course.id, course=course
+    # See if the course is gated by one or more content milestones
+    required_content = milestones_helpers.get_required_content(course, request.user)
+
+    # The user may not actually have to complete the entrance exam, if one is required
+    if not user_must_complete_entrance_exam(request, request.user, course):
+        required_content = [content for content in required_content if not content == course.entrance_exam_id]
+
+    cache_key = _toc_cache_key(request, course, required_content)
+    toc_chapters = cache.get(cache_key) if cache_key else None
+    if toc_chapters is None:
+        with modulestore().bulk_operations(course.id):
+            course_module = get_module_for_descriptor(
+                request.user, request, course, field_data_cache, course.id, course=course
+            )
+            if course_module is None:
+                return None
+
+            toc_chapters = _toc_chapters(course_module, required_content)
+        if cache_key:
+            cache.set(cache_key, toc_chapters, settings.COURSEWARE_TOC_CACHE_TIMEOUT)
+
+    return [
+        dict(
+            chapter,
+            sections=[
+                dict(
+                    section,
+                    active=chapter['url_name'] == active_chapter and section['url_name'] == active_section
+                )
+                for section in chapter['sections']
+            ],
+            active=chapter['url_name'] == active_chapter
         )
-        if course_module is None:
-            return None
+        for chapter in toc_chapters
+    ]
+
 
-        toc_chapters = list()
-        chapters = course_module.get_display_items()
-
-        # See if the course is gated by one or more content milestones
-        required_content = milestones_helpers.get_required_content(course, request.user)
-
-        # The user may not actually have to complete the entrance exam, if one is required
-        if not user_must_complete_entrance_exam(request, request.user, course):
-            required_content = [content for content in required_content if not content == course.entrance_exam_id]
-
-        for chapter in chapters:
-            # Only show required content, if there is required content
-            # chapter.hide_from_toc is read-only (boo)
-            local_hide_from_toc = False
-            if required_content:
-                if unicode(chapter.location) not in required_content:
-                    local_hide_from_toc = True
-
-            # Skip the current chapter if a hide flag is tripped
-            if chapter.hide_from_toc or local_hide_from_toc:
-                continue
-
-            sections = list()
-            for section in chapter.get_display_items():
-
-                active = (chapter.url_name == active_chapter and
-                          section.url_name == active_section)
-
-                if not section.hide_from_toc:
-                    sections.append({'display_name': section.display_name_with_default,
-                                     'url_name': section.url_name,
-                                     'format': section.format if section.format is not None else '',
-                                     'due': section.due,
-                                     'active': active,
-                                     'graded': section.graded,
-                                     })
-            toc_chapters.append({
-                'display_name': chapter.display_name_with_default,
-                'url_name': chapter.url_name,
-                'sections': sections,
-                'active': chapter.url_name == active_chapter
-            })
-        return toc_chapters
+def _toc_chapters(course_module, required_content):
+    """
+    Returns the table of contents of `course_module`, without the active flags
+    (see toc_for_course).
+    """
+    toc_chapters = list()
+    for chapter in course_module.get_display_items():
+        # Only show required content, if there is required content
+        # chapter.hide_from_toc is read-only (boo)
+        local_hide_from_toc = False
+        if required_content:
+            if unicode(chapter.location) not in required_content:
+                local_hide_from_toc = True
+
+        # Skip the current chapter if a hide flag is tripped
+        if chapter.hide_from_toc or local_hide_from_toc:
+            continue
+
+        sections = list()
+        for section in chapter.get_display_items():
+            if not section.hide_from_toc:
+                sections.append({'display_name': section.display_name_with_default,
+                                 'url_name': section.url_name,
+                                 'format': section.format if section.format is not None else '',
+                                 'due': section.due,
+                                 'graded': section.graded,
+                                 })
+        toc_chapters.append({
+            'display_name': chapter.display_name_with_default,
+            'url_name': chapter.url_name,
+            'sections': sections,
+        })
+    return toc_chapters
+
+
+def _toc_cache_key(request, course, required_content):
+    """
+    Returns the key under which the table of contents of `course` is cached for
+    the requesting user, or None if it shouldn't be cached.
+
+    Besides the user and the course version, the key covers everything the
+    table of contents of a user depends on which can change while it's cached:
+    the user's required content, roles and groups in the course's (non
+    split_test) user partitions, such as their cohort. Staff masquerading as
+    other users aren't served cached tables of contents.
+    """
+    user = request.user
+    if not settings.COURSEWARE_TOC_CACHE_TIMEOUT or get_course_masquerade(user, course.id):
+        return None
+    split_partitions = get_split_user_partitions(course.user_partitions)
+    user_groups = [
+        (partition.id, getattr(partition.scheme.get_group_for_user(course.id, user, partition), 'id', None))
+        for partition in course.user_partitions
+        if partition not in split_partitions
+    ]
+    user_variant = u"{}|{}|{}|{}".format(
+        u" ".join(sorted(required_content)),
+        user.is_staff,
+        u" ".join(sorted(u"{}/{}/{}".format(*role) for role in get_role_cache(user).roles())),
+        user_groups,
+    )
+    return u"courseware.module_render.toc.{}.{}.{}.{}".format(
+        user.id,
+        course.id,
+        getattr(course, 'subtree_edited_on', None),
+        hashlib.sha1(user_variant.encode('utf-8')).hexdigest(),
+    )
 
 
 def get_module(user, request, usage_key, field_data_cache,
@@ -639,7 +706,7 @@ def get_module_system_for_user(user, field_data_cache,  # TODO  # pylint: disabl
         course_id=course_id,
         open_ended_grading_interface=open_ended_grading_interface,
         s3_interface=s3_interface,
-        cache=cache,
+        cache=SAFE_EXEC_CACHE,
         can_execute_unsafe_code=(lambda: can_execute_unsafe_code(course_id)),
         get_python_lib_zip=(lambda: get_python_lib_zip(contentstore, course_id)),
         # TODO: When we merge the descriptor and module systems, we can stop reaching into the mixologist (cpennington)
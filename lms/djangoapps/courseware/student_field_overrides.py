@@ -4,9 +4,13 @@ by the individual due dates feature.
 """
 import json
 
+from request_cache.middleware import RequestCache
+
 from .field_overrides import FieldOverrideProvider
 from .models import StudentFieldOverride
 
+STUDENT_OVERRIDES_KEY = "courseware.student_field_overrides"
+
 
 class IndividualStudentOverrideProvider(FieldOverrideProvider):
     """
@@ -22,6 +26,9 @@ class IndividualStudentOverrideProvider(FieldOverrideProvider):
         """This simple override provider is always enabled"""
         return True
 
+    def prefetch(self, course_key):
+        _get_course_overrides_for_user(self.user, course_key)
+
 
 def get_override_for_user(user, block, name, default=None):
     """
@@ -43,19 +50,68 @@ def _get_overrides_for_user(user, block):
     Gets all of the individual student overrides for given user and block.
     Returns a dictionary of field override values keyed by field name.
     """
-    query = StudentFieldOverride.objects.filter(
-        course_id=block.runtime.course_id,
-        location=block.location,
-        student_id=user.id,
-    )
+    course_overrides = _get_course_overrides_for_user(user, block.runtime.course_id)
+    if course_overrides is not None:
+        values = course_overrides.get(_block_key(block.location), {})
+    else:
+        query = StudentFieldOverride.objects.filter(
+            course_id=block.runtime.course_id,
+            location=block.location,
+            student_id=user.id,
+        )
+        values = dict((override.field, override.value) for override in query)
     overrides = {}
-    for override in query:
-        field = block.fields[override.field]
-        value = field.from_json(json.loads(override.value))
-        overrides[override.field] = value
+    for name, value in values.iteritems():
+        field = block.fields[name]
+        overrides[name] = field.from_json(json.loads(value))
     return overrides
 
 
+def _get_course_overrides_for_user(user, course_key):
+    """
+    Loads all of the individual student overrides for the given user in the
+    given course with one query, and keeps them for the rest of the request.
+    Returns a dictionary mapping block keys (see `_block_key`) to dictionaries
+    of serialized override values keyed by field name, or None if no request
+    is being served.
+    """
+    cache = RequestCache.get_current_request_cache()
+    if cache is None:
+        return None
+    key = (STUDENT_OVERRIDES_KEY, user.id, course_key)
+    course_overrides = cache.get(key)
+    if course_overrides is None:
+        course_overrides = {}
+        query = StudentFieldOverride.objects.filter(
+            course_id=course_key,
+            student_id=user.id,
+        )
+        for override in query:
+            block_overrides = course_overrides.setdefault(_block_key(override.location), {})
+            block_overrides[override.field] = override.value
+        cache[key] = course_overrides
+    return course_overrides
+
+
+def _clear_course_overrides_for_user(user, course_key):
+    """
+    Drops the overrides loaded by `_get_course_overrides_for_user`, after
+    they have been changed.
+    """
+    cache = RequestCache.get_current_request_cache()
+    if cache is not None:
+        cache.pop((STUDENT_OVERRIDES_KEY, user.id, course_key), None)
+
+
+def _block_key(location):
+    """
+    Identifies a block within its course.  Locations loaded from the database
+    may lack the run of old style courses, so they can't be compared with
+    block locations directly.
+    """
+    return location.block_type, location.block_id
+
+
 def override_field_for_user(user, block, name, value):
     """
     Overrides a field for the `user`.  `block` and `name` specify the block
@@ -70,6 +126,7 @@ def override_field_for_user(user, block, name, value):
     field = block.fields[name]
     override.value = json.dumps(field.to_json(value))
     override.save()
+    _clear_course_overrides_for_user(user, block.runtime.course_id)
 
 
 def clear_override_for_user(user, block, name):
@@ -87,3 +144,5 @@ def clear_override_for_user(user, block, name):
             field=name).delete()
     except StudentFieldOverride.DoesNotExist:
         pass
+    else:
+        _clear_course_overrides_for_user(user, block.runtime.course_id)
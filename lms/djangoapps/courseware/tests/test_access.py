@@ -11,6 +11,7 @@ import courseware.access as access
 from courseware.masquerade import CourseMasquerade
 from courseware.tests.factories import UserFactory, StaffFactory, InstructorFactory
 from courseware.tests.helpers import LoginEnrollmentTestCase
+from student.roles import CourseStaffRole
 from student.tests.factories import AnonymousUserFactory, CourseEnrollmentAllowedFactory, CourseEnrollmentFactory
 from xmodule.course_module import (
     CATALOG_VISIBILITY_CATALOG_AND_ABOUT, CATALOG_VISIBILITY_ABOUT,
@@ -24,13 +25,14 @@ from util.milestones_helpers import (
     fulfill_course_milestone,
     seed_milestone_relationship_types,
 )
+from util.testing import RequestCacheTestMixin
 
 # pylint: disable=missing-docstring
 # pylint: disable=protected-access
 
 
 @attr('shard_1')
-class AccessTestCase(LoginEnrollmentTestCase, ModuleStoreTestCase):
+class AccessTestCase(RequestCacheTestMixin, LoginEnrollmentTestCase, ModuleStoreTestCase):
     """
     Tests for the various access controls on the student dashboard
     """
@@ -136,6 +138,30 @@ class AccessTestCase(LoginEnrollmentTestCase, ModuleStoreTestCase):
         with self.assertRaises(ValueError):
             access._has_access_descriptor(user, 'not_load_or_staff', descriptor)
 
+    def test__has_access_descriptor_cached(self):
+        """
+        Tests that while serving a request, access to a block is only checked once
+        until the user's roles change.
+        """
+        descriptor = Mock(location=self.course.course_key.make_usage_key('html', 'test'))
+        course_key = self.course.course_key
+        with patch('courseware.access._has_access_descriptor', return_value=False) as mock_has_access:
+            access._has_access_descriptor_cached(self.student, 'load', descriptor, course_key)
+            access._has_access_descriptor_cached(self.student, 'load', descriptor, course_key)
+            self.assertEqual(mock_has_access.call_count, 2)
+
+            self.start_request()
+            access._has_access_descriptor_cached(self.student, 'load', descriptor, course_key)
+            access._has_access_descriptor_cached(self.student, 'load', descriptor, course_key)
+            self.assertEqual(mock_has_access.call_count, 3)
+
+            access._has_access_descriptor_cached(self.student, 'staff', descriptor, course_key)
+            self.assertEqual(mock_has_access.call_count, 4)
+
+            CourseStaffRole(course_key).add_users(self.student)
+            access._has_access_descriptor_cached(self.student, 'load', descriptor, course_key)
+            self.assertEqual(mock_has_access.call_count, 5)
+
     @patch.dict('django.conf.settings.FEATURES', {'DISABLE_START_DATES': False})
     def test__has_access_descriptor_staff_lock(self):
         """
@@ -5,6 +5,7 @@ import unittest
 from nose.plugins.attrib import attr
 
 from django.test.utils import override_settings
+from util.testing import RequestCacheTestMixin
 from xblock.field_data import DictFieldData
 from xmodule.modulestore.tests.factories import CourseFactory
 from xmodule.modulestore.tests.django_utils import (
@@ -25,7 +26,7 @@ TESTUSER = "testuser"
 @attr('shard_1')
 @override_settings(FIELD_OVERRIDE_PROVIDERS=(
     'courseware.tests.test_field_overrides.TestOverrideProvider',))
-class OverrideFieldDataTests(ModuleStoreTestCase):
+class OverrideFieldDataTests(RequestCacheTestMixin, ModuleStoreTestCase):
     """
     Tests for `OverrideFieldData`.
     """
@@ -89,6 +90,16 @@ class OverrideFieldDataTests(ModuleStoreTestCase):
         with disable_overrides():
             self.assertEqual(data.get('block', 'foo'), 'baz')
 
+    def test_prefetch_once_per_request(self):
+        TestOverrideProvider.prefetched = []
+        self.make_one()
+        self.assertEqual(TestOverrideProvider.prefetched, [])
+
+        self.start_request()
+        self.make_one()
+        self.make_one()
+        self.assertEqual(TestOverrideProvider.prefetched, [self.course.id])
+
     @override_settings(FIELD_OVERRIDE_PROVIDERS=())
     def test_no_overrides_configured(self):
         data = self.make_one()
@@ -120,6 +131,8 @@ class TestOverrideProvider(FieldOverrideProvider):
     """
     A concrete implementation of `FieldOverrideProvider` for testing.
     """
+    prefetched = []
+
     def get(self, block, name, default):
         assert self.user is TESTUSER
         assert block == 'block'
@@ -129,6 +142,9 @@ class TestOverrideProvider(FieldOverrideProvider):
             return 'man'
         return default
 
+    def prefetch(self, course_key):
+        self.prefetched.append(course_key)
+
     @classmethod
     def enabled_for(cls, course):
         return True
@@ -1,18 +1,27 @@
 """
 Test grade calculation.
 """
+from django.db import IntegrityError
 from django.http import Http404
+from django.test.client import RequestFactory
+from django.utils import timezone
 from mock import patch
 from nose.plugins.attrib import attr
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 
-from courseware.grades import grade, iterate_grades_for
+from courseware.grades import grade, iterate_grades_for, student_module_scores_for
+from courseware.models import PersistentCourseGrade, StudentModule, SCORE_CHANGED
+from courseware.tests.factories import StudentModuleFactory
+from openedx.core.djangoapps.user_api.course_tag.api import set_course_tag
+from openedx.core.djangoapps.user_api.partition_schemes import RandomUserPartitionScheme
 from student.tests.factories import UserFactory
-from xmodule.modulestore.tests.factories import CourseFactory
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+from xmodule.partitions.partitions import Group, UserPartition
 
 
-def _grade_with_errors(student, request, course, keep_raw_scores=False):
+def _grade_with_errors(student, request, course, keep_raw_scores=False, student_module_scores=None,
+                       scores_read_at=None):
     """This fake grade method will throw exceptions for student3 and
     student4, but allow any other students to go through normal grading.
 
@@ -23,7 +32,10 @@ def _grade_with_errors(student, request, course, keep_raw_scores=False):
     if student.username in ['student3', 'student4']:
         raise Exception("I don't like {}".format(student.username))
 
-    return grade(student, request, course, keep_raw_scores=keep_raw_scores)
+    return grade(
+        student, request, course, keep_raw_scores=keep_raw_scores,
+        student_module_scores=student_module_scores, scores_read_at=scores_read_at
+    )
 
 
 @attr('shard_1')
@@ -106,6 +118,24 @@ class TestGradeIteration(ModuleStoreTestCase):
         self.assertTrue(all_gradesets[student2])
         self.assertTrue(all_gradesets[student5])
 
+    def test_student_module_scores_for(self):
+        """StudentModule scores are loaded for every requested student"""
+        problem = ItemFactory.create(parent_location=self.course.location, category='problem')
+        student1, student2 = self.students[:2]
+        StudentModuleFactory.create(
+            student=student1, course_id=self.course.id, module_state_key=problem.location, grade=1, max_grade=3
+        )
+        with self.assertNumQueries(1):
+            scores = student_module_scores_for(self.course.id, [student1.id, student2.id])
+        self.assertEqual(scores, {student1.id: {problem.location: (1, 3)}, student2.id: {}})
+
+    @patch('courseware.grades.GRADES_STUDENT_CHUNK_SIZE', 2)
+    def test_chunked_grading(self):
+        """All students are graded when they span several chunks"""
+        all_gradesets, all_errors = self._gradesets_and_errors_for(self.course.id, self.students)
+        self.assertEqual(len(all_gradesets), 5)
+        self.assertEqual(len(all_errors), 0)
+
     ################################# Helpers #################################
     def _gradesets_and_errors_for(self, course_id, students):
         """Simple helper method to iterate through student grades and give us
@@ -121,3 +151,112 @@ class TestGradeIteration(ModuleStoreTestCase):
                 students_to_errors[student] = err_msg
 
         return students_to_gradesets, students_to_errors
+
+
+@attr('shard_1')
+@patch.dict('django.conf.settings.FEATURES', {'ENABLE_PERSISTENT_GRADES': True})
+class TestPersistentGrades(ModuleStoreTestCase):
+    """
+    Test that section grades are persisted and reused between grading runs.
+    """
+    def setUp(self):
+        super(TestPersistentGrades, self).setUp()
+        course = CourseFactory.create()
+        chapter = ItemFactory.create(parent_location=course.location, category='chapter')
+        self.section = ItemFactory.create(
+            parent_location=chapter.location,
+            category='sequential',
+            metadata={'graded': True, 'format': 'Homework'}
+        )
+        self.problem = ItemFactory.create(parent_location=self.section.location, category='problem')
+        self.course = self.store.get_course(course.id)
+
+        self.student = UserFactory.create()
+        self.student_module = StudentModuleFactory.create(
+            student=self.student,
+            course_id=self.course.id,
+            module_state_key=self.problem.location,
+            grade=1,
+            max_grade=2,
+        )
+        self.request = RequestFactory().get('/')
+        self.request.user = self.student
+        self.request.session = {}
+
+    def _homework_score(self):
+        """Grades the student and returns the score of the homework section"""
+        return grade(self.student, self.request, self.course)['totaled_scores']['Homework'][0]
+
+    def _change_grade_silently(self, new_grade):
+        """Updates the student's grade for the problem without sending any signals"""
+        StudentModule.objects.filter(id=self.student_module.id).update(grade=new_grade)
+
+    def test_section_scores_persisted(self):
+        self.assertEqual(self._homework_score().earned, 1)
+        record = PersistentCourseGrade.objects.get(user=self.student, course_id=self.course.id)
+        self.assertIn(unicode(self.section.location), record.sections)
+
+    def test_persisted_section_scores_reused(self):
+        self._homework_score()
+        self._change_grade_silently(2)
+        self.assertEqual(self._homework_score().earned, 1)
+
+    def test_score_changed_invalidates_section(self):
+        self._homework_score()
+        self._change_grade_silently(2)
+        SCORE_CHANGED.send(
+            sender=None,
+            points_possible=2,
+            points_earned=2,
+            user_id=self.student.id,
+            course_id=unicode(self.course.id),
+            usage_id=unicode(self.problem.location)
+        )
+        self.assertEqual(self._homework_score().earned, 2)
+
+    def test_stale_sections_not_persisted(self):
+        # The scores are read, and then one of them changes before grading ends
+        scores_read_at = timezone.now()
+        self._change_grade_silently(2)
+        PersistentCourseGrade.invalidate(self.student.id, self.course.id, unicode(self.problem.location))
+
+        grade(self.student, self.request, self.course, scores_read_at=scores_read_at)
+
+        record = PersistentCourseGrade.objects.get(user=self.student, course_id=self.course.id)
+        self.assertEqual(record.sections, {})
+        self.assertEqual(self._homework_score().earned, 2)
+
+    def test_record_created_concurrently(self):
+        created = PersistentCourseGrade.objects.create(user=self.student, course_id=self.course.id)
+        with patch('django.db.models.query.QuerySet.get_or_create', side_effect=IntegrityError):
+            # pylint: disable=protected-access
+            record, was_created = PersistentCourseGrade._locked_record(self.student.id, self.course.id)
+        self.assertEqual(record.id, created.id)
+        self.assertFalse(was_created)
+
+    def test_student_module_deletion_invalidates_section(self):
+        self._homework_score()
+        StudentModule.objects.get(id=self.student_module.id).delete()
+        self.assertEqual(self._homework_score().earned, 0)
+
+    def test_partition_group_change_invalidates_sections(self):
+        partition = UserPartition(
+            0, 'Experiment', 'Experiment configuration', [Group(0, 'A'), Group(1, 'B')], scheme_id='random'
+        )
+        self.course.user_partitions = [partition]
+        self.store.update_item(self.course, self.student.id)
+        self.course = self.store.get_course(self.course.id)
+        partition_key = RandomUserPartitionScheme.key_for_partition(partition)
+        set_course_tag(self.student, self.course.id, partition_key, 0)
+
+        self._homework_score()
+        self._change_grade_silently(2)
+        self.assertEqual(self._homework_score().earned, 1)
+
+        set_course_tag(self.student, self.course.id, partition_key, 1)
+        self.assertEqual(self._homework_score().earned, 2)
+
+    @patch.dict('django.conf.settings.FEATURES', {'ENABLE_PERSISTENT_GRADES': False})
+    def test_disabled(self):
+        self._homework_score()
+        self.assertFalse(PersistentCourseGrade.objects.filter(user=self.student).exists())
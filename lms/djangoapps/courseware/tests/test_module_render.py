@@ -12,6 +12,7 @@ from bson import ObjectId
 from django.http import Http404, HttpResponse
 from django.core.urlresolvers import reverse
 from django.conf import settings
+from django.core.cache import cache
 from django.test.client import RequestFactory
 from django.test.utils import override_settings
 from django.contrib.auth.models import AnonymousUser
@@ -39,6 +40,7 @@ from courseware.tests.test_submitting_problems import TestSubmittingProblems
 from lms.djangoapps.lms_xblock.runtime import quote_slashes
 from lms.djangoapps.lms_xblock.field_data import LmsFieldData
 from student.models import anonymous_id_for_user
+from student.roles import CourseBetaTesterRole
 from xmodule.modulestore.tests.django_utils import (
     TEST_DATA_MIXED_TOY_MODULESTORE,
     TEST_DATA_XML_MODULESTORE,
@@ -680,6 +682,40 @@ class TestTOC(ModuleStoreTestCase):
             for toc_section in expected:
                 self.assertIn(toc_section, actual)
 
+    @ddt.data((ModuleStoreEnum.Type.mongo, 3, 0), (ModuleStoreEnum.Type.split, 6, 0))
+    @ddt.unpack
+    @override_settings(COURSEWARE_TOC_CACHE_TIMEOUT=60)
+    def test_toc_cached(self, default_ms, setup_finds, setup_sends):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        with self.store.default_store(default_ms):
+            self.setup_modulestore(default_ms, setup_finds, setup_sends)
+            first = render.toc_for_course(self.request, self.toy_course, self.chapter, None, self.field_data_cache)
+            with check_mongo_calls(0):
+                with patch('courseware.module_render.get_module_for_descriptor') as mock_get_module:
+                    second = render.toc_for_course(
+                        self.request, self.toy_course, self.chapter, 'Welcome', self.field_data_cache
+                    )
+                    self.assertFalse(mock_get_module.called)
+
+        self.assertEqual(
+            [chapter['url_name'] for chapter in first],
+            [chapter['url_name'] for chapter in second]
+        )
+        self.assertEqual(
+            [section['url_name'] for section in second[0]['sections'] if section['active']],
+            ['Welcome']
+        )
+        self.assertFalse(any(section['active'] for section in first[0]['sections']))
+
+    @override_settings(COURSEWARE_TOC_CACHE_TIMEOUT=60)
+    def test_toc_cache_key_covers_roles(self):
+        self.setup_modulestore(ModuleStoreEnum.Type.mongo, 3, 0)
+        student_key = render._toc_cache_key(self.request, self.toy_course, [])  # pylint: disable=protected-access
+        CourseBetaTesterRole(self.course_key).add_users(self.request.user)
+        beta_tester_key = render._toc_cache_key(self.request, self.toy_course, [])  # pylint: disable=protected-access
+        self.assertNotEqual(student_key, beta_tester_key)
+
 
 @attr('shard_1')
 @ddt.ddt
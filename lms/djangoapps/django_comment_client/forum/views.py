@@ -201,12 +201,13 @@ def inline_discussion(request, course_key, discussion_id):
 
     course = get_course_with_access(request.user, 'load', course_key, check_if_enrolled=True)
     cc_user = cc.User.from_django_user(request.user)
-    user_info = cc_user.to_dict()
+    pending_user_info = cc.utils.perform_async(cc_user.to_dict)
 
     try:
         threads, query_params = get_threads(request, course, discussion_id, per_page=INLINE_THREADS_PER_PAGE)
     except ValueError:
         return HttpResponseBadRequest("Invalid group_id")
+    user_info = pending_user_info.get()
 
     with newrelic.agent.FunctionTrace(nr_transaction, "get_metadata_for_threads"):
         annotated_content_info = utils.get_metadata_for_threads(course_key, threads, request.user, user_info)
@@ -238,12 +239,13 @@ def forum_form_discussion(request, course_key):
     course_settings = make_course_settings(course, request.user)
 
     user = cc.User.from_django_user(request.user)
-    user_info = user.to_dict()
+    pending_user_info = cc.utils.perform_async(user.to_dict)
 
     try:
         unsafethreads, query_params = get_threads(request, course)   # This might process a search query
         is_staff = has_permission(request.user, 'openclose_thread', course.id)
         threads = [utils.prepare_content(thread, course_key, is_staff) for thread in unsafethreads]
+        user_info = pending_user_info.get()
     except cc.utils.CommentClientMaintenanceError:
         log.warning("Forum is in maintenance mode")
         return render_to_response('discussion/maintenance.html', {})
@@ -307,13 +309,15 @@ def single_thread(request, course_key, discussion_id, thread_id):
     course = get_course_with_access(request.user, 'load', course_key, check_if_enrolled=True)
     course_settings = make_course_settings(course, request.user)
     cc_user = cc.User.from_django_user(request.user)
-    user_info = cc_user.to_dict()
     is_moderator = has_permission(request.user, "see_all_cohorts", course_key)
 
     # Verify that the student has access to this thread if belongs to a discussion module
     if discussion_id not in utils.get_discussion_categories_ids(course, request.user):
         raise Http404
 
+    # The user and the thread are fetched from the comments service concurrently
+    pending_user_info = cc.utils.perform_async(cc_user.to_dict)
+
     # Currently, the front end always loads responses via AJAX, even for this
     # page; it would be a nice optimization to avoid that extra round trip to
     # the comments service.
@@ -328,6 +332,7 @@ def single_thread(request, course_key, discussion_id, thread_id):
         if e.status_code == 404:
             raise Http404
         raise
+    user_info = pending_user_info.get()
 
     # verify that the thread belongs to the requesting student's cohort
     if is_commentable_cohorted(course_key, discussion_id) and not is_moderator:
@@ -427,10 +432,11 @@ def user_profile(request, course_key, user_id):
         else:
             profiled_user = cc.User(id=user_id, course_id=course_key)
 
+        pending_user_info = cc.utils.perform_async(cc.User.from_django_user(request.user).to_dict)
         threads, page, num_pages = profiled_user.active_threads(query_params)
         query_params['page'] = page
         query_params['num_pages'] = num_pages
-        user_info = cc.User.from_django_user(request.user).to_dict()
+        user_info = pending_user_info.get()
 
         with newrelic.agent.FunctionTrace(nr_transaction, "get_metadata_for_threads"):
             annotated_content_info = utils.get_metadata_for_threads(course_key, threads, request.user, user_info)
@@ -508,10 +514,11 @@ def followed_threads(request, course_key, user_id):
         if group_id is not None:
             query_params['group_id'] = group_id
 
+        pending_user_info = cc.utils.perform_async(cc.User.from_django_user(request.user).to_dict)
         threads, page, num_pages = profiled_user.subscribed_threads(query_params)
         query_params['page'] = page
         query_params['num_pages'] = num_pages
-        user_info = cc.User.from_django_user(request.user).to_dict()
+        user_info = pending_user_info.get()
 
         with newrelic.agent.FunctionTrace(nr_transaction, "get_metadata_for_threads"):
             annotated_content_info = utils.get_metadata_for_threads(course_key, threads, request.user, user_info)
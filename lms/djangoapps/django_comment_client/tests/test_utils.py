@@ -8,17 +8,20 @@ from django.utils.timezone import UTC as django_utc
 
 from django.core.urlresolvers import reverse
 from django.test import TestCase, RequestFactory
+from django.utils import translation
 from edxmako import add_lookup
 
 from django_comment_client.tests.factories import RoleFactory
 from django_comment_client.tests.unicode import UnicodeTestMixin
 import django_comment_client.utils as utils
+import lms.lib.comment_client as cc
 
 from courseware.tests.factories import InstructorFactory
 from courseware.tabs import get_course_tab_list
 from openedx.core.djangoapps.course_groups.cohorts import set_course_cohort_settings
 from student.tests.factories import UserFactory, AdminFactory, CourseEnrollmentFactory
 from openedx.core.djangoapps.util.testing import ContentGroupTestCase
+from util.testing import RequestCacheTestMixin
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 
@@ -171,7 +174,7 @@ class CategoryMapTestMixin(object):
 
 
 @attr('shard_1')
-class CategoryMapTestCase(CategoryMapTestMixin, ModuleStoreTestCase):
+class CategoryMapTestCase(RequestCacheTestMixin, CategoryMapTestMixin, ModuleStoreTestCase):
     """
     Base testcase class for discussion categories for the
     comment client service integration
@@ -747,6 +750,28 @@ class CategoryMapTestCase(CategoryMapTestMixin, ModuleStoreTestCase):
             ["discussion1", "discussion2", "discussion3", "discussion4", "discussion5", "discussion6"]
         )
 
+    def test_ids_staff_only(self):
+        self.create_discussion("Chapter 1", "Discussion 1")
+        self.create_discussion("Chapter 1", "Discussion 2", visible_to_staff_only=True)
+        self.assertItemsEqual(
+            utils.get_discussion_categories_ids(self.course, UserFactory.create()),
+            ["discussion1"]
+        )
+        self.assertItemsEqual(
+            utils.get_discussion_categories_ids(self.course, self.instructor),
+            ["discussion1", "discussion2"]
+        )
+
+    def test_index_built_once_per_request(self):
+        self.create_discussion("Chapter 1", "Discussion 1")
+        self.start_request()
+        with mock.patch(
+            'django_comment_client.utils._build_discussion_index', wraps=utils._build_discussion_index
+        ) as mock_build:
+            self.assertEqual(utils.get_discussion_categories_ids(self.course, self.user), ["discussion1"])
+            self.assertEqual(utils.get_discussion_id_map(self.course, self.user).keys(), ["discussion1"])
+        self.assertEqual(mock_build.call_count, 1)
+
     def test_ids_mixed(self):
         self.course.discussion_topics = {
             "Topic A": {"id": "Topic_A"},
@@ -983,3 +1008,25 @@ class DiscussionTabTestCase(ModuleStoreTestCase):
 
         with self.settings(FEATURES={'CUSTOM_COURSES_EDX': True}):
             self.assertFalse(self.discussion_tab_present(self.enrolled_user))
+
+
+@attr('shard_1')
+class CommentClientUtilsTestCase(TestCase):
+    """
+    Test the HTTP session and concurrency helpers of the comments client.
+    """
+
+    def test_session_is_reused(self):
+        self.assertIs(cc.utils.get_session(), cc.utils.get_session())
+
+    def test_perform_async(self):
+        self.assertEqual(cc.utils.perform_async(sum, [1, 2, 3]).get(), 6)
+
+    def test_perform_async_raises(self):
+        pending = cc.utils.perform_async(int, 'not a number')
+        with self.assertRaises(ValueError):
+            pending.get()
+
+    def test_perform_async_language(self):
+        with translation.override('eo'):
+            self.assertEqual(cc.utils.perform_async(translation.get_language).get(), 'eo')
@@ -1,10 +1,11 @@
-from collections import defaultdict
+from collections import defaultdict, namedtuple
 from datetime import datetime
 import json
 import logging
 
 import pytz
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
 from django.db import connection
 from django.http import HttpResponse
@@ -13,6 +14,7 @@ import pystache_custom as pystache
 from opaque_keys.edx.locations import i4xEncoder
 from opaque_keys.edx.keys import CourseKey
 from xmodule.modulestore.django import modulestore
+from xmodule.split_test_module import get_split_user_partitions
 
 from django_comment_common.models import Role, FORUM_ROLE_STUDENT
 from django_comment_client.permissions import check_permissions_by_view, has_permission
@@ -24,10 +26,23 @@ from openedx.core.djangoapps.course_groups.cohorts import (
     get_course_cohort_settings, get_cohort_by_id, get_cohort_id, is_commentable_cohorted, is_course_cohorted
 )
 from openedx.core.djangoapps.course_groups.models import CourseUserGroup
+from request_cache.middleware import RequestCache
 
 
 log = logging.getLogger(__name__)
 
+DISCUSSION_INDEX_CACHE_KEY = "django_comment_client.utils.discussion_index"
+# How long (in seconds) the discussion index of a given version of a course
+# is kept in the cache
+DISCUSSION_INDEX_CACHE_TIMEOUT = 24 * 60 * 60
+
+# What the forum needs to know about a discussion module, see
+# `get_accessible_discussion_modules`
+DiscussionModuleInfo = namedtuple('DiscussionModuleInfo', [
+    'location', 'discussion_id', 'discussion_category', 'discussion_target', 'sort_key', 'start',
+    'needs_access_check',
+])
+
 
 def extract(dic, keys):
     return {k: dic.get(k) for k in keys}
@@ -65,7 +80,58 @@ def has_forum_access(uname, course_id, rolename):
 def get_accessible_discussion_modules(course, user, include_all=False):  # pylint: disable=invalid-name
     """
     Return a list of all valid discussion modules in this course that
-    are accessible to the given user.
+    are accessible to the given user, as DiscussionModuleInfo tuples.
+
+    The modules are looked up in the course's discussion index (see
+    `_get_discussion_index`); only those with access restrictions (staff only,
+    group access or a future start date) are loaded to check the user's access.
+    """
+    now = datetime.now(UTC())
+
+    def is_accessible(info):  # pylint: disable=missing-docstring
+        if not info.needs_access_check and (info.start is None or info.start < now):
+            return True
+        return has_access(user, 'load', modulestore().get_item(info.location), course.id)
+
+    return [
+        info for info in _get_discussion_index(course)
+        if include_all or is_accessible(info)
+    ]
+
+
+def _get_discussion_index(course):
+    """
+    Returns a list of DiscussionModuleInfo for all the valid discussion modules
+    in this course.
+
+    The index is cached for each version of the course, so it is rebuilt once
+    the course is published again.  Modulestores which don't track the version
+    of a course (e.g. old mongo) only keep it for the rest of the request.
+    """
+    request_cache = RequestCache.get_current_request_cache()
+    request_cache_key = (DISCUSSION_INDEX_CACHE_KEY, course.id)
+    if request_cache is not None:
+        index = request_cache.get(request_cache_key)
+        if index is not None:
+            return index
+
+    version = getattr(course, 'subtree_edited_on', None)
+    cache_key = u"{}.{}.{}".format(DISCUSSION_INDEX_CACHE_KEY, course.id, version) if version else None
+    index = cache.get(cache_key) if cache_key else None
+    if index is None:
+        index = _build_discussion_index(course)
+        if cache_key:
+            cache.set(cache_key, index, DISCUSSION_INDEX_CACHE_TIMEOUT)
+
+    if request_cache is not None:
+        request_cache[request_cache_key] = index
+    return index
+
+
+def _build_discussion_index(course):
+    """
+    Loads all of the discussion modules of this course to build its
+    discussion index.
     """
     all_modules = modulestore().get_items(course.id, qualifiers={'category': 'discussion'})
 
@@ -76,9 +142,32 @@ def get_accessible_discussion_modules(course, user, include_all=False):  # pylin
                 return False
         return True
 
+    def needs_access_check(module):
+        """
+        Whether loading the module may be restricted to some users (apart from
+        its start date, which is checked against the index).
+        """
+        if module.visible_to_staff_only:
+            return True
+        # Only look at group access (which loads the module's ancestors) if
+        # there are partitions which has_access would consider
+        user_partitions = module.user_partitions
+        if len(user_partitions) == len(get_split_user_partitions(user_partitions)):
+            return False
+        return bool(module.merged_group_access)
+
     return [
-        module for module in all_modules
-        if has_required_keys(module) and (include_all or has_access(user, 'load', module, course.id))
+        DiscussionModuleInfo(
+            location=module.location,
+            discussion_id=module.discussion_id,
+            discussion_category=module.discussion_category,
+            discussion_target=module.discussion_target,
+            sort_key=module.sort_key,
+            start=module.start,
+            needs_access_check=needs_access_check(module),
+        )
+        for module in all_modules
+        if has_required_keys(module)
     ]
 
 
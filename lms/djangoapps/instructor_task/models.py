@@ -19,6 +19,7 @@ import csv
 import json
 import hashlib
 import os.path
+import tempfile
 import urllib
 
 from boto.s3.connection import S3Connection
@@ -193,9 +194,9 @@ class InstructorTask(models.Model):
 class ReportStore(object):
     """
     Simple abstraction layer that can fetch and store CSV files for reports
-    download. Should probably refactor later to create a ReportFile object that
-    can simply be appended to for the sake of memory efficiency, rather than
-    passing in the whole dataset. Doing that for now just because it's simpler.
+    download. `store_rows` accepts any iterable of rows (including generators)
+    and writes them out incrementally, so reports don't need to be held in
+    memory in their entirety.
     """
     @classmethod
     def from_config(cls, config_name):
@@ -231,6 +232,9 @@ class S3ReportStore(ReportStore):
     conventions on where files are stored to know what to display. Clients using
     this class can name the final file whatever they want.
     """
+    # S3 requires all parts of a multipart upload but the last to be at least 5MB.
+    MULTIPART_CHUNK_SIZE = 5 * 1024 * 1024
+
     def __init__(self, bucket_name, root_path):
         self.root_path = root_path
 
@@ -312,9 +316,14 @@ class S3ReportStore(ReportStore):
 
     def store_rows(self, course_id, filename, rows):
         """
-        Given a `course_id`, `filename`, and `rows` (each row is an iterable of
-        strings), create a buffer that is a gzip'd csv file, and then `store()`
-        that buffer.
+        Given a `course_id`, `filename`, and `rows` (an iterable of rows, each
+        of which is an iterable of strings), write a gzip'd csv file to S3.
+
+        The compressed output is uploaded in parts of `MULTIPART_CHUNK_SIZE`
+        bytes as it is generated, so memory use is bounded regardless of the
+        number of rows. Reports smaller than a single part are uploaded with
+        a single `store()`. Parts of a multipart upload aren't visible until
+        the upload is completed, so only complete files are ever visible.
 
         Even though we store it in gzip format, browsers will transparently
         download and decompress it. Filenames should end in `.csv`, not `.gz`.
@@ -322,10 +331,52 @@ class S3ReportStore(ReportStore):
         output_buffer = StringIO()
         gzip_file = GzipFile(fileobj=output_buffer, mode="wb")
         csvwriter = csv.writer(gzip_file)
-        csvwriter.writerows(self._get_utf8_encoded_rows(rows))
-        gzip_file.close()
+        multipart_upload = None
+        part_num = 0
+
+        try:
+            for row in self._get_utf8_encoded_rows(rows):
+                csvwriter.writerow(row)
+                if output_buffer.tell() >= self.MULTIPART_CHUNK_SIZE:
+                    if multipart_upload is None:
+                        multipart_upload = self._initiate_multipart_upload(course_id, filename)
+                    part_num += 1
+                    self._upload_part(multipart_upload, output_buffer, part_num)
+            gzip_file.close()
+
+            if multipart_upload is None:
+                self.store(course_id, filename, output_buffer)
+            else:
+                part_num += 1
+                self._upload_part(multipart_upload, output_buffer, part_num)
+                multipart_upload.complete_upload()
+        except Exception:
+            if multipart_upload is not None:
+                multipart_upload.cancel_upload()
+            raise
+
+    def _initiate_multipart_upload(self, course_id, filename):
+        """
+        Starts a multipart upload of a gzip'd csv file to the S3 key for
+        `course_id` and `filename`.
+        """
+        key = self.key_for(course_id, filename)
+        return self.bucket.initiate_multipart_upload(
+            key.key,
+            headers={
+                "Content-Encoding": "gzip",
+                "Content-Type": "text/csv",
+            }
+        )
 
-        self.store(course_id, filename, output_buffer)
+    def _upload_part(self, multipart_upload, output_buffer, part_num):
+        """
+        Uploads the contents of `output_buffer` as part `part_num` of
+        `multipart_upload`, then empties the buffer.
+        """
+        multipart_upload.upload_part_from_file(StringIO(output_buffer.getvalue()), part_num)
+        output_buffer.seek(0)
+        output_buffer.truncate()
 
     def links_for(self, course_id):
         """
@@ -393,14 +444,27 @@ class LocalFSReportStore(ReportStore):
 
     def store_rows(self, course_id, filename, rows):
         """
-        Given a course_id, filename, and rows (each row is an iterable of strings),
-        write this data out.
+        Given a course_id, filename, and rows (an iterable of rows, each of
+        which is an iterable of strings), write this data out.
+
+        Rows are written to a temporary file as they are generated, which is
+        then moved into place, so only complete files are ever visible.
         """
-        output_buffer = StringIO()
-        csvwriter = csv.writer(output_buffer)
-        csvwriter.writerows(self._get_utf8_encoded_rows(rows))
+        full_path = self.path_to(course_id, filename)
+        directory = os.path.dirname(full_path)
+        if not os.path.exists(directory):
+            os.mkdir(directory)
 
-        self.store(course_id, filename, output_buffer)
+        temp_file = tempfile.NamedTemporaryFile(dir=self.root_path, delete=False)
+        try:
+            with temp_file:
+                csvwriter = csv.writer(temp_file)
+                for row in self._get_utf8_encoded_rows(rows):
+                    csvwriter.writerow(row)
+            os.rename(temp_file.name, full_path)
+        except Exception:
+            os.remove(temp_file.name)
+            raise
 
     def links_for(self, course_id):
         """
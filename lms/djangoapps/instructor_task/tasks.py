@@ -36,6 +36,7 @@ from instructor_task.tasks_helper import (
     delete_problem_module_state,
     upload_grades_csv,
     upload_problem_grade_report,
+    upload_report_shard,
     upload_students_csv,
     cohort_students_and_upload,
     upload_enrollment_report,
@@ -155,7 +156,7 @@ def calculate_grades_csv(entry_id, xmodule_instance_args):
         xmodule_instance_args.get('task_id'), entry_id, action_name
     )
 
-    task_fn = partial(upload_grades_csv, xmodule_instance_args)
+    task_fn = partial(upload_grades_csv, xmodule_instance_args, shard_task=calculate_report_shard)
     return run_main_task(entry_id, task_fn, action_name)
 
 
@@ -172,10 +173,19 @@ def calculate_problem_grade_report(entry_id, xmodule_instance_args):
         xmodule_instance_args.get('task_id'), entry_id, action_name
     )
 
-    task_fn = partial(upload_problem_grade_report, xmodule_instance_args)
+    task_fn = partial(upload_problem_grade_report, xmodule_instance_args, shard_task=calculate_report_shard)
     return run_main_task(entry_id, task_fn, action_name)
 
 
+@task(routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=not-callable
+def calculate_report_shard(entry_id, report_name, shard_index, student_ids, subtask_status_dict):
+    """
+    Generate the rows of a grade report for one shard of a course's students.
+    The last shard to complete merges all shards into the final report.
+    """
+    return upload_report_shard(entry_id, report_name, shard_index, student_ids, subtask_status_dict)
+
+
 @task(base=BaseInstructorTask, routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=not-callable
 def calculate_students_features_csv(entry_id, xmodule_instance_args):
     """
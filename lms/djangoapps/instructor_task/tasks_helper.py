@@ -8,7 +8,7 @@ from collections import OrderedDict
 from datetime import datetime
 from django.conf import settings
 from eventtracking import tracker
-from itertools import chain
+from itertools import chain, count, islice
 from time import time
 import unicodecsv
 import logging
@@ -16,6 +16,7 @@ import logging
 from celery import Task, current_task
 from celery.states import SUCCESS, FAILURE
 from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
 from django.core.files.storage import DefaultStorage
 from django.db import transaction, reset_queries
 import dogstats_wrapper as dog_stats_api
@@ -42,6 +43,12 @@ from courseware.module_render import get_module_for_descriptor_internal
 from instructor_analytics.basic import enrolled_students_features, list_may_enroll
 from instructor_analytics.csvs import format_dictlist
 from instructor_task.models import ReportStore, InstructorTask, PROGRESS
+from instructor_task.subtasks import (
+    SubtaskStatus,
+    check_subtask_is_valid,
+    queue_subtasks_for_query,
+    update_subtask_status,
+)
 from lms.djangoapps.lms_xblock.runtime import LmsPartitionService
 from openedx.core.djangoapps.course_groups.cohorts import get_cohort
 from openedx.core.djangoapps.course_groups.models import CourseUserGroup
@@ -62,6 +69,8 @@ FILTERED_OUT_ROLES = ['staff', 'instructor', 'finance_admin', 'sales_admin']
 UPDATE_STATUS_SUCCEEDED = 'succeeded'
 UPDATE_STATUS_FAILED = 'failed'
 UPDATE_STATUS_SKIPPED = 'skipped'
+# how many StudentModules perform_module_state_update reads at a time
+STUDENT_MODULE_CHUNK_SIZE = 100
 
 # The setting name used for events when "settings" (account settings, preferences, profile information) change.
 REPORT_REQUESTED_EVENT_NAME = u'edx.instructor.report.requested'
@@ -293,8 +302,8 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
 
     The `update_fcn` is called on each StudentModule that passes the resulting filtering.
     It is passed three arguments:  the module_descriptor for the module pointed to by the
-    module_state_key, the particular StudentModule to update, and the xmodule_instance_args being
-    passed through.  If the value returned by the update function evaluates to a boolean True,
+    module_state_key, the particular StudentModule to update, and the course (loaded once for
+    the whole task).  If the value returned by the update function evaluates to a boolean True,
     the update is successful; False indicates the update on the particular student module failed.
     A raised exception indicates a fatal condition -- that no other student modules should be considered.
 
@@ -309,6 +318,10 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
               Pass-through of input `action_name`.
           'duration_ms': how long the task has (or had) been running.
 
+    The StudentModules are read in chunks of STUDENT_MODULE_CHUNK_SIZE, and progress is reported
+    after each chunk.  Each update is committed on its own, so that a fatal error doesn't roll back
+    the updates (whose tracking events were already emitted) to the StudentModules before it.
+
     Because this is run internal to a task, it does not catch exceptions.  These are allowed to pass up to the
     next level, so that it can set the failure modes and capture the error trace in the InstructorTask and the
     result object.
@@ -358,27 +371,52 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
     task_progress = TaskProgress(action_name, modules_to_update.count(), start_time)
     task_progress.update_task_state()
 
-    for module_to_update in modules_to_update:
-        task_progress.attempted += 1
-        module_descriptor = problems[unicode(module_to_update.module_state_key)]
-        # There is no try here:  if there's an error, we let it throw, and the task will
-        # be marked as FAILED, with a stack trace.
-        with dog_stats_api.timer('instructor_tasks.module.time.step', tags=[u'action:{name}'.format(name=action_name)]):
-            update_status = update_fcn(module_descriptor, module_to_update)
-            if update_status == UPDATE_STATUS_SUCCEEDED:
-                # If the update_fcn returns true, then it performed some kind of work.
-                # Logging of failures is left to the update_fcn itself.
-                task_progress.succeeded += 1
-            elif update_status == UPDATE_STATUS_FAILED:
-                task_progress.failed += 1
-            elif update_status == UPDATE_STATUS_SKIPPED:
-                task_progress.skipped += 1
-            else:
-                raise UpdateProblemModuleStateError("Unexpected update_status returned: {}".format(update_status))
+    with modulestore().bulk_operations(course_id):
+        course = get_course_by_id(course_id)
+        for module_chunk in _chunked_student_modules(modules_to_update.select_related('student')):
+            for module_to_update in module_chunk:
+                task_progress.attempted += 1
+                module_descriptor = problems[unicode(module_to_update.module_state_key)]
+                # There is no try here:  if there's an error, we let it throw, and the task will
+                # be marked as FAILED, with a stack trace.
+                with dog_stats_api.timer(
+                    'instructor_tasks.module.time.step', tags=[u'action:{name}'.format(name=action_name)]
+                ):
+                    update_status = update_fcn(module_descriptor, module_to_update, course)
+                    if update_status == UPDATE_STATUS_SUCCEEDED:
+                        # If the update_fcn returns true, then it performed some kind of work.
+                        # Logging of failures is left to the update_fcn itself.
+                        task_progress.succeeded += 1
+                    elif update_status == UPDATE_STATUS_FAILED:
+                        task_progress.failed += 1
+                    elif update_status == UPDATE_STATUS_SKIPPED:
+                        task_progress.skipped += 1
+                    else:
+                        raise UpdateProblemModuleStateError(
+                            "Unexpected update_status returned: {}".format(update_status)
+                        )
+            task_progress.update_task_state()
 
     return task_progress.update_task_state()
 
 
+def _chunked_student_modules(modules, chunk_size=None):
+    """
+    Yields lists of up to `chunk_size` (by default STUDENT_MODULE_CHUNK_SIZE) StudentModules
+    from the `modules` queryset, in id order, so that only one chunk is held in memory at a time.
+    """
+    chunk_size = chunk_size or STUDENT_MODULE_CHUNK_SIZE
+    modules = modules.order_by('id')
+    last_id = None
+    while True:
+        chunk_query = modules if last_id is None else modules.filter(id__gt=last_id)
+        chunk = list(chunk_query[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        last_id = chunk[-1].id
+
+
 def _get_task_id_from_xmodule_args(xmodule_instance_args):
     """Gets task_id from `xmodule_instance_args` dict, or returns default value if missing."""
     return xmodule_instance_args.get('task_id', UNKNOWN_TASK_ID) if xmodule_instance_args is not None else UNKNOWN_TASK_ID
@@ -451,10 +489,15 @@ def _get_module_instance_for_task(course_id, student, module_descriptor, xmodule
 
 
 @transaction.autocommit
-def rescore_problem_module_state(xmodule_instance_args, module_descriptor, student_module):
+def rescore_problem_module_state(xmodule_instance_args, module_descriptor, student_module, course):
     '''
     Takes an XModule descriptor and a corresponding StudentModule object, and
-    performs rescoring on the student's problem submission.
+    performs rescoring on the student's problem submission. `course` is the
+    loaded course, shared by all the StudentModules of the task.
+
+    The problem is still instantiated for each student (with its own field data,
+    XModule and LoncapaProblem, whose scripts run with the student's seed), and
+    the student's new state and score are saved on their own.
 
     Throws exceptions if the rescoring is fatal and should be aborted if in a loop.
     In particular, raises UpdateProblemModuleStateError if module fails to instantiate,
@@ -469,10 +512,6 @@ def rescore_problem_module_state(xmodule_instance_args, module_descriptor, stude
     usage_key = student_module.module_state_key
 
     with modulestore().bulk_operations(course_id):
-        course = get_course_by_id(course_id)
-        # TODO: Here is a call site where we could pass in a loaded course.  I
-        # think we certainly need it since grading is happening here, and field
-        # overrides would be important in handling that correctly
         instance = _get_module_instance_for_task(
             course_id,
             student,
@@ -540,7 +579,7 @@ def rescore_problem_module_state(xmodule_instance_args, module_descriptor, stude
 
 
 @transaction.autocommit
-def reset_attempts_module_state(xmodule_instance_args, _module_descriptor, student_module):
+def reset_attempts_module_state(xmodule_instance_args, _module_descriptor, student_module, _course):
     """
     Resets problem attempts to zero for specified `student_module`.
 
@@ -567,7 +606,7 @@ def reset_attempts_module_state(xmodule_instance_args, _module_descriptor, stude
 
 
 @transaction.autocommit
-def delete_problem_module_state(xmodule_instance_args, _module_descriptor, student_module):
+def delete_problem_module_state(xmodule_instance_args, _module_descriptor, student_module, _course):
     """
     Delete the StudentModule entry.
 
@@ -592,6 +631,8 @@ def upload_csv_to_report_store(rows, csv_name, course_id, timestamp, config_name
                 [row1_colum1, row1_colum2, ...],
                 ...
             ]
+            `rows` may be any iterable, including a generator; rows are
+            written out as they are produced.
         csv_name: Name of the resulting CSV
         course_id: ID of the course
     """
@@ -638,7 +679,7 @@ def upload_exec_summary_to_store(data_dict, report_name, course_id, generated_at
     tracker.emit(REPORT_REQUESTED_EVENT_NAME, {"report_type": report_name})
 
 
-def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name):  # pylint: disable=too-many-statements
+def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name, shard_task=None):
     """
     For a given `course_id`, generate a grades CSV file for all students that
     are enrolled, and store using a `ReportStore`. Once created, the files can
@@ -647,15 +688,26 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
     buffered, so we'll never write part of a CSV file to S3 -- i.e. any files
     that are visible in ReportStore will be complete ones.
 
+    If `shard_task` is given and the course has more than
+    `settings.GRADES_REPORT_STUDENTS_PER_SHARD` enrolled students, the
+    students are instead split into shards that are graded in parallel by
+    `shard_task` subtasks (see `queue_report_shards`).
+
     As we start to add more CSV downloads, it will probably be worthwhile to
     make a more general CSVDoc class instead of building out the rows like we
     do here.
     """
     start_time = time()
     start_date = datetime.now(UTC)
-    status_interval = 100
     enrolled_students = CourseEnrollment.objects.users_enrolled_in(course_id)
-    task_progress = TaskProgress(action_name, enrolled_students.count(), start_time)
+    total_enrolled_students = enrolled_students.count()
+
+    if shard_task is not None and _should_shard_report(total_enrolled_students):
+        return queue_report_shards(
+            _entry_id, action_name, 'grade_report', enrolled_students, total_enrolled_students, shard_task
+        )
+
+    task_progress = TaskProgress(action_name, total_enrolled_students, start_time)
 
     fmt = u'Task: {task_id}, InstructorTask ID: {entry_id}, Course: {course_id}, Input: {task_input}'
     task_info_string = fmt.format(
@@ -666,33 +718,80 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
     )
     TASK_LOG.info(u'%s, Task type: %s, Starting task execution', task_info_string, action_name)
 
+    rows, err_rows = _grade_report_rows(
+        course_id, enrolled_students.iterator(), task_progress, task_info_string, action_name
+    )
+
+    # Students are graded as the rows are written out to the report store.
+    upload_csv_to_report_store(rows, 'grade_report', course_id, start_date)
+
+    current_step = {'step': 'Uploading CSVs'}
+    task_progress.update_task_state(extra_meta=current_step)
+    TASK_LOG.info(u'%s, Task type: %s, Current step: %s', task_info_string, action_name, current_step)
+
+    # If there are any error rows (don't count the header), write them out as well
+    if len(err_rows) > 1:
+        upload_csv_to_report_store(err_rows, 'grade_report_err', course_id, start_date)
+
+    # One last update before we close out...
+    TASK_LOG.info(u'%s, Task type: %s, Finalizing grade task', task_info_string, action_name)
+    return task_progress.update_task_state(extra_meta=current_step)
+
+
+def _grade_report_rows(course_id, students, task_progress, task_info_string, action_name):
+    """
+    Returns a tuple of (rows, err_rows) for the grade report of `students`.
+
+    `rows` is a generator that grades the students as it is consumed,
+    updating `task_progress` along the way; its first row is the header row,
+    if any student could be graded. `err_rows` is a list whose first row is
+    a header row, to which a row is appended for each student that couldn't
+    be graded, so it is only complete once `rows` has been exhausted.
+    """
     course = get_course_by_id(course_id)
     course_is_cohorted = is_course_cohorted(course.id)
-    cohorts_header = ['Cohort Name'] if course_is_cohorted else []
+    certificate_whitelist = CertificateWhitelist.objects.filter(course_id=course_id, whitelist=True)
+    whitelisted_user_ids = [entry.user_id for entry in certificate_whitelist]
+
+    err_rows = [["id", "username", "error_msg"]]
+    return _generate_grade_report_rows(
+        course_id,
+        students,
+        task_progress,
+        task_info_string,
+        action_name,
+        err_rows,
+        cohorts_header=['Cohort Name'] if course_is_cohorted else [],
+        experiment_partitions=get_split_user_partitions(course.user_partitions),
+        whitelisted_user_ids=whitelisted_user_ids,
+    ), err_rows
 
-    experiment_partitions = get_split_user_partitions(course.user_partitions)
-    group_configs_header = [u'Experiment Group ({})'.format(partition.name) for partition in experiment_partitions]
 
+def _generate_grade_report_rows(  # pylint: disable=too-many-statements
+        course_id, students, task_progress, task_info_string, action_name, err_rows,
+        cohorts_header, experiment_partitions, whitelisted_user_ids
+):
+    """
+    Generator of the rows of the grade report for `students`; see `_grade_report_rows`.
+    """
+    status_interval = 100
+    course_is_cohorted = bool(cohorts_header)
+    group_configs_header = [u'Experiment Group ({})'.format(partition.name) for partition in experiment_partitions]
     certificate_info_header = ['Certificate Eligible', 'Certificate Delivered', 'Certificate Type']
-    certificate_whitelist = CertificateWhitelist.objects.filter(course_id=course_id, whitelist=True)
-    whitelisted_user_ids = [entry.user_id for entry in certificate_whitelist]
 
-    # Loop over all our students and build our CSV lists in memory
     header = None
-    rows = []
-    err_rows = [["id", "username", "error_msg"]]
     current_step = {'step': 'Calculating Grades'}
 
-    total_enrolled_students = enrolled_students.count()
+    total_students = task_progress.total
     student_counter = 0
     TASK_LOG.info(
         u'%s, Task type: %s, Current step: %s, Starting grade calculation for total students: %s',
         task_info_string,
         action_name,
         current_step,
-        total_enrolled_students
+        total_students
     )
-    for student, gradeset, err_msg in iterate_grades_for(course_id, enrolled_students):
+    for student, gradeset, err_msg in iterate_grades_for(course_id, students):
         # Periodically update task status (this is a cache write)
         if task_progress.attempted % status_interval == 0:
             task_progress.update_task_state(extra_meta=current_step)
@@ -707,7 +806,7 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
             action_name,
             current_step,
             student_counter,
-            total_enrolled_students
+            total_students
         )
 
         if gradeset:
@@ -715,7 +814,7 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
             task_progress.succeeded += 1
             if not header:
                 header = [section['label'] for section in gradeset[u'section_breakdown']]
-                rows.append(
+                yield (
                     ["id", "email", "username", "grade"] + header + cohorts_header +
                     group_configs_header + ['Enrollment Track', 'Verification Status'] + certificate_info_header
                 )
@@ -756,7 +855,7 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
             # possible for a student to have a 0.0 show up in their row but
             # still have 100% for the course.
             row_percents = [percents.get(label, 0.0) for label in header]
-            rows.append(
+            yield (
                 [student.id, student.email, student.username, gradeset['percent']] +
                 row_percents + cohorts_group_name + group_configs_group_names +
                 [enrollment_mode] + [verification_status] + certificate_info
@@ -772,25 +871,9 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
         action_name,
         current_step,
         student_counter,
-        total_enrolled_students
+        total_students
     )
 
-    # By this point, we've got the rows we're going to stuff into our CSV files.
-    current_step = {'step': 'Uploading CSVs'}
-    task_progress.update_task_state(extra_meta=current_step)
-    TASK_LOG.info(u'%s, Task type: %s, Current step: %s', task_info_string, action_name, current_step)
-
-    # Perform the actual upload
-    upload_csv_to_report_store(rows, 'grade_report', course_id, start_date)
-
-    # If there are any error rows (don't count the header), write them out as well
-    if len(err_rows) > 1:
-        upload_csv_to_report_store(err_rows, 'grade_report_err', course_id, start_date)
-
-    # One last update before we close out...
-    TASK_LOG.info(u'%s, Task type: %s, Finalizing grade task', task_info_string, action_name)
-    return task_progress.update_task_state(extra_meta=current_step)
-
 
 def _order_problems(blocks):
     """
@@ -842,37 +925,102 @@ def _order_problems(blocks):
     return problems
 
 
-def upload_problem_grade_report(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name):
+def upload_problem_grade_report(
+        _xmodule_instance_args, _entry_id, course_id, _task_input, action_name, shard_task=None
+):
     """
     Generate a CSV containing all students' problem grades within a given
     `course_id`.
+
+    If `shard_task` is given and the course has more than
+    `settings.GRADES_REPORT_STUDENTS_PER_SHARD` enrolled students, the
+    students are instead split into shards that are graded in parallel by
+    `shard_task` subtasks (see `queue_report_shards`).
     """
     start_time = time()
     start_date = datetime.now(UTC)
-    status_interval = 100
     enrolled_students = CourseEnrollment.objects.users_enrolled_in(course_id)
-    task_progress = TaskProgress(action_name, enrolled_students.count(), start_time)
+    total_enrolled_students = enrolled_students.count()
+    task_progress = TaskProgress(action_name, total_enrolled_students, start_time)
 
+    if not CourseStructure.objects.filter(course_id=course_id).exists():
+        return task_progress.update_task_state(
+            extra_meta={'step': 'Generating course structure. Please refresh and try again.'}
+        )
+
+    if shard_task is not None and _should_shard_report(total_enrolled_students):
+        return queue_report_shards(
+            _entry_id, action_name, 'problem_grade_report', enrolled_students, total_enrolled_students, shard_task
+        )
+
+    fmt = u'Task: {task_id}, InstructorTask ID: {entry_id}, Course: {course_id}, Input: {task_input}'
+    task_info_string = fmt.format(
+        task_id=_xmodule_instance_args.get('task_id') if _xmodule_instance_args is not None else None,
+        entry_id=_entry_id,
+        course_id=course_id,
+        task_input=_task_input
+    )
+    rows, error_rows = _problem_grade_report_rows(
+        course_id, enrolled_students.iterator(), task_progress, task_info_string, action_name
+    )
+
+    # Perform the upload if any students have been successfully graded. The
+    # remaining students are graded as the rows are written out.
+    first_rows = list(islice(rows, 2))
+    if len(first_rows) > 1:
+        upload_csv_to_report_store(chain(first_rows, rows), 'problem_grade_report', course_id, start_date)
+    # If there are any error rows, write them out as well
+    if len(error_rows) > 1:
+        upload_csv_to_report_store(error_rows, 'problem_grade_report_err', course_id, start_date)
+
+    return task_progress.update_task_state(extra_meta={'step': 'Uploading CSV'})
+
+
+def _problem_grade_report_rows(course_id, students, task_progress, task_info_string, action_name):
+    """
+    Returns a tuple of (rows, error_rows) for the problem grade report of
+    `students`. `task_info_string` and `action_name` identify the task in
+    log messages.
+
+    `rows` is a generator that grades the students as it is consumed,
+    updating `task_progress` along the way. `error_rows` is a list to which
+    a row is appended for each student that couldn't be graded, so it is
+    only complete once `rows` has been exhausted. The first row of both is
+    a header row.
+    """
     # This struct encapsulates both the display names of each static item in the
     # header row as values as well as the django User field names of those items
     # as the keys.  It is structured in this way to keep the values related.
     header_row = OrderedDict([('id', 'Student ID'), ('email', 'Email'), ('username', 'Username')])
 
-    try:
-        course_structure = CourseStructure.objects.get(course_id=course_id)
-        blocks = course_structure.ordered_blocks
-        problems = _order_problems(blocks)
-    except CourseStructure.DoesNotExist:
-        return task_progress.update_task_state(
-            extra_meta={'step': 'Generating course structure. Please refresh and try again.'}
-        )
+    course_structure = CourseStructure.objects.get(course_id=course_id)
+    blocks = course_structure.ordered_blocks
+    problems = _order_problems(blocks)
 
-    # Just generate the static fields for now.
-    rows = [list(header_row.values()) + ['Final Grade'] + list(chain.from_iterable(problems.values()))]
     error_rows = [list(header_row.values()) + ['error_msg']]
+    TASK_LOG.info(
+        u'%s, Task type: %s, Starting problem grade calculation for total students: %s',
+        task_info_string,
+        action_name,
+        task_progress.total
+    )
+    return _generate_problem_grade_report_rows(
+        course_id, students, task_progress, header_row, problems, error_rows
+    ), error_rows
+
+
+def _generate_problem_grade_report_rows(course_id, students, task_progress, header_row, problems, error_rows):
+    """
+    Generator of the rows of the problem grade report for `students`; see
+    `_problem_grade_report_rows`.
+    """
+    status_interval = 100
     current_step = {'step': 'Calculating Grades'}
 
-    for student, gradeset, err_msg in iterate_grades_for(course_id, enrolled_students, keep_raw_scores=True):
+    # Just generate the static fields for now.
+    yield list(header_row.values()) + ['Final Grade'] + list(chain.from_iterable(problems.values()))
+
+    for student, gradeset, err_msg in iterate_grades_for(course_id, students, keep_raw_scores=True):
         student_fields = [getattr(student, field_name) for field_name in header_row]
         task_progress.attempted += 1
 
@@ -900,20 +1048,201 @@ def upload_problem_grade_report(_xmodule_instance_args, _entry_id, course_id, _t
                 # the case that the student does not have access to it (e.g. A/B
                 # test or cohorted courseware).
                 earned_possible_values.append(['N/A', 'N/A'])
-        rows.append(student_fields + [final_grade] + list(chain.from_iterable(earned_possible_values)))
-
         task_progress.succeeded += 1
         if task_progress.attempted % status_interval == 0:
             task_progress.update_task_state(extra_meta=current_step)
 
-    # Perform the upload if any students have been successfully graded
-    if len(rows) > 1:
-        upload_csv_to_report_store(rows, 'problem_grade_report', course_id, start_date)
-    # If there are any error rows, write them out as well
-    if len(error_rows) > 1:
-        upload_csv_to_report_store(error_rows, 'problem_grade_report_err', course_id, start_date)
+        yield student_fields + [final_grade] + list(chain.from_iterable(earned_possible_values))
 
-    return task_progress.update_task_state(extra_meta={'step': 'Uploading CSV'})
+
+# Functions returning the (rows, error_rows) of a report for a list of
+# students, keyed by the name of the report.
+REPORT_SHARD_ROW_GENERATORS = {
+    'grade_report': _grade_report_rows,
+    'problem_grade_report': _problem_grade_report_rows,
+}
+
+
+def _should_shard_report(total_students):
+    """
+    Returns True if a report for `total_students` students should be split
+    into shards that are generated by parallel subtasks.
+    """
+    students_per_shard = settings.GRADES_REPORT_STUDENTS_PER_SHARD
+    return bool(students_per_shard) and total_students > students_per_shard
+
+
+def _report_shard_path(entry_id, report_name, shard_index):
+    """
+    Returns the path, in the default storage, of the CSV file holding the
+    rows generated by a single report shard.
+    """
+    return u"instructor_task/report_shards/{entry_id}/{report_name}_{shard_index:05d}.csv".format(
+        entry_id=entry_id,
+        report_name=report_name,
+        shard_index=shard_index,
+    )
+
+
+def queue_report_shards(entry_id, action_name, report_name, students, total_students, shard_task):
+    """
+    Splits `students` into shards of `settings.GRADES_REPORT_STUDENTS_PER_SHARD`
+    students and queues a `shard_task` subtask for each of them. Each subtask
+    generates the `report_name` rows for its shard (see
+    `upload_report_shard`), and the last one to complete merges all of them
+    into the final report.
+
+    Returns the task progress as stored in the InstructorTask object.
+    """
+    entry = InstructorTask.objects.get(pk=entry_id)
+
+    # Check to see if the shards have already been defined. This can happen
+    # if the parent task was requeued after a loss of connection to the broker.
+    if len(entry.subtasks) > 0:
+        TASK_LOG.warning(u"Task %s has already been processed for report %s", entry.task_id, report_name)
+        return json.loads(entry.task_output)
+
+    shard_indexes = count()
+
+    def _create_report_shard_subtask(student_list, initial_subtask_status):
+        """Creates a subtask to generate the report rows for a list of students."""
+        return shard_task.subtask(
+            (
+                entry_id,
+                report_name,
+                next(shard_indexes),
+                [student['pk'] for student in student_list],
+                initial_subtask_status.to_dict(),
+            ),
+            task_id=initial_subtask_status.task_id,
+            routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY,
+        )
+
+    return queue_subtasks_for_query(
+        entry,
+        action_name,
+        _create_report_shard_subtask,
+        [students],
+        [],
+        settings.GRADES_REPORT_STUDENTS_PER_SHARD,
+        total_students,
+    )
+
+
+def upload_report_shard(entry_id, report_name, shard_index, student_ids, subtask_status_dict):
+    """
+    Generates the `report_name` rows for the students in `student_ids` and
+    stores them in the default storage. If this is the last shard of the
+    report to complete, all shards are merged into the final report.
+
+    Returns the subtask status as a dict that can be serialized by Celery.
+    """
+    subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+    current_task_id = subtask_status.task_id
+
+    # Check that the requested subtask is actually known to the current
+    # InstructorTask entry, and that it hasn't already been completed.
+    check_subtask_is_valid(entry_id, current_task_id, subtask_status)
+
+    entry = InstructorTask.objects.get(pk=entry_id)
+    course_id = entry.course_id
+    action_name = json.loads(entry.task_output).get('action_name')
+    task_info_string = u'Task: {task_id}, InstructorTask ID: {entry_id}, Course: {course_id}, Shard: {shard}'.format(
+        task_id=current_task_id,
+        entry_id=entry_id,
+        course_id=course_id,
+        shard=shard_index,
+    )
+
+    try:
+        students = User.objects.filter(id__in=student_ids).order_by('id')
+        task_progress = TaskProgress(action_name, len(student_ids), time())
+        rows, error_rows = REPORT_SHARD_ROW_GENERATORS[report_name](
+            course_id, students, task_progress, task_info_string, action_name
+        )
+        _store_report_shard_rows(_report_shard_path(entry_id, report_name, shard_index), rows)
+        _store_report_shard_rows(_report_shard_path(entry_id, report_name + '_err', shard_index), error_rows)
+    except Exception:
+        # Unexpected exception. Record the failure in the entry before failing.
+        TASK_LOG.exception(u'%s, Report shard failed unexpectedly', task_info_string)
+        subtask_status.increment(failed=len(student_ids), state=FAILURE)
+        if update_subtask_status(entry_id, current_task_id, subtask_status):
+            merge_report_shards(entry_id, report_name)
+        raise
+
+    subtask_status.increment(succeeded=task_progress.succeeded, failed=task_progress.failed, state=SUCCESS)
+    if update_subtask_status(entry_id, current_task_id, subtask_status):
+        merge_report_shards(entry_id, report_name)
+
+    TASK_LOG.info(u'%s, Report shard completed with status %s', task_info_string, subtask_status)
+    return subtask_status.to_dict()
+
+
+def _store_report_shard_rows(path, rows):
+    """
+    Writes `rows` as a CSV file at `path` in the default storage.
+    """
+    output_buffer = StringIO()
+    unicodecsv.writer(output_buffer, encoding='utf-8').writerows(rows)
+    storage = DefaultStorage()
+    if storage.exists(path):
+        storage.delete(path)
+    storage.save(path, ContentFile(output_buffer.getvalue()))
+
+
+def _read_report_shard_rows(shard_paths):
+    """
+    Yields the rows of all the CSV files at `shard_paths` in the default
+    storage, skipping the header row of every file but the first non-empty
+    one. Each file is deleted once it has been read.
+    """
+    storage = DefaultStorage()
+    header_written = False
+    for path in shard_paths:
+        if not storage.exists(path):
+            continue
+        with storage.open(path) as shard_file:
+            shard_rows = list(unicodecsv.reader(UniversalNewlineIterator(shard_file), encoding='utf-8'))
+        storage.delete(path)
+        if not shard_rows:
+            continue
+        if header_written:
+            shard_rows = shard_rows[1:]
+        header_written = True
+        for row in shard_rows:
+            yield row
+
+
+def merge_report_shards(entry_id, report_name):
+    """
+    Merges the rows generated by every shard of the `report_name` report of
+    the InstructorTask into the final report (and error report, if there
+    were errors), and uploads them using `ReportStore`.
+
+    If any shard failed, its students are missing from both reports, so
+    nothing is uploaded rather than an incomplete report.
+    """
+    entry = InstructorTask.objects.get(pk=entry_id)
+    subtasks = json.loads(entry.subtasks)
+    num_shards = subtasks['total']
+    if subtasks['failed']:
+        TASK_LOG.error(
+            u'InstructorTask ID: %s, %s of %s shards of the %s failed, not uploading it',
+            entry_id, subtasks['failed'], num_shards, report_name
+        )
+    # Only write out the error report if there are any error rows (don't
+    # count the header).
+    for name, min_rows in ((report_name, 1), (report_name + '_err', 2)):
+        shard_paths = [_report_shard_path(entry_id, name, shard_index) for shard_index in xrange(num_shards)]
+        rows = _read_report_shard_rows(shard_paths)
+        if subtasks['failed']:
+            # Read the rows anyway, so that the shard files are deleted
+            for __ in rows:
+                pass
+            continue
+        first_rows = list(islice(rows, min_rows))
+        if len(first_rows) >= min_rows:
+            upload_csv_to_report_store(chain(first_rows, rows), name, entry.course_id, entry.created)
 
 
 def upload_students_csv(_xmodule_instance_args, _entry_id, course_id, task_input, action_name):
@@ -957,7 +1286,6 @@ def upload_enrollment_report(_xmodule_instance_args, _entry_id, course_id, _task
     """
     start_time = time()
     start_date = datetime.now(UTC)
-    status_interval = 100
     students_in_course = CourseEnrollment.objects.enrolled_and_dropped_out_users(course_id)
     task_progress = TaskProgress(action_name, students_in_course.count(), start_time)
 
@@ -970,12 +1298,31 @@ def upload_enrollment_report(_xmodule_instance_args, _entry_id, course_id, _task
     )
     TASK_LOG.info(u'%s, Task type: %s, Starting task execution', task_info_string, action_name)
 
-    # Loop over all our students and build our CSV lists in memory
-    rows = []
+    rows = _enrollment_report_rows(course_id, students_in_course, task_progress, task_info_string, action_name)
+
+    # Profile information is gathered as the rows are written out to the report store.
+    upload_csv_to_report_store(rows, 'enrollment_report', course_id, start_date, config_name='FINANCIAL_REPORTS')
+
+    current_step = {'step': 'Uploading CSVs'}
+    task_progress.update_task_state(extra_meta=current_step)
+    TASK_LOG.info(u'%s, Task type: %s, Current step: %s', task_info_string, action_name, current_step)
+
+    # One last update before we close out...
+    TASK_LOG.info(u'%s, Task type: %s, Finalizing detailed enrollment task', task_info_string, action_name)
+    return task_progress.update_task_state(extra_meta=current_step)
+
+
+def _enrollment_report_rows(course_id, students_in_course, task_progress, task_info_string, action_name):
+    """
+    Generator of the rows of the detailed enrollment report for
+    `students_in_course`, updating `task_progress` along the way. The first
+    row is the header row.
+    """
+    status_interval = 100
     header = None
     current_step = {'step': 'Gathering Profile Information'}
     enrollment_report_provider = PaidCourseEnrollmentReportProvider()
-    total_students = students_in_course.count()
+    total_students = task_progress.total
     student_counter = 0
     TASK_LOG.info(
         u'%s, Task type: %s, Current step: %s, generating detailed enrollment report for total students: %s',
@@ -985,7 +1332,7 @@ def upload_enrollment_report(_xmodule_instance_args, _entry_id, course_id, _task
         total_students
     )
 
-    for student in students_in_course:
+    for student in students_in_course.iterator():
         # Periodically update task status (this is a cache write)
         if task_progress.attempted % status_interval == 0:
             task_progress.update_task_state(extra_meta=current_step)
@@ -1042,10 +1389,10 @@ def upload_enrollment_report(_xmodule_instance_args, _entry_id, course_id, _task
             for header_element in header:
                 # translate header into a localizable display string
                 display_headers.append(enrollment_report_headers.get(header_element, header_element))
-            rows.append(display_headers)
+            yield display_headers
 
-        rows.append(user_data.values() + course_enrollment_data.values() + payment_data.values())
         task_progress.succeeded += 1
+        yield user_data.values() + course_enrollment_data.values() + payment_data.values()
 
     TASK_LOG.info(
         u'%s, Task type: %s, Current step: %s, Detailed enrollment report generated for students: %s/%s',
@@ -1056,18 +1403,6 @@ def upload_enrollment_report(_xmodule_instance_args, _entry_id, course_id, _task
         total_students
     )
 
-    # By this point, we've got the rows we're going to stuff into our CSV files.
-    current_step = {'step': 'Uploading CSVs'}
-    task_progress.update_task_state(extra_meta=current_step)
-    TASK_LOG.info(u'%s, Task type: %s, Current step: %s', task_info_string, action_name, current_step)
-
-    # Perform the actual upload
-    upload_csv_to_report_store(rows, 'enrollment_report', course_id, start_date, config_name='FINANCIAL_REPORTS')
-
-    # One last update before we close out...
-    TASK_LOG.info(u'%s, Task type: %s, Finalizing detailed enrollment task', task_info_string, action_name)
-    return task_progress.update_task_state(extra_meta=current_step)
-
 
 def upload_may_enroll_csv(_xmodule_instance_args, _entry_id, course_id, task_input, action_name):
     """
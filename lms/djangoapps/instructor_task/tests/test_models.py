@@ -30,10 +30,41 @@ class MockKey(object):
         return "http://fake-edx-s3.edx.org/"
 
 
+class MockMultiPartUpload(object):
+    """
+    Mocking a boto S3 MultiPartUpload object.
+    """
+    def __init__(self, bucket, key_name):
+        self.bucket = bucket
+        self.key_name = key_name
+        self.parts = []
+
+    def upload_part_from_file(self, fp, part_num):
+        """ Expected method on a MultiPartUpload object. """
+        self.parts.append((part_num, fp.read()))
+
+    def complete_upload(self):
+        """ Expected method on a MultiPartUpload object. """
+        key = MockKey(self.bucket)
+        key.key = self.key_name
+        self.bucket.store_key(key)
+
+    def cancel_upload(self):
+        """ Expected method on a MultiPartUpload object. """
+        self.parts = []
+
+
 class MockBucket(object):
     """ Mocking a boto S3 Bucket object. """
     def __init__(self, _name):
         self.keys = []
+        self.multipart_uploads = []
+
+    def initiate_multipart_upload(self, key_name, headers):  # pylint: disable=unused-argument
+        """ Expected method on a Bucket object. """
+        multipart_upload = MockMultiPartUpload(self, key_name)
+        self.multipart_uploads.append(multipart_upload)
+        return multipart_upload
 
     def store_key(self, key):
         """ Not a Bucket method, created just to store the keys in the Bucket for testing purposes. """
@@ -84,6 +115,14 @@ class ReportStoreTestMixin(object):
             ['new_file', 'middle_file', 'old_file']
         )
 
+    def test_store_rows_from_generator(self):
+        """
+        Test that ReportStore.store_rows() accepts a generator of rows.
+        """
+        report_store = self.create_report_store()
+        report_store.store_rows(self.course_id, 'report.csv', ([unicode(i), u'\xfc'] for i in range(10)))
+        self.assertEqual([link[0] for link in report_store.links_for(self.course_id)], ['report.csv'])
+
 
 class LocalFSReportStoreTestCase(ReportStoreTestMixin, TestReportMixin, TestCase):
     """
@@ -93,6 +132,15 @@ class LocalFSReportStoreTestCase(ReportStoreTestMixin, TestReportMixin, TestCase
         """ Create and return a LocalFSReportStore. """
         return LocalFSReportStore.from_config(config_name='GRADES_DOWNLOAD')
 
+    def test_store_rows_content(self):
+        """
+        Test that LocalFSReportStore.store_rows() writes out every row.
+        """
+        report_store = self.create_report_store()
+        report_store.store_rows(self.course_id, 'report.csv', ([unicode(i), u'\xfc'] for i in range(3)))
+        with open(report_store.path_to(self.course_id, 'report.csv')) as csv_file:
+            self.assertEqual(csv_file.read(), '0,\xc3\xbc\r\n1,\xc3\xbc\r\n2,\xc3\xbc\r\n')
+
 
 @mock.patch('instructor_task.models.S3Connection', new=MockS3Connection)
 @mock.patch('instructor_task.models.Key', new=MockKey)
@@ -105,3 +153,15 @@ class S3ReportStoreTestCase(ReportStoreTestMixin, TestReportMixin, TestCase):
     def create_report_store(self):
         """ Create and return a S3ReportStore. """
         return S3ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+
+    @mock.patch('instructor_task.models.S3ReportStore.MULTIPART_CHUNK_SIZE', 1)
+    def test_store_rows_multipart(self):
+        """
+        Test that S3ReportStore.store_rows() uploads large reports in parts.
+        """
+        report_store = self.create_report_store()
+        report_store.store_rows(self.course_id, 'report.csv', ([unicode(i)] * 100 for i in range(100)))
+        multipart_upload, = report_store.bucket.multipart_uploads
+        self.assertGreater(len(multipart_upload.parts), 1)
+        self.assertEqual([part_num for part_num, _ in multipart_upload.parts], range(1, len(multipart_upload.parts) + 1))
+        self.assertEqual(len(report_store.links_for(self.course_id)), 1)
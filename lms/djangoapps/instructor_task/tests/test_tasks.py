@@ -23,6 +23,7 @@ from instructor_task.models import InstructorTask
 from instructor_task.tests.test_base import InstructorTaskModuleTestCase
 from instructor_task.tests.factories import InstructorTaskFactory
 from instructor_task.tasks import rescore_problem, reset_problem_attempts, delete_problem_state
+from instructor_task import tasks_helper
 from instructor_task.tasks_helper import UpdateProblemModuleStateError
 
 PROBLEM_URL_NAME = "test_urlname"
@@ -258,6 +259,32 @@ class TestRescoreInstructorTask(TestInstructorTasks):
         self.assertEquals(output.get('action_name'), 'rescored')
         self.assertGreater(output.get('duration_ms'), 0)
 
+    def test_rescoring_in_chunks(self):
+        input_state = json.dumps({'done': True})
+        num_students = 10
+        self._create_students_with_state(num_students, input_state)
+        task_entry = self._create_input_entry()
+        mock_instance = Mock()
+        mock_instance.rescore_problem = Mock(return_value={'success': 'correct'})
+        with patch('instructor_task.tasks_helper.get_module_for_descriptor_internal') as mock_get_module:
+            mock_get_module.return_value = mock_instance
+            with patch('instructor_task.tasks_helper.STUDENT_MODULE_CHUNK_SIZE', 3):
+                with patch(
+                    'instructor_task.tasks_helper.get_course_by_id', wraps=tasks_helper.get_course_by_id
+                ) as mock_get_course:
+                    self._run_task_with_mock_celery(rescore_problem, task_entry.id, task_entry.task_id)
+        # the course is only loaded once, and every student is rescored once
+        self.assertEqual(mock_get_course.call_count, 1)
+        self.assertEqual(mock_instance.rescore_problem.call_count, num_students)
+        self.assertEqual(
+            set(call[1]['user'].username for call in mock_get_module.call_args_list),
+            set('robot%d' % i for i in xrange(num_students))
+        )
+        entry = InstructorTask.objects.get(id=task_entry.id)
+        output = json.loads(entry.task_output)
+        self.assertEquals(output.get('attempted'), num_students)
+        self.assertEquals(output.get('succeeded'), num_students)
+
     def test_rescoring_bad_result(self):
         # Confirm that rescoring does not succeed if "success" key is not an expected value.
         input_state = json.dumps({'done': True})
@@ -347,6 +374,26 @@ class TestResetAttemptsInstructorTask(TestInstructorTasks):
         # check that entries were reset
         self._assert_num_attempts(students, 0)
 
+    def test_reset_with_failure_mid_chunk(self):
+        initial_attempts = 3
+        input_state = json.dumps({'attempts': initial_attempts})
+        num_students = 5
+        students = self._create_students_with_state(num_students, input_state)
+        # the third StudentModule, in the middle of the first chunk, can't be reset
+        StudentModule.objects.filter(student=students[2]).update(state='{')
+        task_entry = self._create_input_entry()
+        with patch('instructor_task.tasks_helper.STUDENT_MODULE_CHUNK_SIZE', 3):
+            with patch('instructor_task.tasks_helper.task_track') as mock_track:
+                with self.assertRaises(ValueError):
+                    self._run_task_with_mock_celery(reset_problem_attempts, task_entry.id, task_entry.task_id)
+        # the StudentModules reset before the failure stay reset, and were tracked
+        self._assert_num_attempts(students[:2], 0)
+        self._assert_num_attempts(students[3:], initial_attempts)
+        self.assertEqual(
+            [call[0][1]['student'] for call in mock_track.call_args_list],
+            [student.username for student in students[:2]]
+        )
+
     def _test_reset_with_student(self, use_email):
         """Run a reset task for one student, with several StudentModules for the problem defined."""
         num_students = 10
@@ -7,18 +7,23 @@ Tests that CSV grade report generation works with unicode emails.
 
 """
 import ddt
+import json
 from mock import Mock, patch
 import tempfile
 import unicodecsv
+from uuid import uuid4
+from celery.states import SUCCESS
 from django.core.urlresolvers import reverse
+from django.test.utils import override_settings
 
 from capa.tests.response_xml_factory import MultipleChoiceResponseXMLFactory
 from certificates.tests.factories import GeneratedCertificateFactory, CertificateWhitelistFactory
 from course_modes.models import CourseMode
 from courseware.tests.factories import InstructorFactory
-from instructor_task.models import ReportStore
+from instructor_task.models import InstructorTask, ReportStore
 from instructor_task.tasks_helper import cohort_students_and_upload, upload_grades_csv, upload_students_csv, \
-    upload_enrollment_report, upload_exec_summary_report
+    upload_enrollment_report, upload_exec_summary_report, upload_report_shard, REPORT_SHARD_ROW_GENERATORS
+from instructor_task.tests.factories import InstructorTaskFactory
 from instructor_task.tests.test_base import InstructorTaskCourseTestCase, TestReportMixin, InstructorTaskModuleTestCase
 from openedx.core.djangoapps.course_groups.models import CourseUserGroupPartitionGroup
 from openedx.core.djangoapps.course_groups.tests.helpers import CohortFactory
@@ -84,6 +89,65 @@ class TestInstructorGradeReport(TestReportMixin, InstructorTaskCourseTestCase):
         report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
         self.assertTrue(any('grade_report_err' in item[0] for item in report_store.links_for(self.course.id)))
 
+    @override_settings(GRADES_REPORT_STUDENTS_PER_SHARD=1)
+    @patch('instructor_task.tasks_helper._get_current_task')
+    def test_sharded_grade_report(self, _mock_current_task):
+        """
+        Test that a grade report split into shards is merged into a single
+        report once every shard has completed.
+        """
+        for i in range(3):
+            self.create_student('student{0}'.format(i), 'student{0}@example.com'.format(i))
+        entry = InstructorTaskFactory.create(task_type='grade_course', course_id=self.course.id, task_id=str(uuid4()))
+
+        # Run the shard subtasks synchronously as they are queued.
+        shard_task = Mock()
+        shard_task.subtask.side_effect = lambda args, **kwargs: Mock(apply_async=lambda: upload_report_shard(*args))
+        upload_grades_csv(None, entry.id, self.course.id, None, 'graded', shard_task=shard_task)
+        self.assertEqual(shard_task.subtask.call_count, 3)
+
+        entry = InstructorTask.objects.get(pk=entry.id)
+        self.assertEqual(entry.task_state, SUCCESS)
+        self.assertDictContainsSubset({'attempted': 3, 'succeeded': 3, 'failed': 0}, json.loads(entry.task_output))
+
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        links = report_store.links_for(self.course.id)
+        self.assertEqual(len(links), 1)
+        with open(report_store.path_to(self.course.id, links[0][0])) as csv_file:
+            usernames = [row['username'] for row in unicodecsv.DictReader(csv_file)]
+        self.assertItemsEqual(usernames, ['student0', 'student1', 'student2'])
+
+    @override_settings(GRADES_REPORT_STUDENTS_PER_SHARD=1)
+    @patch('instructor_task.tasks_helper._get_current_task')
+    def test_sharded_grade_report_with_failed_shard(self, _mock_current_task):
+        """
+        Test that no report is uploaded if one of its shards failed, rather
+        than a report that is missing the shard's students.
+        """
+        for i in range(3):
+            self.create_student('student{0}'.format(i), 'student{0}@example.com'.format(i))
+        entry = InstructorTaskFactory.create(task_type='grade_course', course_id=self.course.id, task_id=str(uuid4()))
+
+        grade_report_rows = REPORT_SHARD_ROW_GENERATORS['grade_report']
+
+        def failing_grade_report_rows(course_id, students, *args):
+            """Fails for the shard of the last student"""
+            if any(student.username == 'student2' for student in students):
+                raise Exception('Shard failure')
+            return grade_report_rows(course_id, students, *args)
+
+        shard_task = Mock()
+        shard_task.subtask.side_effect = lambda args, **kwargs: Mock(apply_async=lambda: upload_report_shard(*args))
+        with patch.dict(REPORT_SHARD_ROW_GENERATORS, {'grade_report': failing_grade_report_rows}):
+            with self.assertRaises(Exception):
+                upload_grades_csv(None, entry.id, self.course.id, None, 'graded', shard_task=shard_task)
+        self.assertEqual(shard_task.subtask.call_count, 3)
+
+        entry = InstructorTask.objects.get(pk=entry.id)
+        self.assertEqual(json.loads(entry.subtasks)['failed'], 1)
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        self.assertEqual(report_store.links_for(self.course.id), [])
+
     def _verify_cell_data_for_user(self, username, course_id, column_header, expected_cell_content):
         """
         Verify cell data in the grades CSV for a particular user.
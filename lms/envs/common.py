@@ -60,6 +60,11 @@ DISCUSSION_SETTINGS = {
     'MAX_COMMENT_DEPTH': 2,
 }
 
+# The number of keep-alive connections to the comments service each process
+# keeps, and how many times a failed connection to it is retried
+COMMENTS_SERVICE_POOL_SIZE = 10
+COMMENTS_SERVICE_MAX_RETRIES = 0
+
 
 # Features
 FEATURES = {
@@ -265,6 +270,10 @@ FEATURES = {
     # whether to use password policy enforcement or not
     'ENFORCE_PASSWORD_POLICY': True,
 
+    # Persist per-section grades so that subsequent grading runs only
+    # recompute the sections whose scores have changed.
+    'ENABLE_PERSISTENT_GRADES': False,
+
     # Give course staff unrestricted access to grade downloads (if set to False,
     # only edX superusers can perform the downloads)
     'ALLOW_COURSE_STAFF_GRADE_DOWNLOADS': False,
@@ -605,6 +614,16 @@ TRACKING_BACKENDS = {
     }
 }
 
+# Send the events to the TRACKING_BACKENDS in batches, from a background thread
+# (see track.tracker). Events are dropped when QUEUE_SIZE events are waiting.
+TRACKING_ASYNC = {
+    'ENABLED': False,
+    'QUEUE_SIZE': 10000,
+    'BATCH_SIZE': 100,
+    'FLUSH_INTERVAL': 1.0,
+    'FULL_TIMEOUT': 0,
+}
+
 # We're already logging events, and we don't want to capture user
 # names/passwords.  Heartbeat events are likely not interesting.
 TRACKING_IGNORE_URL_PATTERNS = [r'^/event', r'^/login', r'^/heartbeat', r'^/segmentio/event', r'^/performance']
@@ -751,6 +770,19 @@ MODULESTORE = {
     }
 }
 
+# The number of split modulestore structures each process keeps in memory, in front of
+# the (optional) 'course_structure_cache' django cache. 0 disables the in-process cache.
+COURSE_STRUCTURE_LOCAL_CACHE_SIZE = 0
+
+# Assets larger than 1MB (which aren't kept in the django cache) can be cached on local
+# disk by the StaticContentServer, e.g. {'DIRECTORY': '/var/tmp/asset_cache', 'MAX_ASSET_SIZE': None}.
+# The directory isn't pruned automatically. Disabled when DIRECTORY isn't set.
+ASSET_DISK_CACHE = {}
+
+# How long (in seconds) browsers and CDNs may cache unlocked course assets without
+# revalidating them. 0 leaves out the Cache-Control header.
+STATIC_CONTENT_CACHE_MAX_AGE = 0
+
 #################### Python sandbox ############################################
 
 CODE_JAIL = {
@@ -776,6 +808,17 @@ CODE_JAIL = {
 #   ]
 COURSES_WITH_UNSAFE_CODE = []
 
+# How many safe_exec results each process keeps in memory, in front of the django cache.
+# 0 disables the in-process cache.
+SAFE_EXEC_LOCAL_CACHE_SIZE = 0
+
+# How long (in seconds) the courseware table of contents of each user is cached.
+# 0 disables the cache. Changes to the user's roles, cohort or other user partition
+# groups and to the course itself take effect straight away; other changes, such as
+# release dates passing, due date extensions or CCX coach overrides, only show once
+# the entry expires.
+COURSEWARE_TOC_CACHE_TIMEOUT = 0
+
 ############################### DJANGO BUILT-INS ###############################
 # Change DEBUG/TEMPLATE_DEBUG in your environment settings files, not here
 DEBUG = False
@@ -2111,6 +2154,10 @@ GRADES_DOWNLOAD = {
     'ROOT_PATH': '/tmp/edx-s3/grades',
 }
 
+# If set, grade reports for courses with more enrolled students than this are
+# split into shards of this many students, generated by parallel subtasks.
+GRADES_REPORT_STUDENTS_PER_SHARD = None
+
 FINANCIAL_REPORTS = {
     'STORAGE_TYPE': 'localfs',
     'BUCKET': 'edx-financial-reports',
@@ -1,14 +1,80 @@
 from contextlib import contextmanager
 import dogstats_wrapper as dog_stats_api
 import logging
+from multiprocessing.pool import ThreadPool
 import requests
+from requests.adapters import HTTPAdapter
+import threading
 from django.conf import settings
 from time import time
 from uuid import uuid4
+from django.utils import translation
 from django.utils.translation import get_language
 
 log = logging.getLogger(__name__)
 
+# The number of threads used to make independent requests to the comments
+# service concurrently, see `perform_async`
+CONCURRENT_REQUEST_THREADS = 4
+
+_session = None
+_thread_pool = None
+_lock = threading.Lock()
+
+
+def get_session():
+    """
+    Returns the HTTP session used for all requests to the comments service by
+    this process, so that connections to it are kept alive and reused rather
+    than opened for every request.
+
+    The size of its connection pool and the number of times a failed
+    connection is retried are set by the `COMMENTS_SERVICE_POOL_SIZE` and
+    `COMMENTS_SERVICE_MAX_RETRIES` settings.
+    """
+    global _session  # pylint: disable=global-statement
+    with _lock:
+        if _session is None:
+            adapter = HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=getattr(settings, "COMMENTS_SERVICE_POOL_SIZE", 10),
+                max_retries=getattr(settings, "COMMENTS_SERVICE_MAX_RETRIES", 0),
+            )
+            session = requests.Session()
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _session = session
+        return _session
+
+
+def perform_async(func, *args, **kwargs):
+    """
+    Calls `func` with the given arguments in a background thread, and returns
+    an object whose `get()` method waits for and returns its result (or raises
+    its exception).  This lets views make independent requests to the comments
+    service concurrently rather than one after the other.
+
+    `func` mustn't use the database, since the background threads don't share
+    the caller's connection (or transaction).
+    """
+    global _thread_pool  # pylint: disable=global-statement
+    with _lock:
+        if _thread_pool is None:
+            _thread_pool = ThreadPool(CONCURRENT_REQUEST_THREADS)
+    return _thread_pool.apply_async(_call_with_language, (get_language(), func, args, kwargs))
+
+
+def _call_with_language(language, func, args, kwargs):
+    """
+    Calls `func` with the caller's active language, which is sent along with
+    comments service requests.
+    """
+    translation.activate(language)
+    try:
+        return func(*args, **kwargs)
+    finally:
+        translation.deactivate()
+
 
 def strip_none(dic):
     return dict([(k, v) for k, v in dic.iteritems() if v is not None])
@@ -76,7 +142,7 @@ def perform_request(method, url, data_or_params=None, raw=False,
         data = None
         params = merge_dict(data_or_params, request_id_dict)
     with request_timer(request_id, method, url, metric_tags):
-        response = requests.request(
+        response = get_session().request(
             method,
             url,
             data=data,
@@ -81,8 +81,9 @@ class LmsSearchFilterGenerator(SearchFilterGenerator):
             else:
                 user_enrollments = self._enrollments_for_user(user)
                 content_groups = []
+                courses = modulestore().get_courses_by_keys([enrollment.course_id for enrollment in user_enrollments])
                 for enrollment in user_enrollments:
-                    course = modulestore().get_course(enrollment.course_id)
+                    course = courses.get(enrollment.course_id)
                     if course:
                         enrollment_group_ids = get_group_ids_for_user(course, user)
                         if enrollment_group_ids: